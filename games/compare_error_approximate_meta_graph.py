@@ -0,0 +1,125 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the exact meta-graph (`MetaGraph`, one search per piece of cheese) with the approximate one (`ApproximateMetaGraph`, a single search from all pieces of cheese). \
+# For each number of pieces of cheese, we measure the time needed to build both, and the relative error of the approximate distances over all pairs. \
+# We also measure the length of the greedy tour built as the `Greedy` player does, i.e., after refining the pairs it uses, compared with the greedy tour of the exact meta-graph.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import numpy
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from MetaGraph import MetaGraph
+from ApproximateMetaGraph import ApproximateMetaGraph
+from Greedy import MAX_REFINEMENT_ROUNDS
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Size of the mazes to test
+SIZE = (61, 61)
+
+# Number of mazes
+NB_MAZES = 2
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [50, 100, 250, 500, 1000]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus([SIZE], NB_MAZES)
+
+# Times, errors and tour lengths for each number of pieces of cheese
+results = {(nb_cheese, measure): [] for nb_cheese in NB_CHEESE for measure in ["exact time", "approximate time", "mean error", "max error", "exact pairs", "tour excess"]}
+for nb_cheese in NB_CHEESE:
+    for maze_graph in corpus[SIZE]:
+        nodes = random.Random(0).sample(maze_graph.vertices, nb_cheese + 1)
+
+        # Exact meta-graph and its greedy tour
+        start = time.perf_counter()
+        exact = MetaGraph(maze_graph, nodes, nb_processes=1)
+        results[(nb_cheese, "exact time")].append(time.perf_counter() - start)
+        exact_tour = exact.greedy_path(nodes[-1], nodes[:-1])
+
+        # Approximate meta-graph, with the pairs of its greedy tour refined as in the Greedy player
+        start = time.perf_counter()
+        approximate = ApproximateMetaGraph(maze_graph, nodes)
+        approximate_distances = approximate.distances.copy()
+        tour = approximate.greedy_path(nodes[-1], nodes[:-1])
+        for _ in range(MAX_REFINEMENT_ROUNDS):
+            if approximate.refine(tour) == 0:
+                break
+            tour = approximate.greedy_path(nodes[-1], nodes[:-1])
+        approximate.refine(tour)
+        results[(nb_cheese, "approximate time")].append(time.perf_counter() - start)
+
+        # Relative errors over all pairs, before refinement
+        pairs = exact.distances > 0
+        errors = (approximate_distances[pairs] - exact.distances[pairs]) / exact.distances[pairs]
+        results[(nb_cheese, "mean error")].append(errors.mean())
+        results[(nb_cheese, "max error")].append(errors.max())
+        results[(nb_cheese, "exact pairs")].append((errors == 0).mean())
+
+        # Tours are compared with exact distances
+        assert approximate.path_length(tour) == exact.path_length(tour)
+        results[(nb_cheese, "tour excess")].append(exact.path_length(tour) / exact.path_length(exact_tour) - 1)
+    print("%4d pieces of cheese: %.3fs exact, %.3fs approximate, mean error %.1f%%, max error %.1f%%, exact pairs %.1f%%, tour excess %+.1f%%" % (nb_cheese, numpy.mean(results[(nb_cheese, "exact time")]), numpy.mean(results[(nb_cheese, "approximate time")]), 100 * numpy.mean(results[(nb_cheese, "mean error")]), 100 * numpy.max(results[(nb_cheese, "max error")]), 100 * numpy.mean(results[(nb_cheese, "exact pairs")]), 100 * numpy.mean(results[(nb_cheese, "tour excess")])))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the approximation for each number of pieces of cheese
+for nb_cheese in NB_CHEESE:
+    print("Speedup (%d pieces of cheese): x%.1f" % (nb_cheese, numpy.mean(results[(nb_cheese, "exact time")]) / numpy.mean(results[(nb_cheese, "approximate time")])))
+
+# Visualization of the times, and of the errors
+figure, (time_axis, error_axis) = pyplot.subplots(1, 2, figsize=(15, 5))
+for measure in ["exact time", "approximate time"]:
+    time_axis.plot(NB_CHEESE, [numpy.mean(results[(nb_cheese, measure)]) for nb_cheese in NB_CHEESE], marker="o", label=measure)
+time_axis.set_title("Time needed to build the meta-graph in %dx%d mazes (%d mazes)" % (SIZE[0], SIZE[1], NB_MAZES))
+time_axis.set_xlabel("number of pieces of cheese")
+time_axis.set_ylabel("time (s)")
+time_axis.set_yscale("log")
+time_axis.legend()
+for measure in ["mean error", "tour excess"]:
+    error_axis.plot(NB_CHEESE, [100 * numpy.mean(results[(nb_cheese, measure)]) for nb_cheese in NB_CHEESE], marker="o", label=measure)
+error_axis.set_title("Approximation error in %dx%d mazes (%d mazes)" % (SIZE[0], SIZE[1], NB_MAZES))
+error_axis.set_xlabel("number of pieces of cheese")
+error_axis.set_ylabel("relative error (%)")
+error_axis.legend()
+pyplot.show()
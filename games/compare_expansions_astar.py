@@ -0,0 +1,95 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we measure how many vertices A* saves compared to Dijkstra's algorithm, on the queries made by `GreedyEachTurn*` players. \
+# When a piece of cheese disappears, these players look for a route to a given piece of cheese, or to the nearest one. \
+# A* is guided by the Manhattan distance to the target (or to the closest remaining target), and Dijkstra is the same search without the heuristic.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import random
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import astar, astar_nearest
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"small": (15, 13), "medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size, and of queries per maze
+NB_MAZES = 5
+NB_QUERIES = 20
+
+# Numbers of remaining pieces of cheese for the nearest-cheese queries
+NB_CHEESE = [5, 20]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Reduction of the number of expanded vertices for each kind of query and each size
+queries = ["point to point"] + ["nearest of %d" % nb_cheese for nb_cheese in NB_CHEESE]
+reductions = {query: [] for query in queries}
+for legend, size in SIZES.items():
+    expanded = {(query, heuristic): 0 for query in queries for heuristic in [True, False]}
+    for maze_graph in corpus[size]:
+        generator = random.Random(size[0])
+        for _ in range(NB_QUERIES):
+            source, target = generator.sample(maze_graph.vertices, 2)
+            for heuristic in [True, False]:
+                expanded[("point to point", heuristic)] += astar(maze_graph, source, target, heuristic)[2]
+            for nb_cheese in NB_CHEESE:
+                pieces_of_cheese = generator.sample(maze_graph.vertices, nb_cheese)
+                for heuristic in [True, False]:
+                    expanded[("nearest of %d" % nb_cheese, heuristic)] += astar_nearest(maze_graph, source, pieces_of_cheese, heuristic)[2]
+
+    # Reduction over all queries for this size
+    for query in queries:
+        reductions[query].append(1.0 - expanded[(query, True)] / expanded[(query, False)])
+        print("%-6s %-15s Dijkstra %8d, A* %8d expanded vertices (-%.1f%%)" % (legend, query, expanded[(query, False)], expanded[(query, True)], 100 * reductions[query][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the reduction of expanded vertices
+pyplot.figure(figsize=(10, 5))
+for query in queries:
+    pyplot.plot(list(SIZES), [100 * reduction for reduction in reductions[query]], marker="o", label=query)
+pyplot.title("Expanded vertices saved by A* over Dijkstra (%d mazes per size, %d queries per maze)" % (NB_MAZES, NB_QUERIES))
+pyplot.xlabel("maze size")
+pyplot.ylabel("% of expanded vertices saved")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,120 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we measure the gain of the landmark oracle (`LandmarkOracle`) on the queries made by reactive players during turns. \
+# A* guided by the landmarks is compared to A* guided by the Manhattan distance, for several numbers of landmarks. \
+# We also report the memory and time needed to build the oracle, and how often `probably_nearest` finds the true nearest piece of cheese. \
+# For comparison, a `DistanceTable` needs two arrays of size `nb_cells x nb_cells`.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import astar, multi_target_dijkstra
+from LandmarkOracle import LandmarkOracle
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size, and of queries per maze
+NB_MAZES = 3
+NB_QUERIES = 20
+
+# Numbers of landmarks to test
+NB_LANDMARKS = [1, 4, 8, 16, 32]
+
+# Number of remaining pieces of cheese for the nearest-cheese queries
+NB_CHEESE = 20
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Expanded vertices, time of the queries, build time, memory and accuracy of probably_nearest for each size and number of landmarks
+results = {}
+for legend, size in SIZES.items():
+    for maze_graph in corpus[size]:
+        generator = random.Random(size[0])
+        queries = [generator.sample(maze_graph.vertices, 2) for _ in range(NB_QUERIES)]
+        nearest_queries = [(generator.choice(maze_graph.vertices), generator.sample(maze_graph.vertices, NB_CHEESE)) for _ in range(NB_QUERIES)]
+        nearest_distances = [min(multi_target_dijkstra(maze_graph, source, pieces_of_cheese)[0].values()) for source, pieces_of_cheese in nearest_queries]
+
+        # Reference: A* with the Manhattan distance
+        start = time.perf_counter()
+        expanded = sum(astar(maze_graph, source, target)[2] for source, target in queries)
+        results.setdefault((legend, 0), []).append({"expanded": expanded, "time": time.perf_counter() - start})
+
+        # A* with the landmarks
+        for nb_landmarks in NB_LANDMARKS:
+            start = time.perf_counter()
+            oracle = LandmarkOracle(maze_graph, nb_landmarks)
+            build_time = time.perf_counter() - start
+            start = time.perf_counter()
+            expanded = sum(oracle.astar(source, target)[2] for source, target in queries)
+            query_time = time.perf_counter() - start
+            start = time.perf_counter()
+            nearest = [oracle.probably_nearest(source, pieces_of_cheese)[0] for source, pieces_of_cheese in nearest_queries]
+            nearest_time = (time.perf_counter() - start) / NB_QUERIES
+            nb_exact = sum(multi_target_dijkstra(maze_graph, source, [target])[0][target] == distance for (source, _), target, distance in zip(nearest_queries, nearest, nearest_distances))
+            results.setdefault((legend, nb_landmarks), []).append({"expanded": expanded, "time": query_time, "build": build_time, "nbytes": oracle.nbytes, "nearest_time": nearest_time, "exact": nb_exact / NB_QUERIES})
+
+    # Memory of a table of all shortest paths, for comparison (int16 arrays)
+    nb_cells = size[0] * size[1]
+    print("%-6s DistanceTable would need %.1f MB" % (legend, 2 * 2 * nb_cells ** 2 / 1e6))
+    reference = results[(legend, 0)]
+    print("%-6s Manhattan: %8d expanded vertices, %.3fs" % (legend, sum(result["expanded"] for result in reference), sum(result["time"] for result in reference)))
+    for nb_landmarks in NB_LANDMARKS:
+        measures = results[(legend, nb_landmarks)]
+        print("%-6s %2d landmarks: %8d expanded vertices, %.3fs, build %.3fs, %.1f kB, probably_nearest %.1fus and exact %.0f%% of the time" % (legend, nb_landmarks,
+              sum(measure["expanded"] for measure in measures), sum(measure["time"] for measure in measures), max(measure["build"] for measure in measures),
+              measures[0]["nbytes"] / 1e3, 1e6 * max(measure["nearest_time"] for measure in measures), 100 * sum(measure["exact"] for measure in measures) / len(measures)))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the reduction of expanded vertices compared to the Manhattan distance
+pyplot.figure(figsize=(10, 5))
+for legend in SIZES:
+    reference = sum(result["expanded"] for result in results[(legend, 0)])
+    pyplot.plot(NB_LANDMARKS, [100 * (1.0 - sum(measure["expanded"] for measure in results[(legend, nb_landmarks)]) / reference) for nb_landmarks in NB_LANDMARKS], marker="o", label=legend)
+pyplot.title("Expanded vertices saved by landmarks over the Manhattan distance (%d mazes per size, %d queries per maze)" % (NB_MAZES, NB_QUERIES))
+pyplot.xlabel("number of landmarks")
+pyplot.ylabel("% of expanded vertices saved")
+pyplot.legend()
+pyplot.show()
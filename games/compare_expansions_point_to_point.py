@@ -0,0 +1,109 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we measure what players `Dijkstra`, `BFS` and `TraversalPlayer` save by using `point_to_point` instead of a full traversal. \
+# A full traversal expands every vertex of the maze to route to a single piece of cheese, while the bidirectional search stops when both searches meet. \
+# We count expanded vertices and time both approaches on the same seeded mazes and pairs of cells, with and without mud.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import dial_traversal, point_to_point
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"small": (15, 13), "medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size, and of (source, target) pairs per maze
+NB_MAZES = 5
+NB_PAIRS = 20
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Fraction of expanded vertices and time of each approach, for each size
+results = {key: [] for key in ["full traversal", "bidirectional (mud)", "bidirectional (moves)"]}
+times = {key: [] for key in results}
+for legend, size in SIZES.items():
+    fractions = {key: [] for key in results}
+    durations = {key: [] for key in results}
+    for maze_graph in corpus[size]:
+        generator = random.Random(size[0])
+        for _ in range(NB_PAIRS):
+            source, target = generator.sample(maze_graph.vertices, 2)
+
+            # Full traversal, as the players did before
+            start = time.perf_counter()
+            distances, _ = dial_traversal(maze_graph, source)
+            durations["full traversal"].append(time.perf_counter() - start)
+            fractions["full traversal"].append(len(distances) / maze_graph.nb_vertices)
+
+            # Bidirectional search, with mud (Dijkstra) and counting moves (BFS)
+            for key, unit_weights in [("bidirectional (mud)", False), ("bidirectional (moves)", True)]:
+                start = time.perf_counter()
+                _, _, nb_expanded = point_to_point(maze_graph, source, target, unit_weights)
+                durations[key].append(time.perf_counter() - start)
+                fractions[key].append(nb_expanded / maze_graph.nb_vertices)
+
+    # Mean over all pairs for this size
+    for key in results:
+        results[key].append(statistics.mean(fractions[key]))
+        times[key].append(statistics.mean(durations[key]))
+        print("%-6s %-22s %5.1f%% of vertices expanded, %.6fs" % (legend, key, 100 * results[key][-1], times[key][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the fraction of expanded vertices and of the time per search
+figure, axes = pyplot.subplots(1, 2, figsize=(14, 5))
+for key in results:
+    axes[0].plot(list(SIZES), [100 * fraction for fraction in results[key]], marker="o", label=key)
+    axes[1].plot(list(SIZES), times[key], marker="o", label=key)
+axes[0].set_title("Expanded vertices (%d mazes per size, %d pairs per maze)" % (NB_MAZES, NB_PAIRS))
+axes[0].set_xlabel("maze size")
+axes[0].set_ylabel("% of vertices")
+axes[1].set_yscale("log")
+axes[1].set_title("Mean time per search")
+axes[1].set_xlabel("maze size")
+axes[1].set_ylabel("time (s)")
+axes[0].legend()
+axes[1].legend()
+pyplot.show()
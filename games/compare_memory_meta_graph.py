@@ -0,0 +1,97 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the memory used by a meta-graph stored as dictionaries of `(distance, route)` pairs, as players used to build it, and by a `MetaGraph`. \
+# Dictionaries store two lists of cells per pair of vertices, while `MetaGraph` stores a matrix of distances and one array of predecessors per search. \
+# We also measure the time needed to build each of them (the dictionaries are obtained by building all routes of the `MetaGraph`).
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from MetaGraph import MetaGraph, meta_graph_nbytes
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size
+NB_MAZES = 1
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [10, 50, 100, 200]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Memory used by both structures
+results = {(legend, structure): [] for legend in SIZES for structure in ["dictionaries", "MetaGraph"]}
+for legend, size in SIZES.items():
+    for nb_cheese in NB_CHEESE:
+        for maze_graph in corpus[size]:
+            cells = random.Random(nb_cheese).sample(maze_graph.vertices, nb_cheese + 1)
+            start = time.perf_counter()
+            meta_graph = MetaGraph(maze_graph, cells)
+            build_time = time.perf_counter() - start
+            start = time.perf_counter()
+            complete_graph = {vertex: meta_graph[vertex] for vertex in meta_graph}
+            routes_time = time.perf_counter() - start
+            results[(legend, "MetaGraph")].append(meta_graph.nbytes / 1e6)
+            results[(legend, "dictionaries")].append(meta_graph_nbytes(complete_graph) / 1e6)
+            del complete_graph
+        print("%-6s %3d cheese: dictionaries %8.2f MB, MetaGraph %6.2f MB (searches %.3fs, building all routes %.3fs more)" % (legend, nb_cheese, results[(legend, "dictionaries")][-1], results[(legend, "MetaGraph")][-1], build_time, routes_time))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Memory saved for each size
+for legend in SIZES:
+    ratios = [dictionaries / compact for dictionaries, compact in zip(results[(legend, "dictionaries")], results[(legend, "MetaGraph")])]
+    print("Memory ratio (%s): %s" % (legend, ", ".join("%d cheese x%.1f" % (nb_cheese, ratio) for nb_cheese, ratio in zip(NB_CHEESE, ratios))))
+
+# Visualization of the memory used as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for legend, structure in results:
+    pyplot.plot(NB_CHEESE, results[(legend, structure)], marker="o", label="%s, %s" % (legend, structure))
+pyplot.yscale("log")
+pyplot.title("Memory used by the meta-graph (%d maze per size)" % (NB_MAZES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("memory (MB)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,101 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the two shortest-path engines available to the players: `heapq` (binary heap) and `Dial` (bucket queue). \
+# Both are run on the same seeded mazes of small, medium and large sizes, with the default mud configuration. \
+# We time full traversals (no target) and traversals that stop when a set of pieces of cheese is reached.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import ShortestPathEngine, TRAVERSALS
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"small": (15, 13), "medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size, of sources per maze, and of targets for the early-exit traversals
+NB_MAZES = 5
+NB_SOURCES = 10
+NB_TARGETS = 20
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Time of each engine, for each size and each kind of traversal
+results = {(engine, kind): [] for engine in ShortestPathEngine for kind in ["full", "targets"]}
+for legend, size in SIZES.items():
+    times = {key: [] for key in results}
+    for maze_graph in corpus[size]:
+        generator = random.Random(size[0])
+        sources = generator.sample(maze_graph.vertices, NB_SOURCES)
+        targets = generator.sample(maze_graph.vertices, NB_TARGETS)
+        for engine in ShortestPathEngine:
+            start = time.perf_counter()
+            for source in sources:
+                TRAVERSALS[engine](maze_graph, source)
+            times[(engine, "full")].append((time.perf_counter() - start) / NB_SOURCES)
+            start = time.perf_counter()
+            for source in sources:
+                TRAVERSALS[engine](maze_graph, source, targets)
+            times[(engine, "targets")].append((time.perf_counter() - start) / NB_SOURCES)
+    for key in results:
+        results[key].append(statistics.mean(times[key]))
+        print("%-6s %-5s %-7s %.6fs" % (legend, key[0].value, key[1], results[key][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of Dial over heapq for each size
+for kind in ["full", "targets"]:
+    speedups = [heap / dial for heap, dial in zip(results[(ShortestPathEngine.HEAP, kind)], results[(ShortestPathEngine.DIAL, kind)])]
+    print("Speedup (%s): %s" % (kind, ", ".join("%s x%.2f" % (legend, speedup) for legend, speedup in zip(SIZES, speedups))))
+
+# Visualization of the mean time per traversal
+pyplot.figure(figsize=(10, 5))
+for key in results:
+    pyplot.plot(list(SIZES), results[key], marker="o", label="%s, %s" % (key[0].value, key[1]))
+pyplot.yscale("log")
+pyplot.title("Mean time per traversal (%d mazes per size, %d sources per maze)" % (NB_MAZES, NB_SOURCES))
+pyplot.xlabel("maze size")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,103 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by `Two_opt_reactive` to play its turns against a `Greedy` opponent, with and without its `ActionTable`. \
+# Without the table, the player searches a route each time the opponent takes its destination, and converts it into actions. \
+# With the table, built in preprocessing, each turn is a lookup in an array of type int8 with one row per piece of cheese. \
+# We also report the time needed to build the table and the memory it uses.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import io
+import time
+import contextlib
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from pyrat import Game, GameMode
+from ActionTable import ActionTable
+from Greedy import Greedy
+from two_opt_reactive import Two_opt_reactive
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (61, 61)}
+
+# Number of games per size
+NB_GAMES = 3
+
+# Number of pieces of cheese in each game
+NB_CHEESE = 40
+
+# Configurations of the player to compare
+CONFIGURATIONS = {"routes": {"use_action_table": False}, "action table": {}}
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Total time spent in turns, for each size and configuration
+results = {(legend, configuration): [] for legend in SIZES for configuration in CONFIGURATIONS}
+for legend, (width, height) in SIZES.items():
+    for seed in range(NB_GAMES):
+        scores = []
+        for configuration, arguments in CONFIGURATIONS.items():
+            game = Game(random_seed=seed, nb_cheese=NB_CHEESE, mud_percentage=20, maze_width=width, maze_height=height, game_mode=GameMode.SIMULATION)
+            player = Two_opt_reactive(**arguments)
+            game.add_player(player)
+            game.add_player(Greedy(name="Opponent"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = game.start()
+            results[(legend, configuration)].append(sum(stats["players"][player.name]["turn_durations"]))
+            scores.append(stats["players"][player.name]["score"])
+        start = time.perf_counter()
+        table = ActionTable(player.maze_graph, player.action_table.targets)
+        print("%-6s game %d: scores %s, turns %.4fs with routes and %.4fs with the table (table of %d kB built in %.3fs)" % (legend, seed, scores, results[(legend, "routes")][-1], results[(legend, "action table")][-1], table.nbytes // 1000, time.perf_counter() - start))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the turns for each size
+for legend in SIZES:
+    print("Speedup of turns (%s): x%.1f" % (legend, statistics.mean(results[(legend, "routes")]) / statistics.mean(results[(legend, "action table")])))
+
+# Visualization of the time spent in turns
+pyplot.figure(figsize=(10, 5))
+for index, configuration in enumerate(CONFIGURATIONS):
+    pyplot.bar([position + 0.4 * index for position in range(len(SIZES))], [statistics.mean(results[(legend, configuration)]) for legend in SIZES], width=0.4, label=configuration)
+pyplot.xticks([position + 0.2 for position in range(len(SIZES))], list(SIZES))
+pyplot.yscale("log")
+pyplot.title("Total time spent in turns by Two_opt_reactive (mean over %d games)" % (NB_GAMES))
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,95 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by `Greedy.meta_graph` in mazes without mud, with one multi-target Dijkstra search per vertex and with a single bit-parallel BFS. \
+# The bit-parallel BFS is used automatically when the problem is large enough (see `BIT_PARALLEL_MIN_WORK`), so we change this threshold to force each version. \
+# All measures are made on the same seeded mazes and pieces of cheese.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+import shortest_paths
+from maze_corpus import maze_corpus
+from Greedy import Greedy
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size
+NB_MAZES = 3
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [10, 20, 40, 63]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes, without mud
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES, mud_percentage=0.0)
+
+# Time needed to build the meta-graph with each version
+results = {(legend, version): [] for legend in SIZES for version in ["Dijkstra", "bit-parallel BFS"]}
+player = Greedy()
+for legend, size in SIZES.items():
+    for nb_cheese in NB_CHEESE:
+        times = {version: [] for version in ["Dijkstra", "bit-parallel BFS"]}
+        for maze_graph in corpus[size]:
+            cells = random.Random(nb_cheese).sample(maze_graph.vertices, nb_cheese + 1)
+            for version, threshold in [("Dijkstra", float("inf")), ("bit-parallel BFS", 0)]:
+                shortest_paths.BIT_PARALLEL_MIN_WORK = threshold
+                start = time.perf_counter()
+                player.meta_graph(maze_graph, cells[0], cells[1:])
+                times[version].append(time.perf_counter() - start)
+        for version in times:
+            results[(legend, version)].append(statistics.mean(times[version]))
+        print("%-6s %2d cheese: Dijkstra %.4fs, bit-parallel BFS %.4fs" % (legend, nb_cheese, results[(legend, "Dijkstra")][-1], results[(legend, "bit-parallel BFS")][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the time needed as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for key in results:
+    pyplot.plot(NB_CHEESE, results[key], marker="o", label="%s, %s" % key)
+pyplot.yscale("log")
+pyplot.title("Time needed to build the meta-graph without mud (mean over %d mazes)" % (NB_MAZES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
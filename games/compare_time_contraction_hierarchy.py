@@ -0,0 +1,116 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed to build a meta-graph between all pieces of cheese in large mazes. \
+# The reference is `Greedy.meta_graph` with the `heap` engine, which runs one Dijkstra search with `heapq` per vertex of the meta-graph (with the routes of all pairs, as the hierarchy builds them). \
+# With a `ContractionHierarchy`, each vertex only needs a tiny search going up the hierarchy, and all pairs are matched with buckets. \
+# The hierarchy is built once per maze (and reused by games with the same maze), so its build time is reported separately.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import ShortestPathEngine
+from ContractionHierarchy import contraction_hierarchy
+from Greedy import Greedy
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"large": (100, 100), "huge": (150, 150)}
+
+# Number of mazes per size
+NB_MAZES = 2
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [10, 50, 100, 200, 400]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Build the hierarchies once, as games with the same maze would
+build_times = {legend: [] for legend in SIZES}
+for legend, size in SIZES.items():
+    for maze_graph in corpus[size]:
+        start = time.perf_counter()
+        hierarchy = contraction_hierarchy(maze_graph)
+        build_times[legend].append(time.perf_counter() - start)
+        print("%-6s hierarchy built in %.2fs, %d shortcuts" % (legend, build_times[legend][-1], len(hierarchy.middles) // 2))
+
+# Time needed to build the meta-graph with both methods
+results = {(legend, method): [] for legend in SIZES for method in ["heapq", "hierarchy"]}
+player = Greedy(engine=ShortestPathEngine.HEAP)
+for legend, size in SIZES.items():
+    for nb_cheese in NB_CHEESE:
+        times = {"heapq": [], "hierarchy": []}
+        for maze_graph in corpus[size]:
+            cells = random.Random(nb_cheese).sample(maze_graph.vertices, nb_cheese + 1)
+            start = time.perf_counter()
+            reference = player.meta_graph(maze_graph, cells[0], cells[1:])
+            reference = {vertex: reference[vertex] for vertex in reference}
+            times["heapq"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            meta_graph = contraction_hierarchy(maze_graph).meta_graph(cells)
+            times["hierarchy"].append(time.perf_counter() - start)
+            assert all(meta_graph[vertex][neighbor][0] == reference[vertex][neighbor][0] for vertex in meta_graph for neighbor in meta_graph[vertex])
+        for method in times:
+            results[(legend, method)].append(statistics.mean(times[method]))
+        print("%-6s %3d cheese: heapq %.3fs, hierarchy %.3fs" % (legend, nb_cheese, results[(legend, "heapq")][-1], results[(legend, "hierarchy")][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the hierarchy over heapq for each size, and number of games after which building the hierarchy pays off
+for legend in SIZES:
+    speedups = [heap / hierarchy for heap, hierarchy in zip(results[(legend, "heapq")], results[(legend, "hierarchy")])]
+    gains = [heap - hierarchy for heap, hierarchy in zip(results[(legend, "heapq")], results[(legend, "hierarchy")])]
+    print("Speedup (%s): %s" % (legend, ", ".join("%d cheese x%.2f" % (nb_cheese, speedup) for nb_cheese, speedup in zip(NB_CHEESE, speedups))))
+    print("Games to pay off the build (%s): %s" % (legend, ", ".join("%d cheese %.1f" % (nb_cheese, statistics.mean(build_times[legend]) / gain) if gain > 0 else "%d cheese never" % nb_cheese for nb_cheese, gain in zip(NB_CHEESE, gains))))
+
+# Visualization of the time needed as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for legend, method in results:
+    pyplot.plot(NB_CHEESE, results[(legend, method)], marker="o", label="%s, %s" % (legend, method))
+pyplot.yscale("log")
+pyplot.title("Time needed to build the meta-graph (mean over %d mazes, hierarchy built beforehand)" % (NB_MAZES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,104 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we evaluate the contraction of corridors (chains of cells with two neighbors) before building the meta-graph. \
+# We first report the fraction of vertices and edges that remain in the contracted mazes, with the player and the pieces of cheese kept as vertices. \
+# Then, we compare the time needed by `Greedy.meta_graph` on the full maze and on the contracted maze, including the time needed to contract it. \
+# Mazes are tested with the default mud configuration and without mud, as the bit-parallel BFS is only possible on the full maze.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from ContractedGraph import ContractedGraph
+from Greedy import Greedy
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"small": (15, 13), "medium": (31, 29), "large": (100, 100)}
+
+# Mud configurations to test, with a legend
+MUD_PERCENTAGES = {"mud": 20.0, "no mud": 0.0}
+
+# Number of mazes per size
+NB_MAZES = 3
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [10, 40, 100]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Reduction ratios, and time needed to build the meta-graph on both mazes
+ratios = {}
+speedups = {}
+player = Greedy(contract_corridors=False)
+for mud_legend, mud_percentage in MUD_PERCENTAGES.items():
+    corpus = maze_corpus(list(SIZES.values()), NB_MAZES, mud_percentage=mud_percentage)
+    for legend, size in SIZES.items():
+        for nb_cheese in NB_CHEESE:
+            vertex_ratios, edge_ratios, full_times, contracted_times = [], [], [], []
+            for maze_graph in corpus[size]:
+                cells = random.Random(nb_cheese).sample(maze_graph.vertices, min(nb_cheese + 1, maze_graph.nb_vertices))
+                start = time.perf_counter()
+                player.meta_graph(maze_graph, cells[0], cells[1:])
+                full_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                contracted_graph = ContractedGraph(maze_graph, cells)
+                player.meta_graph(contracted_graph, cells[0], cells[1:])
+                contracted_times.append(time.perf_counter() - start)
+                vertex_ratios.append(contracted_graph.reduction_ratio())
+                edge_ratios.append(len(contracted_graph.indices) / len(maze_graph.indices))
+            ratios[(mud_legend, legend, nb_cheese)] = (statistics.mean(vertex_ratios), statistics.mean(edge_ratios))
+            speedups[(mud_legend, legend, nb_cheese)] = statistics.mean(full_times) / statistics.mean(contracted_times)
+            print("%-6s %-6s %3d cheese: %.1f%% vertices, %.1f%% edges kept, full %.4fs, contracted %.4fs (x%.2f)" % (mud_legend, legend, nb_cheese, 100 * ratios[(mud_legend, legend, nb_cheese)][0], 100 * ratios[(mud_legend, legend, nb_cheese)][1], statistics.mean(full_times), statistics.mean(contracted_times), speedups[(mud_legend, legend, nb_cheese)]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the speedup as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for mud_legend in MUD_PERCENTAGES:
+    for legend in SIZES:
+        pyplot.plot(NB_CHEESE, [speedups[(mud_legend, legend, nb_cheese)] for nb_cheese in NB_CHEESE], marker="o", label="%s, %s" % (legend, mud_legend))
+pyplot.axhline(1.0, color="gray", linestyle="--")
+pyplot.title("Speedup of the meta-graph with contracted corridors (mean over %d mazes)" % (NB_MAZES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("speedup")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,115 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by a reactive player to find the nearest piece of cheese at each turn. \
+# The reference is `astar_nearest`, that searches from the location of the player at each turn. \
+# A `DynamicShortestPathTree` is re-rooted at the location of the player, and only searches again when its bounds cannot prove which piece of cheese is the nearest. \
+# The player follows the route to the nearest piece of cheese, and an opponent eats a random piece of cheese from time to time.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import astar_nearest
+from DynamicShortestPathTree import DynamicShortestPathTree
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (61, 61), "huge": (100, 100)}
+
+# Number of mazes per size
+NB_MAZES = 2
+
+# Number of pieces of cheese in each maze
+NB_CHEESE = 40
+
+# Probability that the opponent eats a piece of cheese at each turn
+OPPONENT_PROBABILITY = 0.1
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Time spent to find the nearest piece of cheese at each turn of a whole game
+results = {(legend, method): [] for legend in SIZES for method in ["A*", "dynamic tree"]}
+for legend, size in SIZES.items():
+    times = {"A*": 0.0, "dynamic tree": 0.0}
+    nb_turns, nb_searches = 0, 0
+    for maze_graph in corpus[size]:
+        rng = random.Random(0)
+        pieces_of_cheese = rng.sample(maze_graph.vertices, NB_CHEESE)
+        position = rng.choice([vertex for vertex in maze_graph.vertices if vertex not in pieces_of_cheese])
+        tree = DynamicShortestPathTree(maze_graph, position, pieces_of_cheese)
+        while len(pieces_of_cheese) > 0:
+            start = time.perf_counter()
+            distance, _, _ = astar_nearest(maze_graph, position, pieces_of_cheese)
+            times["A*"] += time.perf_counter() - start
+            start = time.perf_counter()
+            tree.move_to(position)
+            nearest, tree_distance = tree.nearest(pieces_of_cheese)
+            route = tree.route(nearest)
+            times["dynamic tree"] += time.perf_counter() - start
+            assert tree_distance == distance
+            position = route[1]
+            nb_turns += 1
+            if position in pieces_of_cheese:
+                pieces_of_cheese.remove(position)
+            if len(pieces_of_cheese) > 1 and rng.random() < OPPONENT_PROBABILITY:
+                pieces_of_cheese.remove(rng.choice(pieces_of_cheese))
+        nb_searches += tree.nb_searches
+    for method in times:
+        results[(legend, method)].append(times[method] / nb_turns)
+    print("%-6s %d turns: A* %.1fus per turn, dynamic tree %.1fus per turn (%d searches)" % (legend, nb_turns, results[(legend, "A*")][-1] * 1e6, results[(legend, "dynamic tree")][-1] * 1e6, nb_searches))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the dynamic tree for each size
+for legend in SIZES:
+    print("Speedup (%s): x%.1f" % (legend, results[(legend, "A*")][0] / results[(legend, "dynamic tree")][0]))
+
+# Visualization of the time needed per turn
+pyplot.figure(figsize=(10, 5))
+for index, method in enumerate(["A*", "dynamic tree"]):
+    pyplot.bar([position + 0.4 * index for position in range(len(SIZES))], [results[(legend, method)][0] * 1e6 for legend in SIZES], width=0.4, label=method)
+pyplot.xticks([position + 0.2 for position in range(len(SIZES))], list(SIZES))
+pyplot.yscale("log")
+pyplot.title("Time needed to find the nearest piece of cheese at each turn (%d mazes per size)" % (NB_MAZES))
+pyplot.ylabel("time per turn (us)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,96 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed to build a `MetaGraph` in mazes with mud, with serial searches and with searches sharded across a pool of processes. \
+# The snapshot of the maze is shipped to the workers through shared memory, and each worker rebuilds it once before running its searches. \
+# On a machine with a single core, the pool only adds its fixed cost, so the measures are only meaningful with several cores.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import numpy
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from MetaGraph import MetaGraph
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Size of the mazes to test
+SIZE = (100, 100)
+
+# Number of mazes
+NB_MAZES = 2
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [50, 100, 200]
+
+# Numbers of processes to test (1 is serial)
+NB_PROCESSES = sorted({1, 2, os.cpu_count() or 1})
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus([SIZE], NB_MAZES)
+
+# Time needed to build the meta-graph, for each number of pieces of cheese and of processes
+results = {(nb_cheese, nb_processes): [] for nb_cheese in NB_CHEESE for nb_processes in NB_PROCESSES}
+for nb_cheese in NB_CHEESE:
+    for maze_graph in corpus[SIZE]:
+        nodes = random.Random(0).sample(maze_graph.vertices, nb_cheese + 1)
+        reference = None
+        for nb_processes in NB_PROCESSES:
+            start = time.perf_counter()
+            meta_graph = MetaGraph(maze_graph, nodes, nb_processes=nb_processes)
+            results[(nb_cheese, nb_processes)].append(time.perf_counter() - start)
+            reference = meta_graph.distances if reference is None else reference
+            assert numpy.array_equal(meta_graph.distances, reference)
+    print("%3d pieces of cheese: %s" % (nb_cheese, ", ".join("%.3fs with %d process(es)" % (numpy.mean(results[(nb_cheese, nb_processes)]), nb_processes) for nb_processes in NB_PROCESSES)))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the pool for each number of pieces of cheese
+for nb_cheese in NB_CHEESE:
+    print("Speedup (%d pieces of cheese, %d processes): x%.1f" % (nb_cheese, NB_PROCESSES[-1], numpy.mean(results[(nb_cheese, 1)]) / numpy.mean(results[(nb_cheese, NB_PROCESSES[-1])])))
+
+# Visualization of the time needed to build the meta-graph
+pyplot.figure(figsize=(10, 5))
+for nb_processes in NB_PROCESSES:
+    pyplot.plot(NB_CHEESE, [numpy.mean(results[(nb_cheese, nb_processes)]) for nb_cheese in NB_CHEESE], marker="o", label="%d process(es)" % (nb_processes))
+pyplot.title("Time needed to build a meta-graph in %dx%d mazes with mud (%d mazes)" % (SIZE[0], SIZE[1], NB_MAZES))
+pyplot.xlabel("number of pieces of cheese")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,108 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by `Greedy.meta_graph` when it runs directly on the maze and when it runs on a `MazeGraph` snapshot. \
+# The time of the snapshot includes its construction, as it is built in `preprocessing`. \
+# All measures are made on the same mazes (25x20, with mud) and the same pieces of cheese.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from pyrat import BigHolesRandomMaze
+from Greedy import Greedy
+from MazeGraph import MazeGraph
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+#
+# For each number of pieces of cheese, we measure the mean time over several seeded mazes.
+
+# %%
+# Determines how many mazes are used for each number of cheese
+NB_GAMES = 10
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [2 * i for i in range(1, 21)]
+
+# Maze configuration
+MAZE_CONFIG = {"width": 25,
+               "height": 20,
+               "cell_percentage": 80.0,
+               "wall_percentage": 60.0,
+               "mud_percentage": 20.0,
+               "mud_range": (4, 9)}
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Time needed to build the meta-graph with and without snapshot
+results = {"Maze": [], "MazeGraph": []}
+player = Greedy()
+for nb_cheese in NB_CHEESE:
+    times = {key: [] for key in results}
+    for seed in range(NB_GAMES):
+
+        # Same maze and cheese for both versions
+        maze = BigHolesRandomMaze(random_seed=seed, **MAZE_CONFIG)
+        cells = random.Random(seed).sample(maze.vertices, nb_cheese + 1)
+        source, pieces_of_cheese = cells[0], cells[1:]
+
+        # Meta-graph on the maze
+        start = time.perf_counter()
+        player.meta_graph(maze, source, pieces_of_cheese)
+        times["Maze"].append(time.perf_counter() - start)
+
+        # Meta-graph on the snapshot, including its construction
+        start = time.perf_counter()
+        player.meta_graph(MazeGraph(maze), source, pieces_of_cheese)
+        times["MazeGraph"].append(time.perf_counter() - start)
+
+    # Mean time for this number of cheese
+    for key in results:
+        results[key].append(statistics.mean(times[key]))
+    print("%3d cheese: Maze %.4fs, MazeGraph %.4fs" % (nb_cheese, results["Maze"][-1], results["MazeGraph"][-1]))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the time needed as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for key in results:
+    pyplot.plot(NB_CHEESE, results[key], label=key)
+pyplot.title("Time needed to build the meta-graph (mean over %d mazes)" % (NB_GAMES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("Time needed in preprocessing")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,102 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by `Greedy.meta_graph` with the pure-Python engine (`Dial`) and with the `scipy` engine. \
+# With `Dial`, one multi-target Dijkstra search is performed per vertex of the meta-graph, while `scipy` computes all of them in a single call to `scipy.sparse.csgraph.dijkstra`. \
+# Mazes have the default mud configuration, and the number of pieces of cheese goes up to several hundreds.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import ShortestPathEngine
+from Greedy import Greedy
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size
+NB_MAZES = 3
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [10, 50, 100, 200, 400]
+
+# Engines to compare
+ENGINES = [ShortestPathEngine.DIAL, ShortestPathEngine.SCIPY]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES)
+
+# Time needed to build the meta-graph with each engine
+results = {(legend, engine): [] for legend in SIZES for engine in ENGINES}
+players = {engine: Greedy(engine=engine) for engine in ENGINES}
+for legend, size in SIZES.items():
+    for nb_cheese in NB_CHEESE:
+        times = {engine: [] for engine in ENGINES}
+        for maze_graph in corpus[size]:
+            cells = random.Random(nb_cheese).sample(maze_graph.vertices, nb_cheese + 1)
+            for engine in ENGINES:
+                start = time.perf_counter()
+                players[engine].meta_graph(maze_graph, cells[0], cells[1:])
+                times[engine].append(time.perf_counter() - start)
+        for engine in ENGINES:
+            results[(legend, engine)].append(statistics.mean(times[engine]))
+        print("%-6s %3d cheese: %s" % (legend, nb_cheese, ", ".join("%s %.4fs" % (engine.value, results[(legend, engine)][-1]) for engine in ENGINES)))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of scipy over Dial for each size
+for legend in SIZES:
+    speedups = [dial / scipy for dial, scipy in zip(results[(legend, ShortestPathEngine.DIAL)], results[(legend, ShortestPathEngine.SCIPY)])]
+    print("Speedup (%s): %s" % (legend, ", ".join("%d cheese x%.2f" % (nb_cheese, speedup) for nb_cheese, speedup in zip(NB_CHEESE, speedups))))
+
+# Visualization of the time needed as a function of the number of cheese
+pyplot.figure(figsize=(10, 5))
+for legend, engine in results:
+    pyplot.plot(NB_CHEESE, results[(legend, engine)], marker="o", label="%s, %s" % (legend, engine.value))
+pyplot.yscale("log")
+pyplot.title("Time needed to build the meta-graph (mean over %d mazes)" % (NB_MAZES))
+pyplot.xlabel("number of cheese")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -0,0 +1,144 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed by the tour heuristics of the players (greedy path, then 2-opt), when distances are read from a meta-graph as dictionaries and when they are read from the distance matrix of a `MetaGraph`. \
+# With the matrix, the greedy choice of each step is an argmin over the remaining pieces of cheese, and the changes in length of all swaps of a vertex are computed at once. \
+# Both versions make the same choices, so the measures also check that they return the same tours.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import numpy
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+sys.path.append(os.path.join(this_directory, "..", "players"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from MetaGraph import MetaGraph
+from two_opt import Two_opt
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Size of the mazes to test
+SIZE = (61, 61)
+
+# Number of mazes
+NB_MAZES = 2
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [25, 50, 100, 200]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">FUNCTIONS</h1>
+
+# %%
+def dict_tour (meta_graph, source, pieces_of_cheese):
+
+    """
+        Greedy path then 2-opt, as the players did with meta-graphs as dictionaries.
+        In:
+            * meta_graph:       Meta-graph as dictionaries.
+            * source:           The initial location of the player.
+            * pieces_of_cheese: The pieces of cheese to visit.
+        Out:
+            * path: The optimized path.
+    """
+
+    # Greedy path
+    non_visited = pieces_of_cheese.copy()
+    path = [source]
+    while len(non_visited) > 0:
+        path.append(min([(v, meta_graph[path[-1]][v][0]) for v in non_visited], key=lambda x: x[1])[0])
+        non_visited.remove(path[-1])
+
+    # 2-opt with first improvements
+    path_length = lambda path: sum([meta_graph[path[i]][path[i + 1]][0] for i in range(len(path) - 1)])
+    best_length = path_length(path)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(path) - 1):
+            for j in range(i + 1, len(path) - 1):
+                new_path = path.copy()
+                new_path[i], new_path[j] = new_path[j], new_path[i]
+                new_path_length = path_length(new_path)
+                if new_path_length < best_length:
+                    path, best_length, improved = new_path, new_path_length, True
+    return path
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes
+corpus = maze_corpus([SIZE], NB_MAZES)
+
+# Time needed by the heuristics, for each number of pieces of cheese
+player = Two_opt()
+results = {(nb_cheese, version): [] for nb_cheese in NB_CHEESE for version in ["dictionaries", "matrix"]}
+for nb_cheese in NB_CHEESE:
+    for maze_graph in corpus[SIZE]:
+        nodes = random.Random(0).sample(maze_graph.vertices, nb_cheese + 1)
+        meta_graph = MetaGraph(maze_graph, nodes)
+
+        # Distances only, as routes are not used by the heuristics
+        dictionaries = {vertex: {target: (meta_graph.distance(vertex, target), None) for target in nodes if target != vertex} for vertex in nodes}
+        start = time.perf_counter()
+        reference = dict_tour(dictionaries, nodes[-1], nodes[:-1])
+        results[(nb_cheese, "dictionaries")].append(time.perf_counter() - start)
+
+        # Vectorized queries on the matrix
+        start = time.perf_counter()
+        path = player.two_opt(player.partial_path(nodes[:-1], nodes[-1], meta_graph), meta_graph)
+        results[(nb_cheese, "matrix")].append(time.perf_counter() - start)
+        assert path == reference
+    print("%3d pieces of cheese: %.3fs with dictionaries, %.3fs with the matrix" % (nb_cheese, numpy.mean(results[(nb_cheese, "dictionaries")]), numpy.mean(results[(nb_cheese, "matrix")])))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Speedup of the matrix for each number of pieces of cheese
+for nb_cheese in NB_CHEESE:
+    print("Speedup (%d pieces of cheese): x%.1f" % (nb_cheese, numpy.mean(results[(nb_cheese, "dictionaries")]) / numpy.mean(results[(nb_cheese, "matrix")])))
+
+# Visualization of the time needed by the heuristics
+pyplot.figure(figsize=(10, 5))
+for version in ["dictionaries", "matrix"]:
+    pyplot.plot(NB_CHEESE, [numpy.mean(results[(nb_cheese, version)]) for nb_cheese in NB_CHEESE], marker="o", label=version)
+pyplot.title("Time needed by the greedy path and 2-opt in %dx%d mazes (%d mazes)" % (SIZE[0], SIZE[1], NB_MAZES))
+pyplot.xlabel("number of pieces of cheese")
+pyplot.ylabel("time (s)")
+pyplot.yscale("log")
+pyplot.legend()
+pyplot.show()
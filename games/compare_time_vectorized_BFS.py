@@ -0,0 +1,103 @@
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">INFO</h1>
+#
+# In this script, we compare the time needed to compute all cheese-to-cheese distances in mazes without mud. \
+# With the DIAL engine, players run one Dial traversal per piece of cheese, while `bfs_distance_field` computes the distance fields of all pieces of cheese in a single batched NumPy computation. \
+# Both are run on the same seeded mazes and pieces of cheese.
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">IMPORTS</h1>
+
+# %%
+# External imports
+import sys
+import os
+import time
+import random
+import statistics
+import matplotlib.pyplot as pyplot
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
+# PyRat imports
+from maze_corpus import maze_corpus
+from shortest_paths import dial_traversal
+from grid_bfs import bfs_distance_field
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">CONSTANTS</h1>
+
+# %%
+# Sizes of mazes to test, with a legend
+SIZES = {"small": (15, 13), "medium": (31, 29), "large": (100, 100)}
+
+# Number of mazes per size
+NB_MAZES = 5
+
+# Numbers of pieces of cheese to test
+NB_CHEESE = [1, 10, 40]
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">RUN THE MEASURES</h1>
+
+# %%
+# Generate the mazes, without mud
+corpus = maze_corpus(list(SIZES.values()), NB_MAZES, mud_percentage=0.0)
+
+# Time of both approaches for each size and number of cheese
+results = {(approach, nb_cheese): [] for approach in ["Dial traversals", "batched BFS"] for nb_cheese in NB_CHEESE}
+for legend, size in SIZES.items():
+    times = {key: [] for key in results}
+    for maze_graph in corpus[size]:
+        for nb_cheese in NB_CHEESE:
+            pieces_of_cheese = random.Random(size[0]).sample(maze_graph.vertices, nb_cheese)
+
+            # One traversal per piece of cheese
+            start = time.perf_counter()
+            for piece_of_cheese in pieces_of_cheese:
+                dial_traversal(maze_graph, piece_of_cheese)
+            times[("Dial traversals", nb_cheese)].append(time.perf_counter() - start)
+
+            # All pieces of cheese at once
+            start = time.perf_counter()
+            bfs_distance_field(maze_graph, pieces_of_cheese)
+            times[("batched BFS", nb_cheese)].append(time.perf_counter() - start)
+
+    # Mean time for this size
+    for key in results:
+        results[key].append(statistics.mean(times[key]))
+    for nb_cheese in NB_CHEESE:
+        dial, batched = results[("Dial traversals", nb_cheese)][-1], results[("batched BFS", nb_cheese)][-1]
+        print("%-6s %2d cheese: Dial %.5fs, batched BFS %.5fs (x%.1f)" % (legend, nb_cheese, dial, batched, dial / batched))
+
+# %% [markdown]
+# <h1 style="background-color: gray;
+#            color: black;
+#            padding: 20px;
+#            text-align: center;">ANALYZE THE RESULTS</h1>
+
+# %%
+# Visualization of the time needed for all distance fields
+pyplot.figure(figsize=(10, 5))
+for key in results:
+    pyplot.plot(list(SIZES), results[key], marker="o", label="%s, %d cheese" % key)
+pyplot.yscale("log")
+pyplot.title("Time to compute the distance fields of all pieces of cheese (mean over %d mazes)" % (NB_MAZES))
+pyplot.xlabel("maze size")
+pyplot.ylabel("time (s)")
+pyplot.legend()
+pyplot.show()
@@ -41,6 +41,9 @@ CONFIG = {"mud_percentage": 30.0,
           "random_seed": 68,
           "trace_length": 1000}
 
+# Directory in which the player keeps its route, so that running the script again skips the exhaustive search
+CACHE_DIRECTORY = os.path.join(this_directory, "..", "cache")
+
 # %% [markdown]
 # <h1 style="background-color: gray;
 #            color: black;
@@ -55,7 +58,7 @@ CONFIG = {"mud_percentage": 30.0,
 game = Game(**CONFIG)
 
 # Instantiate a player and add it to the game
-player = Exhaustive()
+player = Exhaustive(cache_directory=CACHE_DIRECTORY)
 game.add_player(player)
 
 # Start the game and
@@ -11,9 +11,17 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action,Graph
+from MazeGraph import MazeGraph
+from shortest_paths import point_to_point
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -51,6 +59,8 @@ class BFS (Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+        self.nb_expanded = 0
         self.actions = []
        
     #############################################################################################################################################
@@ -166,18 +176,19 @@ class BFS (Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the location of the target (e.g., cheese) from the game state.
         target = game_state.cheese[0]
 
-        # Perform a graph traversal from the source to build the routing table.
-        # The routing table maps each vertex to its parent in the traversal path.
-        routing_table = self.traversal(maze, source)[1]
-
-        # Use the routing table to find the route from the source to the target.
-        route = self.find_route(routing_table, source, target)
+        # Search from both the source and the target, which stops long before the whole maze is explored.
+        # We keep the number of expanded vertices to measure the savings.
+        _, route, self.nb_expanded = point_to_point(self.maze_graph, source, target, unit_weights=True)
 
         # Convert the route (list of locations) into a series of actions that the player can take.
         actions = maze.locations_to_actions(route)
@@ -230,8 +241,8 @@ class BFS (Player):
                 * None.
         """
 
-        # Print phase of the game
-        print("Postprocessing")
+        # Print phase of the game, with the number of vertices expanded to find the route
+        print("Postprocessing (%d vertices expanded out of %d)" % (self.nb_expanded, self.maze_graph.nb_vertices))
 
 #####################################################################################################################################################
 #####################################################################################################################################################
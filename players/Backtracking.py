@@ -11,10 +11,18 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, multi_target_dijkstra, predecessors_to_route, batched_searches
+from maze_structure import reduce_maze, compress_excursions, node_cell
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -29,6 +37,7 @@ class Backtracking (Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -41,6 +50,7 @@ class Backtracking (Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine used by the searches of the player.
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -48,7 +58,14 @@ class Backtracking (Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
-        self.actions=[]
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+        self.actions=iter([])
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -56,7 +73,7 @@ class Backtracking (Player):
     def shortest_path ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -67,59 +84,15 @@ class Backtracking (Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     distances,
@@ -166,14 +139,14 @@ class Backtracking (Player):
         sources = peices_of_cheese + [source]
         for element in sources:
             complete_graph[element]={}
+        searches=batched_searches(maze,sources,self.engine)
         nodes=sources.copy()
         while len(nodes)>0:
             start=nodes.pop()
             targets = [target for target in sources if target != start and target not in complete_graph[start]]
-            distances ,routing_table=self.shortest_path(maze,start,targets)
+            target_distances,predecessors=searches[start] if searches is not None else multi_target_dijkstra(maze,start,targets,self.engine)
             for target in targets:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            start,target)
+                route,distance=predecessors_to_route(predecessors,start,target),target_distances[target]
                 complete_graph[target][start]=(distance,route[::-1])
                 complete_graph[start][target]=(distance,route)
         return complete_graph
@@ -193,7 +166,9 @@ class Backtracking (Player):
             Out:
                * route : The shorted path found
         """
-        graph=self.meta_graph(maze,source,pieces_of_cheese)
+        # Dead ends without cheese are pruned, and tree-like pockets of cheese become single excursion nodes
+        search_graph,excursions,targets=reduce_maze(maze,source,pieces_of_cheese)
+        graph,nodes=compress_excursions(self.meta_graph(search_graph,source,targets),source,pieces_of_cheese,excursions)
         best_distance=float('inf')
         best_path=[source]
         def brute_force(remaining,vertex,path,weight,graph):
@@ -209,11 +184,11 @@ class Backtracking (Player):
                     new_weight=weight+graph[vertex][new_vertex][0]
                     if new_weight<best_distance:
                         brute_force(new_remaining,new_vertex,path+[new_vertex],new_weight,graph)
-        brute_force(pieces_of_cheese,source,best_path,0,graph)
+        brute_force(nodes,source,best_path,0,graph)
         route=[] 
         for i in range(len(best_path)-1):
             route+=graph[best_path[i]][best_path[i+1]][1][:-1]
-        route.append(best_path[-1])
+        route.append(node_cell(best_path[-1]))
         return route
 
     @override
@@ -232,16 +207,20 @@ class Backtracking (Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the location of the target (e.g., cheese) from the game state.
         peices_of_cheese = game_state.cheese
 
-        route = self.traversal(maze, source, peices_of_cheese)
+        route = self.traversal(self.maze_graph, source, peices_of_cheese)
 
-        # Convert the route (list of locations) into a series of actions that the player can take.
-        actions = maze.locations_to_actions(route)
+        # Convert the route (list of locations) into a series of actions that the player can take, as they are needed.
+        actions = self.maze_graph.route_actions(route)
 
         # Store the resulting actions in the player's object for use during the game.
         self.actions = actions
@@ -266,7 +245,7 @@ class Backtracking (Player):
                 * action: One of the possible actions.
         """
 
-        return self.actions.pop(0)
+        return next(self.actions)
 
 #############################################################################################################################################
 
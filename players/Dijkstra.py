@@ -17,10 +17,17 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, point_to_point
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -39,6 +46,7 @@ class Dijkstra (Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -51,6 +59,7 @@ class Dijkstra (Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine of the search (HEAP searches from both ends with point_to_point, other engines run traversal toward the cheese).
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -58,6 +67,14 @@ class Dijkstra (Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+        self.nb_expanded = 0
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine of the search
+        self.engine = engine
         self.actions=[]
        
     #############################################################################################################################################
@@ -65,7 +82,8 @@ class Dijkstra (Player):
     #############################################################################################################################################
     def traversal ( self:   Self,
                 maze:  Maze,
-                source: Integral
+                source: Integral,
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -76,58 +94,15 @@ class Dijkstra (Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0:
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     source:        Integral,
@@ -181,18 +156,24 @@ class Dijkstra (Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the location of the target (e.g., cheese) from the game state.
         target = game_state.cheese[0]
 
-        # Perform a graph traversal from the source to build the routing table.
-        # The routing table maps each vertex to its parent in the traversal path.
-        routing_table = self.traversal(maze, source)[1]
-
-        # Use the routing table to find the route from the source to the target.
-        route = self.find_route(routing_table, source, target)
+        # With the binary heap, search from both the source and the target, which stops long before the whole maze is explored.
+        # Other engines run a traversal that stops when the target is reached.
+        # We keep the number of expanded vertices to measure the savings.
+        if self.engine == ShortestPathEngine.HEAP:
+            _, route, self.nb_expanded = point_to_point(self.maze_graph, source, target)
+        else:
+            distances, routing_table = self.traversal(self.maze_graph, source, [target])
+            route, self.nb_expanded = self.find_route(routing_table, source, target), len(distances)
 
         # Convert the route (list of locations) into a series of actions that the player can take.
         actions = maze.locations_to_actions(route)
@@ -243,8 +224,8 @@ class Dijkstra (Player):
                 * None.
         """
 
-        # Print phase of the game
-        print("Postprocessing")
+        # Print phase of the game, with the number of vertices expanded to find the route
+        print("Postprocessing (%d vertices expanded out of %d)" % (self.nb_expanded, self.maze_graph.nb_vertices))
 
 #####################################################################################################################################################
 #####################################################################################################################################################
@@ -11,10 +11,20 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+import numpy
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, multi_target_dijkstra, predecessors_to_route, batched_searches
+from maze_structure import reduce_maze, compress_excursions, node_cell
+from ArtifactCache import ArtifactCache, artifact_key
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -27,10 +37,12 @@ class Exhaustive (Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:            Self,
+                   *args:           Any,
+                   engine:          ShortestPathEngine = ShortestPathEngine.HEAP,
+                   cache_directory: Optional[str] = None,
+                   **kwargs:        Any
+                 ) ->               Self:
 
         """
             This function is the constructor of the class.
@@ -39,16 +51,29 @@ class Exhaustive (Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:            Reference to the current object.
+                * args:            Arguments to pass to the parent constructor.
+                * engine:          Shortest-path engine used by the searches of the player.
+                * cache_directory: Directory in which the route found is kept on disk, so that games replayed in other processes load it (no cache if None).
+                * kwargs:          Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
-        self.actions=[]
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert cache_directory is None or isinstance(cache_directory, str) # Type check for cache_directory
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Cache of preprocessing results on disk
+        self.artifact_cache = ArtifactCache(cache_directory) if cache_directory is not None else None
+        self.actions=iter([])
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -56,7 +81,7 @@ class Exhaustive (Player):
     def shortest_path ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -67,59 +92,15 @@ class Exhaustive (Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
 
-            # Mark the current vertex as visited.
-            visited.add(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     distances,
@@ -166,14 +147,14 @@ class Exhaustive (Player):
         sources = peices_of_cheese + [source]
         for element in sources:
             complete_graph[element]={}
+        searches=batched_searches(maze,sources,self.engine)
         nodes=sources.copy()
         while len(nodes)>0:
             start=nodes.pop()
             targets = [target for target in sources if target != start and target not in complete_graph[start]]
-            distances ,routing_table=self.shortest_path(maze,start,targets)
+            target_distances,predecessors=searches[start] if searches is not None else multi_target_dijkstra(maze,start,targets,self.engine)
             for target in targets:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            start,target)
+                route,distance=predecessors_to_route(predecessors,start,target),target_distances[target]
                 complete_graph[target][start]=(distance,route[::-1])
                 complete_graph[start][target]=(distance,route)
         return complete_graph
@@ -193,7 +174,9 @@ class Exhaustive (Player):
             Out:
                * route : The shorted path found
         """
-        graph=self.meta_graph(maze,source,pieces_of_cheese)
+        # Dead ends without cheese are pruned, and tree-like pockets of cheese become single excursion nodes
+        search_graph,excursions,targets=reduce_maze(maze,source,pieces_of_cheese)
+        graph,nodes=compress_excursions(self.meta_graph(search_graph,source,targets),source,pieces_of_cheese,excursions)
         best_distance=float('inf')
         best_path=[source]
         def brute_force(remaining,vertex,path,weight,graph):
@@ -207,11 +190,11 @@ class Exhaustive (Player):
                     new_remaining=remaining.copy()
                     new_vertex=new_remaining.pop(i)
                     brute_force(new_remaining,new_vertex,path+[new_vertex],weight+graph[vertex][new_vertex][0],graph)
-        brute_force(pieces_of_cheese,source,best_path,0,graph)
+        brute_force(nodes,source,best_path,0,graph)
         route=[] 
         for i in range(len(best_path)-1):
             route+=graph[best_path[i]][best_path[i+1]][1][:-1]
-        route.append(best_path[-1])
+        route.append(node_cell(best_path[-1]))
         return route
 
     @override
@@ -230,16 +213,28 @@ class Exhaustive (Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the location of the target (e.g., cheese) from the game state.
         peices_of_cheese = game_state.cheese
 
-        route = self.traversal(maze, source, peices_of_cheese)
+        # The exhaustive search is skipped if the same maze, pieces of cheese and location were already preprocessed
+        key = artifact_key("Exhaustive", self.maze_graph, peices_of_cheese, source) if self.artifact_cache is not None else None
+        artifacts = self.artifact_cache.load(key) if self.artifact_cache is not None else None
+        if artifacts is not None:
+            route = artifacts["route"].tolist()
+        else:
+            route = self.traversal(self.maze_graph, source, peices_of_cheese)
+            if self.artifact_cache is not None:
+                self.artifact_cache.save(key, {"route": numpy.array(route, dtype=numpy.int32)})
 
-        # Convert the route (list of locations) into a series of actions that the player can take.
-        actions = maze.locations_to_actions(route)
+        # Convert the route (list of locations) into a series of actions that the player can take, as they are needed.
+        actions = self.maze_graph.route_actions(route)
 
         # Store the resulting actions in the player's object for use during the game.
         self.actions = actions
@@ -264,7 +259,7 @@ class Exhaustive (Player):
                 * action: One of the possible actions.
         """
 
-        return self.actions.pop(0)
+        return next(self.actions)
 
 #############################################################################################################################################
 
@@ -16,10 +16,33 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+import numpy
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS
+from ContractedGraph import ContractedGraph
+from MetaGraph import MetaGraph
+from ApproximateMetaGraph import ApproximateMetaGraph
+from ShortestPathTreeCache import shortest_path_tree_cache
+from ArtifactCache import ArtifactCache, artifact_key
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Default minimum number of pieces of cheese for which the meta-graph is approximated from a single search
+APPROXIMATE_MIN_CHEESE = 500
+
+# Maximum number of times the greedy path is built again after refining its pairs
+MAX_REFINEMENT_ROUNDS = 5
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -33,10 +56,15 @@ class Greedy(Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:               Self,
+                   *args:              Any,
+                   engine:                 ShortestPathEngine = ShortestPathEngine.HEAP,
+                   contract_corridors:     bool = False,
+                   use_tree_cache:         bool = True,
+                   cache_directory:        Optional[str] = None,
+                   approximate_min_cheese: Integral = APPROXIMATE_MIN_CHEESE,
+                   **kwargs:               Any
+                 ) ->                      Self:
 
         """
             This function is the constructor of the class.
@@ -45,16 +73,50 @@ class Greedy(Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:                   Reference to the current object.
+                * args:                   Arguments to pass to the parent constructor.
+                * engine:                 Shortest-path engine used by the searches of the player.
+                * contract_corridors:     Indicates if the meta-graph is built on the maze with corridors contracted (pays off with many pieces of cheese).
+                * use_tree_cache:         Indicates if searches are kept in the cache of the process, so that games replayed on the same maze reuse them.
+                * cache_directory:        Directory in which the meta-graph and the tour are kept on disk, so that games replayed in other processes load them (no cache if None).
+                * approximate_min_cheese: Minimum number of pieces of cheese for which the meta-graph is approximated, and only the pairs of the tour are exact.
+                * kwargs:                 Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
-        self.actions=[]
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert isinstance(contract_corridors, bool) # Type check for contract_corridors
+        assert isinstance(use_tree_cache, bool) # Type check for use_tree_cache
+        assert cache_directory is None or isinstance(cache_directory, str) # Type check for cache_directory
+        assert isinstance(approximate_min_cheese, Integral) # Type check for approximate_min_cheese
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Maze with corridors contracted, built in preprocessing if asked
+        self.contract_corridors = contract_corridors
+        self.contracted_graph = None
+
+        # Cache of searches shared by all players of the process
+        self.tree_cache = shortest_path_tree_cache() if use_tree_cache else None
+
+        # Cache of preprocessing results on disk
+        self.artifact_cache = ArtifactCache(cache_directory) if cache_directory is not None else None
+
+        # With many pieces of cheese, the meta-graph is approximated from a single search
+        self.approximate_min_cheese = approximate_min_cheese
+
+        # Meta-graph and tour, built in preprocessing, and index of the current leg of the tour
+        self.graph = None
+        self.partial_path_0 = []
+        self.leg = 0
+        self.actions=iter([])
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -62,7 +124,7 @@ class Greedy(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -73,59 +135,15 @@ class Greedy(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
-
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
 
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -182,44 +200,16 @@ class Greedy(Player):
             * pieces_of_cheese (list): A list of positions of the pieces of cheese in the maze.
 
         Out:
-            * dict: A complete graph (meta-graph) where:
+            * MetaGraph: A complete graph (meta-graph) where:
                 - Nodes are the source and the pieces of cheese.
-                - Edges are the shortest paths (and their distances) between these nodes.
-                Each edge is represented as a tuple containing the distance and the path.
+                - Edges are the shortest paths between these nodes, with distances in a matrix and routes built on demand.
         """
-        # Initialize the complete meta-graph
-        complete_graph = {}
-
-        # Add the source and all pieces of cheese as nodes in the meta-graph
-        sources = pieces_of_cheese + [source]
-        for element in sources:
-            complete_graph[element] = {}
-
-        # Copy the list of nodes to iterate over
-        nodes = sources.copy()
-
-        # Process each node to calculate shortest paths to other nodes
-        while len(nodes) > 0:
-            # Pop a node to serve as the starting point
-            start = nodes.pop()
+        # With many pieces of cheese, a single search from all of them approximates the distances
+        if len(pieces_of_cheese) >= self.approximate_min_cheese:
+            return ApproximateMetaGraph(maze, pieces_of_cheese + [source], self.engine)
 
-            # Identify all target nodes that are not yet connected to the start node
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
-
-            # Calculate shortest paths and update the meta-graph
-            for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
-
-                # Update the meta-graph with the shortest path and distance
-                complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
-                complete_graph[start][target] = (distance, route)        # Forward path
-
-        # Return the complete meta-graph
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese
+        return MetaGraph(maze, pieces_of_cheese + [source], self.engine, cache=self.tree_cache)
 
     def partial_path(self: Self, pieces_of_cheese: list, source, meta_graph):
         """
@@ -229,43 +219,24 @@ class Greedy(Player):
                 * self (Self): Reference to the current object.
                 * pieces_of_cheese (list): A list of vertices representing the positions of the remaining pieces of cheese.
                 * source: The starting vertex for the path.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list: 
                     - A list of vertices representing the partial path starting from the source and visiting pieces of cheese
                     in a greedy manner, choosing the closest unvisited vertex at each step.
         """
-        # Create a copy of the pieces of cheese to track unvisited vertices.
-        non_visited = pieces_of_cheese.copy()
-
-        # Initialize the partial path with the source vertex.
-        partial_path = [source]
+        # Closest unvisited piece of cheese at each step, chosen with vectorized queries on the distance matrix
+        return meta_graph.greedy_path(source, pieces_of_cheese)
 
-        # Start the traversal from the source.
-        current_vertex = source
-
-        # Continue until all pieces of cheese are visited.
-        while len(non_visited) > 0:
-            # Compare distances to all unvisited vertices and choose the nearest one.
-            comparaison = [(v, meta_graph[current_vertex][v][0]) for v in non_visited]
-            current_vertex = min(comparaison, key=lambda x: x[1])[0]
-
-            # Add the selected vertex to the partial path and mark it as visited.
-            partial_path.append(current_vertex)
-            non_visited.remove(current_vertex)
-
-        return partial_path
-
-    def complete_path(self: Self, partial_path: list, meta_graph: dict):
+    def complete_path(self: Self, partial_path: list, meta_graph: MetaGraph):
         """
         Constructs the complete path based on a partial path and the meta-graph.
 
             In:
                 * self (Self): Reference to the current object.
                 * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                    - The meta-graph's edges should include the shortest route between connected nodes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list:
@@ -279,7 +250,7 @@ class Greedy(Player):
         for i in range(len(partial_path) - 1):
             # Add the route from the current vertex to the next vertex, excluding the last node in the segment
             # (to avoid duplication in the final path).
-            path += meta_graph[partial_path[i]][partial_path[i + 1]][1][:-1]
+            path += meta_graph.route(partial_path[i], partial_path[i + 1])[:-1]
 
         # Append the last vertex of the partial path to the complete path.
         path.append(partial_path[-1])
@@ -302,26 +273,53 @@ class Greedy(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the locations of the remaining pieces of cheese from the game state.
         pieces_of_cheese = game_state.cheese
 
-        # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        meta_graph = self.meta_graph(maze, source, pieces_of_cheese)
-
-        # Generate a partial path using a greedy approach to visit the pieces of cheese.
-        partial_path = self.partial_path(pieces_of_cheese, source, meta_graph)
-
-        # Construct the complete path, including intermediate steps, from the partial path.
-        route = self.complete_path(partial_path, meta_graph)
-
-        # Convert the complete path into a series of game actions (e.g., "up", "down", etc.).
-        actions = maze.locations_to_actions(route)
-
-        # Store the generated actions for use during the game.
-        self.actions = actions
+        # Contract corridors, keeping the player and the pieces of cheese as vertices, so that searches visit fewer cells.
+        search_graph = self.maze_graph
+        if self.contract_corridors:
+            self.contracted_graph = ContractedGraph(self.maze_graph, pieces_of_cheese + [source])
+            search_graph = self.contracted_graph
+
+        # If the same maze, pieces of cheese and location were already preprocessed, the meta-graph and the partial path are loaded from disk.
+        # Approximate meta-graphs are not kept, as they are fast to build.
+        approximate = len(pieces_of_cheese) >= self.approximate_min_cheese
+        key = artifact_key("Greedy", search_graph, pieces_of_cheese, source) if self.artifact_cache is not None and not approximate else None
+        artifacts = self.artifact_cache.load(key) if key is not None else None
+        if artifacts is not None:
+            self.graph = MetaGraph.from_arrays(artifacts)
+            self.partial_path_0 = artifacts["partial_path"].tolist()
+
+        # Otherwise, build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
+        else:
+            meta_graph = self.meta_graph(search_graph, source, pieces_of_cheese)
+
+            # Generate a partial path using a greedy approach to visit the pieces of cheese.
+            # Routes are only built during turns, one leg of the partial path at a time.
+            self.graph = meta_graph
+            self.partial_path_0 = self.partial_path(pieces_of_cheese, source, meta_graph)
+
+            # With an approximate meta-graph, pairs of the path are made exact, and the path is built again while their distances change.
+            # A last refinement makes sure that all legs are shortest paths.
+            if isinstance(meta_graph, ApproximateMetaGraph):
+                for _ in range(MAX_REFINEMENT_ROUNDS):
+                    if meta_graph.refine(self.partial_path_0) == 0:
+                        break
+                    self.partial_path_0 = self.partial_path(pieces_of_cheese, source, meta_graph)
+                meta_graph.refine(self.partial_path_0)
+
+            # Keep the results for the next games with the same inputs
+            if key is not None:
+                self.artifact_cache.save(key, {**meta_graph.to_arrays(), "partial_path": numpy.array(self.partial_path_0, dtype=numpy.int32)})
+        self.leg = 0
     #############################################################################################################################################
 
     @override
@@ -341,8 +339,20 @@ class Greedy(Player):
             Out:
                 * action: One of the possible actions.
         """
+        # When the previous leg is done, build the route of the next one and convert it into actions as they are needed.
+        action = next(self.actions, None)
+        while action is None:
+            route = self.graph.route(self.partial_path_0[self.leg], self.partial_path_0[self.leg + 1])
+            self.leg += 1
+
+            # Routes in the contracted maze are expanded to cells first.
+            if self.contracted_graph is not None:
+                route = self.contracted_graph.expand_route(route)
+            self.actions = self.maze_graph.route_actions(route)
+            action = next(self.actions, None)
+
         # Return the next action to perform during this turn.
-        return self.actions.pop(0)
+        return action
 
 #############################################################################################################################################
 
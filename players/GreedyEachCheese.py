@@ -11,10 +11,18 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from MetaGraph import MetaGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -30,6 +38,7 @@ class GreedyEachCheese(Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -42,6 +51,7 @@ class GreedyEachCheese(Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine used by the searches of the player.
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -49,9 +59,19 @@ class GreedyEachCheese(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Meta-graph over the initial pieces of cheese, built in preprocessing and reused by all replans
+        self.graph = None
         self.peices_of_cheese=set()
         self.nb_cheese=0
-        self.actions=[]
+        self.actions=iter([])
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -59,7 +79,7 @@ class GreedyEachCheese(Player):
     def shortest_path ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -70,59 +90,15 @@ class GreedyEachCheese(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
 
-            # Mark the current vertex as visited.
-            visited.add(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     distances,
@@ -165,38 +141,18 @@ class GreedyEachCheese(Player):
                    source,
                    peices_of_cheese
                    ):
-        complete_graph={}
-        sources = peices_of_cheese + [source]
-        for element in sources:
-            complete_graph[element]={}
-        nodes=sources.copy()
-        while len(nodes)>0:
-            start=nodes.pop()
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-            distances ,routing_table=self.shortest_path(maze,start,targets)
-            for target in targets:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            start,target)
-                complete_graph[target][start]=(distance,route[::-1])
-                complete_graph[start][target]=(distance,route)
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese
+        return MetaGraph(maze, peices_of_cheese + [source], self.engine)
 
     def partial_path(self:Self,peices_of_cheese:list,source,meta_graph):
-        """define the partial path using greedy algorithm"""
-        non_visited=peices_of_cheese.copy()
-        partial_path=[source]
-        current_vertex=source
-        while len(non_visited)>0:
-            comparaison=[( v, meta_graph[current_vertex][v][0] )  for v in non_visited]
-            current_vertex= min(comparaison, key=lambda x: x[1])[0]
-            partial_path.append(current_vertex)
-            non_visited.remove(current_vertex) 
-        return partial_path    
+        """define the partial path using greedy algorithm, among the pieces of cheese that are still present in the meta-graph"""
+        meta_graph.update_presence(peices_of_cheese)
+        return meta_graph.greedy_path(source)
 
     def complete_path(self:Self,partial_path,meta_graph):
         path=[]
         for i in range(len(partial_path)-1):
-            path+=meta_graph[partial_path[i]][partial_path[i+1]][1][:-1] 
+            path+=meta_graph.route(partial_path[i],partial_path[i+1])[:-1]
         path.append( partial_path[-1] )
         return path
 
@@ -216,6 +172,10 @@ class GreedyEachCheese(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
@@ -223,12 +183,12 @@ class GreedyEachCheese(Player):
         peices_of_cheese = game_state.cheese
         self.peices_of_cheese=set(peices_of_cheese)
         self.nb_cheese=len(peices_of_cheese)
-        meta_graph=self.meta_graph(maze,source,peices_of_cheese)
-        partial_path=self.partial_path(peices_of_cheese,source,meta_graph)
-        route=self.complete_path(partial_path,meta_graph)
+        self.graph=self.meta_graph(self.maze_graph,source,peices_of_cheese)
+        partial_path=self.partial_path(peices_of_cheese,source,self.graph)
+        route=self.complete_path(partial_path,self.graph)
 
-        # Convert the route (list of locations) into a series of actions that the player can take.
-        actions = maze.locations_to_actions(route)
+        # Convert the route (list of locations) into a series of actions that the player can take, as they are needed.
+        actions = self.maze_graph.route_actions(route)
 
         # Store the resulting actions in the player's object for use during the game.
         self.actions = actions
@@ -261,18 +221,18 @@ class GreedyEachCheese(Player):
                 peices_of_cheese = game_state.cheese
                 self.peices_of_cheese=set(peices_of_cheese)
                 self.nb_cheese=len(peices_of_cheese)
-                meta_graph=self.meta_graph(maze,source,peices_of_cheese)
-                partial_path=self.partial_path(peices_of_cheese,source,meta_graph)
-                route=self.complete_path(partial_path,meta_graph)
+                # The player is on a node of the meta-graph, so eaten pieces of cheese are only masked, without any new search
+                partial_path=self.partial_path(peices_of_cheese,source,self.graph)
+                route=self.complete_path(partial_path,self.graph)
 
-                # Convert the route (list of locations) into a series of actions that the player can take.
-                actions = maze.locations_to_actions(route)
+                # Convert the route (list of locations) into a series of actions that the player can take, as they are needed.
+                actions = self.maze_graph.route_actions(route)
 
                 # Store the resulting actions in the player's object for use during the game.
                 self.actions = actions
         self.nb_cheese=len(game_state.cheese)
         self.peices_of_cheese=set(game_state.cheese)
-        return self.actions.pop(0)
+        return next(self.actions)
 
 #############################################################################################################################################
 
@@ -12,10 +12,20 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from MetaGraph import MetaGraph
+from ActionTable import ActionTable
+from ShortestPathTreeCache import shortest_path_tree_cache
+from shortest_paths import ShortestPathEngine, TRAVERSALS
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -29,10 +39,12 @@ class GreedyEachCheese(Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:           Self,
+                   *args:          Any,
+                   engine:         ShortestPathEngine = ShortestPathEngine.HEAP,
+                   use_tree_cache: bool = True,
+                   **kwargs:       Any
+                 ) ->              Self:
 
         """
             This function is the constructor of the class.
@@ -41,18 +53,32 @@ class GreedyEachCheese(Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:           Reference to the current object.
+                * args:           Arguments to pass to the parent constructor.
+                * engine:         Shortest-path engine used by the searches of the player.
+                * use_tree_cache: Indicates if searches are kept in the cache of the process, so that games replayed on the same maze reuse them.
+                * kwargs:         Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert isinstance(use_tree_cache, bool) # Type check for use_tree_cache
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Cache of searches shared by all players of the process
+        self.tree_cache = shortest_path_tree_cache() if use_tree_cache else None
+
+        # Table of the actions leading to each piece of cheese, built in preprocessing
+        self.action_table = None
         self.graph={}
-        self.the_nearest={}
-        self.actions=[]
         self.destination=None
        
     #############################################################################################################################################
@@ -61,7 +87,7 @@ class GreedyEachCheese(Player):
     def shortest_path ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -72,59 +98,15 @@ class GreedyEachCheese(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     distances,
@@ -167,32 +149,13 @@ class GreedyEachCheese(Player):
                    source,
                    peices_of_cheese
                    ):
-        complete_graph={}
-        sources = peices_of_cheese + [source]
-        for element in sources:
-            complete_graph[element]={}
-        nodes=sources.copy()
-        while len(nodes)>0:
-            start=nodes.pop()
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-            distances ,routing_table=self.shortest_path(maze,start,targets)
-            for target in targets:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            start,target)
-                complete_graph[target][start]=(distance,route[::-1])
-                complete_graph[start][target]=(distance,route)
-        return complete_graph
-    def neighbors_sorted(self,peices_of_cheese,meta_graph):
-        for peice in peices_of_cheese:
-            to_sort=[( v, meta_graph[peice][v][0] )  for v in peices_of_cheese if v!=peice]
-            self.the_nearest[peice]=sorted(to_sort, key=lambda x: x[1])
+        # Only distances are needed, as moves are read from the table of actions
+        return MetaGraph(maze, peices_of_cheese + [source], self.engine, cache=self.tree_cache)
     def next_destination(self,maze,position,peices_of_cheese):
         if position == self.destination:
-            possible_destinations=set(peices_of_cheese)
-            i=0
-            while self.the_nearest[position][i][0] not in possible_destinations:
-                i+=1
-            self.destination=self.the_nearest[position][i][0]
+            # Closest piece of cheese that is still present, found with a masked query on the distance matrix
+            self.graph.update_presence(peices_of_cheese)
+            self.destination=self.graph.nearest(position)[0]
             return True
         else :
             return False
@@ -213,21 +176,19 @@ class GreedyEachCheese(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
         # Get the location of the target (e.g., cheese) from the game state.
         peices_of_cheese = game_state.cheese
-        self.graph=self.meta_graph(maze,source,peices_of_cheese)
-        self.neighbors_sorted(peices_of_cheese,self.graph)
-        to_sort=[( v, self.graph[source][v][0] )  for v in peices_of_cheese]
-        self.destination=min(to_sort, key=lambda x: x[1])[0]
-        route=self.graph[source][self.destination][1]
-        print(route)
-        # Convert the route (list of locations) into a series of actions that the player can take.
-        actions = maze.locations_to_actions(route)
-
-        # Store the resulting actions in the player's object for use during the game.
-        self.actions = actions
+        self.graph=self.meta_graph(self.maze_graph,source,peices_of_cheese)
+        self.destination=self.graph.nearest(source, peices_of_cheese)[0]
+
+        # Actions toward each piece of cheese from any cell, so that turns only need a lookup
+        self.action_table = ActionTable(self.maze_graph, peices_of_cheese, self.engine)
 
     #############################################################################################################################################
 
@@ -250,14 +211,10 @@ class GreedyEachCheese(Player):
         """
         position=game_state.player_locations[self.name]
         peices_of_cheese=game_state.cheese
-        boolv=self.next_destination(maze,position,peices_of_cheese)
-        if boolv:
-            route=self.graph[position][self.destination][1]
-            # Convert the route (list of locations) into a series of actions that the player can take.
-            actions = maze.locations_to_actions(route)
-            # Store the resulting actions in the player's object for use during the game.
-            self.actions = actions
-        return self.actions.pop(0)
+        self.next_destination(maze,position,peices_of_cheese)
+
+        # Next move toward the destination, read from the table
+        return self.action_table.action(position, self.destination)
 
 
 #############################################################################################################################################
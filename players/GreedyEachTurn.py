@@ -16,10 +16,18 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, multi_target_dijkstra, predecessors_to_route, batched_searches
+from DynamicShortestPathTree import DynamicShortestPathTree
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -35,6 +43,7 @@ class GreedyEachTurn(Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -47,6 +56,7 @@ class GreedyEachTurn(Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine used by the searches of the player.
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -54,6 +64,16 @@ class GreedyEachTurn(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Tree of shortest paths from the player, built in preprocessing and kept across turns
+        self.shortest_path_tree = None
         self.peices_of_cheese=set()
         self.nb_cheese=0
         self.graph={}
@@ -65,7 +85,7 @@ class GreedyEachTurn(Player):
     def shortest_path ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -76,59 +96,15 @@ class GreedyEachTurn(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance ( self:          Self,
                     routing_table: Dict[Integral, Optional[Integral]],
                     distances,
@@ -175,14 +151,14 @@ class GreedyEachTurn(Player):
         sources = peices_of_cheese + [source]
         for element in sources:
             complete_graph[element]={}
+        searches=batched_searches(maze,sources,self.engine)
         nodes=sources.copy()
         while len(nodes)>0:
             start=nodes.pop()
             targets = [target for target in sources if target != start and target not in complete_graph[start]]
-            distances ,routing_table=self.shortest_path(maze,start,targets)
+            target_distances,predecessors=searches[start] if searches is not None else multi_target_dijkstra(maze,start,targets,self.engine)
             for target in targets:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            start,target)
+                route,distance=predecessors_to_route(predecessors,start,target),target_distances[target]
                 complete_graph[target][start]=(distance,route[::-1])
                 complete_graph[start][target]=(distance,route)
         return complete_graph
@@ -222,6 +198,10 @@ class GreedyEachTurn(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
@@ -229,8 +209,9 @@ class GreedyEachTurn(Player):
         peices_of_cheese = game_state.cheese
         self.peices_of_cheese=set(peices_of_cheese)
         self.nb_cheese=len(peices_of_cheese)
-        graph=self.meta_graph(maze,source,peices_of_cheese)
+        graph=self.meta_graph(self.maze_graph,source,peices_of_cheese)
         self.graph=graph
+        self.shortest_path_tree=DynamicShortestPathTree(self.maze_graph,source,peices_of_cheese,self.engine)
         partial_path=self.partial_path(peices_of_cheese,source,self.graph)
         route=self.complete_path(partial_path,self.graph)
 
@@ -268,13 +249,15 @@ class GreedyEachTurn(Player):
 
             # Get the location of the target (e.g., cheese) from the game state.
             peices_of_cheese = game_state.cheese
-            distances ,routing_table=self.shortest_path(maze,source,peices_of_cheese)
-            for target in peices_of_cheese:
-                route,distance=self.find_route_and_distance(routing_table,distances,
-                                                            source,target)
-                self.graph[target][source]=(distance,route[::-1])
-                self.graph[source][target]=(distance,route)
-            partial_path=self.partial_path(peices_of_cheese,source,self.graph)
+
+            # Only the first step of the greedy path starts from the player, the others are already in the meta-graph.
+            # So we only need the nearest piece of cheese, which the tree kept since the previous replans usually gives without any search.
+            self.shortest_path_tree.move_to(source)
+            nearest,distance=self.shortest_path_tree.nearest(peices_of_cheese)
+            route=self.shortest_path_tree.route(nearest)
+            self.graph.setdefault(source,{})[nearest]=(distance,route)
+            remaining=[cheese for cheese in peices_of_cheese if cheese!=nearest]
+            partial_path=[source]+self.partial_path(remaining,nearest,self.graph)
             route=self.complete_path(partial_path,self.graph)
 
             # Convert the route (list of locations) into a series of actions that the player can take.
@@ -16,11 +16,19 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
 import itertools
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import heap_traversal, multi_target_dijkstra, predecessors_to_route, unit_weight_searches
+from DynamicShortestPathTree import DynamicShortestPathTree
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -54,6 +62,8 @@ class GreedyEachTurn(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+        self.shortest_path_tree = None
         self.actions = []
         self.best_length=float('inf')
         self.best_path=[]
@@ -77,33 +87,8 @@ class GreedyEachTurn(Player):
             * distances:     The distances from the source to each explored vertex.
             * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        #initialize the min heap, the distances, the visited vertices and the routing table
-        min_heap=[]
-        targets=set(targets)
-        heapq.heappush(min_heap,(0,source))
-        distances={source:0}
-        visited_vertices=[]
-        routing_table = {source: None}
-        
-        while len(min_heap) != 0 and not targets.issubset(visited_vertices):
-            #get the vertex with the minimum distance
-            distance, current_vertex=heapq.heappop(min_heap)
-            #verify if the vertex is not visited vertices
-            if current_vertex not in visited_vertices:
-                #mark the vertex as visited
-                visited_vertices.append(current_vertex)
-                #Go through the  non visited neighbors of the current vertex
-                for neighbor in maze.get_neighbors(current_vertex):
-                    if neighbor not in visited_vertices:
-                        #calculate the new distance
-                        new_distance = distance + maze.get_weight(current_vertex, neighbor)
-                        #update the distance and the routing table,and the min heap
-                        if neighbor not in distances.keys() or new_distance < distances[neighbor]:
-                            distances[neighbor]=new_distance
-                            heapq.heappush(min_heap,(new_distance,neighbor))
-                            routing_table[neighbor]=current_vertex   
-        #return the distances and the routing table                           
-        return distances, routing_table 
+        #delegate to the binary-heap engine, which counts the settled targets instead of checking targets.issubset(visited)
+        return heap_traversal(maze,source,targets)
     
 
     #definir la fct qui renvoie le métagraph associé au graph:
@@ -113,15 +98,17 @@ class GreedyEachTurn(Player):
                 source: Integral,
                 ):
         L=R.copy()
-        targets=R.copy()
         L.append(source)
+        #in mazes without mud, the searches from all vertices are done together by a bit-parallel BFS
+        searches=unit_weight_searches(maze,L)
         routes_distances={}
         while len(L)!=0 :
             current_source=L.pop()
+            #a single multi-target search gives the routes to all the remaining vertices
+            target_distances,predecessors=searches[current_source] if searches is not None else multi_target_dijkstra(maze,current_source,L)
             for neighbour in L:
-                distances,routing_table=self.traversal(maze,current_source,targets)
-                P=self.find_route(routing_table,current_source,neighbour)
-                routes_distances[(current_source,neighbour)]=P,distances[neighbour]
+                P=predecessors_to_route(predecessors,current_source,neighbour)
+                routes_distances[(current_source,neighbour)]=P,target_distances[neighbour]
         L=[el for el in routes_distances.keys()]
         for key in  L:
             value=routes_distances[key]
@@ -195,6 +182,13 @@ class GreedyEachTurn(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
+        # Tree of shortest paths from the player, kept across turns
+        self.shortest_path_tree = DynamicShortestPathTree(self.maze_graph, game_state.player_locations[self.name], game_state.cheese)
+
         print("Preprocessing")
         #print the route, the routing table and the distances
     #############################################################################################################################################
@@ -219,9 +213,11 @@ class GreedyEachTurn(Player):
         print("Turn")
         source=game_state.player_locations[self.name]
         Cheese=game_state.cheese
-        Meta_graph=self.meta_graph(maze,Cheese,source)
-        partial_path=self.partial_path_to_next_vertex(Cheese,source,Meta_graph)
-        complete_path=self.complete_path_to_next_vertex(partial_path,Meta_graph)
+        #only the first move towards the nearest piece of cheese is needed, the tree kept since the previous turns finds it, usually without any search
+        self.shortest_path_tree.move_to(source)
+        nearest,_=self.shortest_path_tree.nearest(Cheese)
+        route=self.shortest_path_tree.route(nearest)
+        complete_path=route[:2]
         print(complete_path)
         #convert the route to a list of actions
         Actions= maze.locations_to_action(complete_path[0],complete_path[1])
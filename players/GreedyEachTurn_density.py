@@ -16,10 +16,23 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph, maze_key
+from MetaGraph import MetaGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS
+from DistanceTable import DistanceTable, APSP_MAX_VERTICES
+from LandmarkOracle import LandmarkOracle, DEFAULT_NB_LANDMARKS
+from DynamicShortestPathTree import DynamicShortestPathTree
+from ShortestPathTreeCache import shortest_path_tree_cache
+from ArtifactCache import ArtifactCache, artifact_key
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -39,10 +52,15 @@ class GreedyEachTurn_density(Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:               Self,
+                   *args:              Any,
+                   engine:             ShortestPathEngine = ShortestPathEngine.HEAP,
+                   table_max_vertices: Integral = APSP_MAX_VERTICES,
+                   nb_landmarks:       Integral = DEFAULT_NB_LANDMARKS,
+                   use_tree_cache:     bool = True,
+                   cache_directory:    Optional[str] = None,
+                   **kwargs:           Any
+                 ) ->                  Self:
 
         """
             This function is the constructor of the class.
@@ -51,18 +69,55 @@ class GreedyEachTurn_density(Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:               Reference to the current object.
+                * args:               Arguments to pass to the parent constructor.
+                * engine:             Shortest-path engine used by the searches of the player.
+                * table_max_vertices: Largest number of vertices for which a table of all shortest paths is built in preprocessing.
+                * nb_landmarks:       Number of landmarks of the distance oracle built in preprocessing for larger mazes (0 to disable it).
+                * use_tree_cache:     Indicates if searches are kept in the cache of the process, so that games replayed on the same maze reuse them.
+                * cache_directory:    Directory in which the table of all shortest paths is kept on disk, so that games in the same maze load it (no cache if None).
+                * kwargs:             Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert isinstance(table_max_vertices, Integral) # Type check for table_max_vertices
+        assert isinstance(nb_landmarks, Integral) # Type check for nb_landmarks
+        assert isinstance(use_tree_cache, bool) # Type check for use_tree_cache
+        assert cache_directory is None or isinstance(cache_directory, str) # Type check for cache_directory
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Table of all shortest paths, built in preprocessing for small mazes
+        self.table_max_vertices = table_max_vertices
+        self.distance_table = None
+
+        # Landmark distance oracle, built in preprocessing for larger mazes
+        self.nb_landmarks = nb_landmarks
+        self.landmark_oracle = None
+
+        # Cache of searches shared by all players of the process, and key of the maze in it (computed in preprocessing)
+        self.tree_cache = shortest_path_tree_cache() if use_tree_cache else None
+        self.maze_key = None
+
+        # Cache of preprocessing results on disk
+        self.artifact_cache = ArtifactCache(cache_directory) if cache_directory is not None else None
+
+        # Tree of shortest paths from the player, kept across turns when there is neither table nor oracle
+        self.shortest_path_tree = None
+
+        # Vertex at which the current route started (a node, or the location of the last replan, kept as a transient node of the meta-graph)
+        self.origin = None
         self.graph={}
         self.the_nearest={}
-        self.actions=[]
+        self.actions=iter([])
         self.destination=None
        
     #############################################################################################################################################
@@ -71,7 +126,7 @@ class GreedyEachTurn_density(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -82,59 +137,15 @@ class GreedyEachTurn_density(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
 
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Mark the current vertex as visited.
-            visited.add(vertice)
-
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -180,7 +191,7 @@ class GreedyEachTurn_density(Player):
     def meta_graph(self: Self,
                 maze: Maze,
                 source: Integral,
-                pieces_of_cheese)->Dict[Integral,Dict[Integral,Tuple[Integral,List[Integral]]]]:
+                pieces_of_cheese)->MetaGraph:
         """
         Builds a meta-graph where each node represents either the source or a piece of cheese, and edges 
         represent the shortest paths between them in the original maze.
@@ -192,44 +203,13 @@ class GreedyEachTurn_density(Player):
             * pieces_of_cheese (list): A list of positions of the pieces of cheese in the maze.
 
         Out:
-            * dict: A complete graph (meta-graph) where:
+            * MetaGraph: A complete graph (meta-graph) where:
                 - Nodes are the source and the pieces of cheese.
                 - Edges are the shortest paths (and their distances) between these nodes.
-                Each edge is represented as a tuple containing the distance and the path.
+                Distances are stored in a matrix, and routes are rebuilt from the predecessors of the searches when needed.
         """
-        # Initialize the complete meta-graph
-        complete_graph = {}
-
-        # Add the source and all pieces of cheese as nodes in the meta-graph
-        sources = pieces_of_cheese + [source]
-        for element in sources:
-            complete_graph[element] = {}
-
-        # Copy the list of nodes to iterate over
-        nodes = sources.copy()
-
-        # Process each node to calculate shortest paths to other nodes
-        while len(nodes) > 0:
-            # Pop a node to serve as the starting point
-            start = nodes.pop()
-
-            # Identify all target nodes that are not yet connected to the start node
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
-
-            # Calculate shortest paths and update the meta-graph
-            for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
-
-                # Update the meta-graph with the shortest path and distance
-                complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
-                complete_graph[start][target] = (distance, route)        # Forward path
-
-        # Return the complete meta-graph
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese (searches kept in the cache of the process are reused)
+        return MetaGraph(maze, pieces_of_cheese + [source], self.engine, cache=self.tree_cache)
     
     def surrounding_cells(self,cheese,maze):
         rows=maze.height
@@ -262,7 +242,7 @@ class GreedyEachTurn_density(Player):
         min_weight = float('inf')
         destination = position
         for target in pieces_of_cheese:
-            weight=self.graph[position][target][0]/self.density(target,pieces_of_cheese,maze)
+            weight=self.graph.distance(position,target)/self.density(target,pieces_of_cheese,maze)
             # Update the nearest piece of cheese if the current one is closer.
             if weight < min_weight:
                 min_weight = weight
@@ -270,6 +250,29 @@ class GreedyEachTurn_density(Player):
         return destination
 
 
+    def known_destination(self:Self,
+                          position:Integral,
+                          pieces_of_cheese:List[Integral],
+                          densities:List[float])->Optional[Integral]:
+        """
+            Adds the current position of the player to the meta-graph as a transient node, and checks if the best piece of cheese is known without any search.
+            The player is on its route from the origin to its former destination, so the distances to both are exact, and bound the distances to all other pieces of cheese.
+            The best piece of cheese is known if its distance is exact and its weight is better than the lower bounds of the weights of all others.
+
+            In:
+                * self (Self): Reference to the current object.
+                * position: The current position of the player.
+                * pieces_of_cheese (list): List of vertices representing the positions of the remaining pieces of cheese.
+                * densities (list): Density around each piece of cheese.
+
+            Out:
+                * Optional[Integral]: The best piece of cheese (None if the bounds cannot prove which one it is).
+        """
+        # The transient node is kept until the player reaches a piece of cheese (only a few of them are kept anyway).
+        if not self.graph.add_transient(position, self.origin, self.destination, self.maze_graph):
+            return None
+        return self.graph.best_target(position, pieces_of_cheese, densities)[0]
+
     def next_destination(self:Self,
                          maze:Maze,
                          position:Integral,
@@ -291,37 +294,74 @@ class GreedyEachTurn_density(Player):
         """
         # Case 1: Player has reached its current destination.
         if position == self.destination:
+            # The player is on a node again, so the former locations it replanned from are not needed anymore.
+            self.graph.retire()
             self.destination=self.nearest(position,pieces_of_cheese,maze)
             return True
         # Case 2: The current destination is no longer a valid piece of cheese.
-        elif self.destination not in pieces_of_cheese:
-            # Perform a traversal to compute distances and routing information from the current position.
-            distances, routing_table = self.traversal(maze, position, pieces_of_cheese)
-
-            # Initialize or update the graph representation for the current position.
-            self.graph[position] = {}
-
-            # Variables to track the nearest piece of cheese.
-            min_weight = float('inf')
-            destination = position
-
-            # Evaluate all pieces of cheese to find the nearest one.
-            for target in pieces_of_cheese:
-                # Find the shortest route and its distance from the current position to the target.
-                route, distance = self.find_route_and_distance(routing_table, distances, position, target)
-
-                # Update the graph with the computed route and distance.
-                self.graph[target][position] = (distance, route[::-1])  # Reverse the route for the reverse direction.
-                self.graph[position][target] = (distance, route)
+        elif self.destination not in pieces_of_cheese and self.distance_table is not None:
+            # The best piece of cheese may be known from the route of the player.
+            densities = [self.density(target,pieces_of_cheese,maze) for target in pieces_of_cheese]
+            destination = self.known_destination(position, pieces_of_cheese, densities)
+
+            # Otherwise, distances are read from the table, and only the route to the chosen piece of cheese is rebuilt, without any search.
+            if destination is None:
+                min_weight = float('inf')
+                destination = position
+                for target, density in zip(pieces_of_cheese, densities):
+                    weight=self.distance_table.distance(position,target)/density
+                    if weight < min_weight:
+                        min_weight = weight
+                        destination = target
+
+                # Update the meta-graph with the route from the current position (a transient node) only.
+                self.graph.set_route(position, destination, self.distance_table.distance(position, destination), self.distance_table.route(position, destination))
+            self.destination = destination
+            return True
 
-                # Update the nearest piece of cheese if the current one is closer.
-                weight=self.graph[position][target][0]/self.density(target,pieces_of_cheese,maze)
-                # Update the nearest piece of cheese if the current one is closer.
-                if weight < min_weight:
-                    min_weight = weight
-                    destination = target
+        # Case 2 (with landmarks): The current destination is no longer a valid piece of cheese.
+        elif self.destination not in pieces_of_cheese and self.landmark_oracle is not None:
+            # The best piece of cheese may be known from the route of the player.
+            densities = [self.density(target,pieces_of_cheese,maze) for target in pieces_of_cheese]
+            destination = self.known_destination(position, pieces_of_cheese, densities)
+            if destination is not None:
+                self.destination = destination
+                return True
+
+            # Otherwise, pieces of cheese are examined by increasing lower bound of their weight, and exact distances are found with A* only while they can be better.
+            bounds = self.landmark_oracle.lower_bounds(position, pieces_of_cheese)
+            min_weight, best_i = float('inf'), len(pieces_of_cheese)
+            destination, distance, route = position, 0, [position]
+            for i in sorted(range(len(pieces_of_cheese)), key=lambda i: (bounds[i]/densities[i], i)):
+                if bounds[i]/densities[i] > min_weight:
+                    break
+                target_distance, target_route, _ = self.landmark_oracle.astar(position, pieces_of_cheese[i])
+                weight=target_distance/densities[i]
+                # Ties are broken by order in the list of pieces of cheese, as in the search without landmarks.
+                if (weight, i) < (min_weight, best_i):
+                    min_weight, best_i = weight, i
+                    destination, distance, route = pieces_of_cheese[i], target_distance, target_route
+
+            # Update the meta-graph with the route from the current position (a transient node) only.
+            self.graph.set_route(position, destination, distance, route)
+            self.destination = destination
+            return True
 
-            # Update the player's destination to the nearest piece of cheese.
+        # Case 2 (without table): The current destination is no longer a valid piece of cheese.
+        elif self.destination not in pieces_of_cheese:
+            # The best piece of cheese may be known from the route of the player.
+            densities = [self.density(target,pieces_of_cheese,maze) for target in pieces_of_cheese]
+            destination = self.known_destination(position, pieces_of_cheese, densities)
+            if destination is not None:
+                self.destination = destination
+                return True
+
+            # Otherwise, the tree kept since the previous replans is moved to the current position, and only searches again if its bounds cannot prove which piece of cheese is the best.
+            self.shortest_path_tree.move_to(position)
+            destination, distance = self.shortest_path_tree.nearest(pieces_of_cheese, densities)
+
+            # Update the meta-graph with the route from the current position (a transient node) only.
+            self.graph.set_route(position, destination, distance, self.shortest_path_tree.route(destination))
             self.destination = destination
             return True
 
@@ -346,21 +386,47 @@ class GreedyEachTurn_density(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+        if self.tree_cache is not None:
+            self.maze_key = maze_key(self.maze_graph)
+
+        # In small mazes, all shortest paths are computed now (or loaded from disk if the maze was already seen), so that turns need no search
+        if self.maze_graph.nb_vertices <= self.table_max_vertices:
+            key = artifact_key("DistanceTable", self.maze_graph) if self.artifact_cache is not None else None
+            artifacts = self.artifact_cache.load(key) if self.artifact_cache is not None else None
+            if artifacts is not None:
+                self.distance_table = DistanceTable.from_arrays(artifacts)
+            else:
+                self.distance_table = DistanceTable(self.maze_graph)
+                if self.artifact_cache is not None:
+                    self.artifact_cache.save(key, self.distance_table.to_arrays())
+
+        # In larger mazes, distances from a few landmarks are computed now, so that searches during turns are guided by tight lower bounds
+        elif self.nb_landmarks > 0:
+            self.landmark_oracle = LandmarkOracle(self.maze_graph, self.nb_landmarks)
+
         # Get the player's current location and the locations of the remaining cheese.
         source = game_state.player_locations[self.name]
         pieces_of_cheese = game_state.cheese
 
+        # Otherwise, a tree of shortest paths from the player is kept across turns, and re-rooted as the player moves
+        if self.distance_table is None and self.landmark_oracle is None:
+            self.shortest_path_tree = DynamicShortestPathTree(self.maze_graph, source, pieces_of_cheese, self.engine)
+
         # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        self.graph = self.meta_graph(maze, source, pieces_of_cheese)
+        self.graph = self.meta_graph(self.maze_graph, source, pieces_of_cheese)
 
         # Set the nearest piece of cheese as the next destination.
         self.destination = self.nearest(source,pieces_of_cheese,maze)
 
         # Retrieve the shortest route from the source to the destination.
-        route = self.graph[source][self.destination][1]
+        route = self.graph.route(source, self.destination)
+        self.origin = source
         print(route)
         # Convert the route into a series of actions the player can take in the maze.
-        actions = maze.locations_to_actions(route)
+        actions = self.maze_graph.route_actions(route)
 
         # Store the actions for execution during the game.
         self.actions = actions
@@ -396,14 +462,16 @@ class GreedyEachTurn_density(Player):
         boolv = self.next_destination(maze, position, pieces_of_cheese)
         # If a new route is required, compute it and update the player's actions.
         if boolv:
-            route = self.graph[position][self.destination][1]
+            # The route is read from the meta-graph, the position being a node or a transient node.
+            route = self.graph.route(position, self.destination)
+            self.origin = position
             # Convert the route (list of locations) into a series of actions.
-            actions = maze.locations_to_actions(route)
+            actions = self.maze_graph.route_actions(route)
             # Store the actions for future turns.
             self.actions = actions
 
         # Return the next action to perform during this turn.
-        return self.actions.pop(0)
+        return next(self.actions)
 
 
 
@@ -18,9 +18,17 @@ from typing_extensions import *
 from numbers import *
 import heapq
 import itertools
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import multi_target_dijkstra, predecessors_to_route, unit_weight_searches
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -57,6 +65,7 @@ class Greedy(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
         self.actions = []
         self.best_length=float('inf')
         self.best_path=[]
@@ -115,14 +124,17 @@ class Greedy(Player):
                 source: Integral):
         L=[el for el in R]
         L.append(source)
+        #in mazes without mud, the searches from all vertices are done together by a bit-parallel BFS
+        searches=unit_weight_searches(maze,L)
         n=len(L)
         routes_distances={}
         while len(L)!=0:
             current_source=L.pop()
+            #a single multi-target search gives the routes to all the remaining vertices
+            target_distances,predecessors=searches[current_source] if searches is not None else multi_target_dijkstra(maze,current_source,L)
             for neighbour in L:
-                distances,routing_table=self.traversal(maze,current_source)
-                P=self.find_route(routing_table,current_source,neighbour)
-                routes_distances[(current_source,neighbour)]=P,distances[neighbour]
+                P=predecessors_to_route(predecessors,current_source,neighbour)
+                routes_distances[(current_source,neighbour)]=P,target_distances[neighbour]
 
 
         L=[el for el in routes_distances.keys()]
@@ -207,13 +219,17 @@ class Greedy(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         print("Preprocessing")
 
         #define the source and the target of the path from the initial position of the player to the cheese
         source=game_state.player_locations[self.name]
         Cheese=game_state.cheese
         print(f"cheese is in {Cheese}")
-        Meta_graph=self.meta_graph(maze,Cheese,source)
+        Meta_graph=self.meta_graph(self.maze_graph,Cheese,source)
         print(f'meta graph is {Meta_graph}')
         partial_path=self.partial_path(Cheese,source,Meta_graph)
         complete_path=self.complete_path(partial_path,Meta_graph)
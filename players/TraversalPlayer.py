@@ -28,7 +28,9 @@ sys.path.append(os.path.join(this_directory, "..", "utils"))
 from pyrat import Player, Maze, GameState, Action
 from BFSTraversal import BFSTraversal
 from DFSTraversal import DFSTraversal
-from 
+from DijkstraTraversal import DijkstraTraversal
+from MazeGraph import MazeGraph
+from shortest_paths import point_to_point
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -39,13 +41,14 @@ class TraversalAlgorithm (enum.Enum):
     """
         This enumeration defines all the algorithms supported by the TraversalPlayer.
         Values:
-            * BFS: Breadth-first search.
-            * DFS: Depth-first search.
+            * BFS:      Breadth-first search.
+            * DFS:      Depth-first search.
+            * Dijkstra: Dijkstra's algorithm, taking mud into account.
     """
 
     BFS = "BFS"
     DFS = "DFS"
-    Dijkstra="Dijkstra"
+    Dijkstra = "Dijkstra"
 
 #####################################################################################################################################################
 
@@ -54,6 +57,7 @@ class TraversalPlayer (Player):
     """
         This player moves in the maze using a traversal algorithm.
         Several traversal algorithms are available, as defined in the TraversalAlgorithm enumeration.
+        Shortest-path algorithms (BFS and Dijkstra) only need the route to the first piece of cheese, so they use a bidirectional search.
     """
 
     #############################################################################################################################################
@@ -89,13 +93,18 @@ class TraversalPlayer (Player):
 
         # The result will be computed in preprocessing and stored here
         self.actions = []
+        self.maze_graph = None
+        self.nb_expanded = 0
 
         # We use the chosen algorithm
+        self.algorithm = algorithm
         self.traversal_algorithm = None
         if algorithm == TraversalAlgorithm.BFS:
             self.traversal_algorithm = BFSTraversal()
         elif algorithm == TraversalAlgorithm.DFS:
             self.traversal_algorithm = DFSTraversal()
+        elif algorithm == TraversalAlgorithm.Dijkstra:
+            self.traversal_algorithm = DijkstraTraversal()
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -118,11 +127,23 @@ class TraversalPlayer (Player):
                 * None.
         """
         
-        # Perform the traversal to get the shortest paths from the player location to all the other cells
-        self.traversal_algorithm.traversal(maze, game_state.player_locations[self.name])
-
-        # Find the series of locations/actions to go from the player location to the first piece of cheese
-        route = self.traversal_algorithm.find_route(game_state.cheese[0])
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+        source = game_state.player_locations[self.name]
+        target = game_state.cheese[0]
+
+        # Shortest paths to a single piece of cheese are found by searching from both ends
+        if self.algorithm in [TraversalAlgorithm.BFS, TraversalAlgorithm.Dijkstra]:
+            unit_weights = self.algorithm == TraversalAlgorithm.BFS
+            _, route, self.nb_expanded = point_to_point(self.maze_graph, source, target, unit_weights)
+
+        # Otherwise, perform the traversal from the player location to all the other cells
+        else:
+            self.traversal_algorithm.traversal(self.maze_graph, source)
+            route = self.traversal_algorithm.find_route(target)
+            self.nb_expanded = len(self.traversal_algorithm.distances)
+
+        # Find the series of actions to go from the player location to the first piece of cheese
         self.actions = maze.locations_to_actions(route)
 
     #############################################################################################################################################
@@ -149,5 +170,29 @@ class TraversalPlayer (Player):
         action = self.actions.pop(0)
         return action
 
+    #############################################################################################################################################
+
+    @override
+    def postprocessing ( self:       Self,
+                         maze:       Maze,
+                         game_state: GameState,
+                         stats:      Dict[str, Any],
+                       ) ->          None:
+
+        """
+            This method redefines the method of the parent class.
+            It is called once at the end of the game.
+            In:
+                * self:       Reference to the current object.
+                * maze:       An object representing the maze in which the player plays.
+                * game_state: An object representing the state of the game.
+                * stats:      Statistics about the game.
+            Out:
+                * None.
+        """
+
+        # Print the number of vertices expanded to find the route
+        print("Postprocessing (%d vertices expanded out of %d)" % (self.nb_expanded, self.maze_graph.nb_vertices))
+
 #####################################################################################################################################################
 #####################################################################################################################################################
\ No newline at end of file
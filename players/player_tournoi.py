@@ -10,10 +10,17 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, multi_target_dijkstra, predecessors_to_route, batched_searches
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
 #####################################################################################################################################################
@@ -27,6 +34,7 @@ class two_opt(Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -39,6 +47,7 @@ class two_opt(Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine used by the searches of the player.
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -46,6 +55,13 @@ class two_opt(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
         self.actions=[]
        
     #############################################################################################################################################
@@ -54,7 +70,7 @@ class two_opt(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -65,59 +81,15 @@ class two_opt(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -187,6 +159,9 @@ class two_opt(Player):
         for element in sources:
             complete_graph[element] = {}
 
+        # With the scipy engine or in mazes without mud, the searches from all nodes are done together
+        searches = batched_searches(maze, sources, self.engine)
+
         # Copy the list of nodes to iterate over
         nodes = sources.copy()
 
@@ -198,13 +173,13 @@ class two_opt(Player):
             # Identify all target nodes that are not yet connected to the start node
             targets = [target for target in sources if target != start and target not in complete_graph[start]]
 
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
+            # Perform a multi-target search, that stops as soon as all targets are settled
+            target_distances, predecessors = searches[start] if searches is not None else multi_target_dijkstra(maze, start, targets, self.engine)
 
             # Calculate shortest paths and update the meta-graph
             for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
+                # Rebuild the shortest path between start and target from the predecessors
+                route, distance = predecessors_to_route(predecessors, start, target), target_distances[target]
 
                 # Update the meta-graph with the shortest path and distance
                 complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
@@ -333,6 +308,10 @@ class two_opt(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
@@ -340,7 +319,7 @@ class two_opt(Player):
         pieces_of_cheese = game_state.cheese
 
         # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        meta_graph = self.meta_graph(maze, source, pieces_of_cheese)
+        meta_graph = self.meta_graph(self.maze_graph, source, pieces_of_cheese)
         print([(i,meta_graph[i].keys()) for i in meta_graph.keys()])
         # Generate a partial path using a greedy approach to visit the pieces of cheese.
         partial_path = self.partial_path(pieces_of_cheese, source, meta_graph)
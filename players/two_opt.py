@@ -16,10 +16,20 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from MetaGraph import MetaGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS
+from ContractedGraph import ContractedGraph
+from maze_structure import prune_dead_ends, reduce_maze, compress_excursions, node_cell
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
 #####################################################################################################################################################
@@ -32,10 +42,13 @@ class Two_opt(Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:               Self,
+                   *args:              Any,
+                   engine:             ShortestPathEngine = ShortestPathEngine.HEAP,
+                   contract_corridors: bool = False,
+                   use_excursions:     bool = False,
+                   **kwargs:           Any
+                 ) ->                  Self:
 
         """
             This function is the constructor of the class.
@@ -44,16 +57,35 @@ class Two_opt(Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:               Reference to the current object.
+                * args:               Arguments to pass to the parent constructor.
+                * engine:             Shortest-path engine used by the searches of the player.
+                * contract_corridors: Indicates if the meta-graph is built on the maze with corridors contracted (pays off with many pieces of cheese).
+                * use_excursions:     Indicates if the pieces of cheese of tree-like pockets are replaced with excursions (fewer nodes, but the greedy start path may be worse).
+                * kwargs:             Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
-        self.actions=[]
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert isinstance(contract_corridors, bool) # Type check for contract_corridors
+        assert isinstance(use_excursions, bool) # Type check for use_excursions
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Maze with corridors contracted, built in preprocessing if asked
+        self.contract_corridors = contract_corridors
+        self.contracted_graph = None
+
+        # Excursions replacing the pieces of cheese of tree-like pockets, if asked
+        self.use_excursions = use_excursions
+        self.actions=iter([])
        
     #############################################################################################################################################
     #                                                               PYRAT METHODS                                                               #
@@ -61,7 +93,7 @@ class Two_opt(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -72,59 +104,15 @@ class Two_opt(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
 
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Mark the current vertex as visited.
-            visited.add(vertice)
-
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -181,44 +169,13 @@ class Two_opt(Player):
             * pieces_of_cheese (list): A list of positions of the pieces of cheese in the maze.
 
         Out:
-            * dict: A complete graph (meta-graph) where:
+            * MetaGraph: A complete graph (meta-graph) where:
                 - Nodes are the source and the pieces of cheese.
                 - Edges are the shortest paths (and their distances) between these nodes.
-                Each edge is represented as a tuple containing the distance and the path.
+                Distances are stored in a matrix, and routes are rebuilt from the predecessors of the searches when needed.
         """
-        # Initialize the complete meta-graph
-        complete_graph = {}
-
-        # Add the source and all pieces of cheese as nodes in the meta-graph
-        sources = pieces_of_cheese + [source]
-        for element in sources:
-            complete_graph[element] = {}
-
-        # Copy the list of nodes to iterate over
-        nodes = sources.copy()
-
-        # Process each node to calculate shortest paths to other nodes
-        while len(nodes) > 0:
-            # Pop a node to serve as the starting point
-            start = nodes.pop()
-
-            # Identify all target nodes that are not yet connected to the start node
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
-
-            # Calculate shortest paths and update the meta-graph
-            for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
-
-                # Update the meta-graph with the shortest path and distance
-                complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
-                complete_graph[start][target] = (distance, route)        # Forward path
-
-        # Return the complete meta-graph
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese
+        return MetaGraph(maze, pieces_of_cheese + [source], self.engine)
 
     def partial_path(self: Self, pieces_of_cheese: list, source, meta_graph):
         """
@@ -228,43 +185,24 @@ class Two_opt(Player):
                 * self (Self): Reference to the current object.
                 * pieces_of_cheese (list): A list of vertices representing the positions of the remaining pieces of cheese.
                 * source: The starting vertex for the path.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list: 
                     - A list of vertices representing the partial path starting from the source and visiting pieces of cheese
                     in a greedy manner, choosing the closest unvisited vertex at each step.
         """
-        # Create a copy of the pieces of cheese to track unvisited vertices.
-        non_visited = pieces_of_cheese.copy()
+        # Closest unvisited node at each step, chosen with vectorized queries on the distance matrix
+        return meta_graph.greedy_path(source, pieces_of_cheese)
 
-        # Initialize the partial path with the source vertex.
-        partial_path = [source]
-
-        # Start the traversal from the source.
-        current_vertex = source
-
-        # Continue until all pieces of cheese are visited.
-        while len(non_visited) > 0:
-            # Compare distances to all unvisited vertices and choose the nearest one.
-            comparaison = [(v, meta_graph[current_vertex][v][0]) for v in non_visited]
-            current_vertex = min(comparaison, key=lambda x: x[1])[0]
-
-            # Add the selected vertex to the partial path and mark it as visited.
-            partial_path.append(current_vertex)
-            non_visited.remove(current_vertex)
-
-        return partial_path
-
-    def complete_path(self: Self, partial_path: list, meta_graph: dict):
+    def complete_path(self: Self, partial_path: list, meta_graph: MetaGraph):
         """
         Constructs the complete path based on a partial path and the meta-graph.
 
             In:
                 * self (Self): Reference to the current object.
                 * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                    - The meta-graph's edges should include the shortest route between connected nodes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list:
@@ -278,30 +216,28 @@ class Two_opt(Player):
         for i in range(len(partial_path) - 1):
             # Add the route from the current vertex to the next vertex, excluding the last node in the segment
             # (to avoid duplication in the final path).
-            path += meta_graph[partial_path[i]][partial_path[i + 1]][1][:-1]
+            path += meta_graph.route(partial_path[i], partial_path[i + 1])[:-1]
 
-        # Append the last vertex of the partial path to the complete path.
-        path.append(partial_path[-1])
+        # Append the last vertex of the partial path to the complete path (the last cell of an excursion).
+        path.append(node_cell(partial_path[-1]))
 
         return path
 
-    def two_opt(self:Self , partial_path:list,meta_graph:dict):
+    def two_opt(self:Self , partial_path:list,meta_graph:MetaGraph):
         """
         Applies the 2-opt heuristic to optimize the given partial path.
+        The changes in length of all swaps of a vertex are computed at once from the distance matrix.
 
         In:
             * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-            * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                - The meta-graph's edges should include the shortest route between connected nodes.
+            * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
         Out:
             * list: A list of vertices representing the optimized path after applying the 2-opt heuristic.
         """
-        def path_length(path):
-            return sum([meta_graph[path[i]][path[i+1]][0] for i in range(len(path)-1)])
-        # Initialize the best path as the given partial path.
+        # Initialize the best path as the given partial path, with the indices of its vertices in the meta-graph.
         best_path = partial_path.copy()
-        best_length=path_length(best_path)
+        indices = meta_graph.indices(best_path)
         # Initialize the flag to indicate whether the path has been improved.
         improved = True
         
@@ -312,16 +248,18 @@ class Two_opt(Player):
 
             # Iterate over all pairs of edges in the path.
             for i in range(1, len(partial_path) - 1):
-                for j in range(i + 1, len(partial_path)-1):
-                    new_path=best_path.copy()
-                    new_path[i] ,new_path[j]= new_path[j],new_path[i]
-                    new_path_length=path_length(new_path)
-                    if new_path_length<best_length:
-                        # Reverse the segment between i and j in the path.
-                        best_path[i] ,best_path[j]= best_path[j],best_path[i]
-                        best_length=new_path_length
-                        # Update the flag to indicate an improvement.
-                        improved = True
+                start = i + 1
+                while start < len(partial_path) - 1:
+                    # Apply the first swap that shortens the path, then look for the next one after it.
+                    shorter = (meta_graph.swap_deltas(indices, i, start) < 0).nonzero()[0]
+                    if len(shorter) == 0:
+                        break
+                    j = start + int(shorter[0])
+                    best_path[i] ,best_path[j]= best_path[j],best_path[i]
+                    indices[i], indices[j] = indices[j], indices[i]
+                    start = j + 1
+                    # Update the flag to indicate an improvement.
+                    improved = True
         return best_path
     
     @override
@@ -340,17 +278,35 @@ class Two_opt(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
         # Get the locations of the remaining pieces of cheese from the game state.
         pieces_of_cheese = game_state.cheese
 
-        # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        meta_graph = self.meta_graph(maze, source, pieces_of_cheese)
+        # Prune dead ends without cheese, and if asked, replace the pieces of cheese of tree-like pockets with excursions.
+        # Excursions are not the default, as the greedy path over them can be a worse start for 2-opt.
+        if self.use_excursions:
+            search_graph, excursions, targets = reduce_maze(self.maze_graph, source, pieces_of_cheese)
+        else:
+            search_graph, excursions, targets = prune_dead_ends(self.maze_graph, pieces_of_cheese + [source]), [], pieces_of_cheese
+
+        # Contract corridors, keeping the player and the targets as vertices, so that searches visit fewer cells.
+        if self.contract_corridors:
+            self.contracted_graph = ContractedGraph(search_graph, targets + [source])
+            search_graph = self.contracted_graph
+
+        # Build the meta-graph to calculate shortest paths between the source and all targets, then add the excursions.
+        meta_graph = self.meta_graph(search_graph, source, targets)
+        meta_graph, nodes = compress_excursions(meta_graph, source, pieces_of_cheese, excursions)
+        meta_graph = MetaGraph.from_dict(meta_graph)
         print(meta_graph)
-        # Generate a partial path using a greedy approach to visit the pieces of cheese.
-        partial_path_0 = self.partial_path(pieces_of_cheese, source, meta_graph)
+        # Generate a partial path using a greedy approach to visit the pieces of cheese and excursions.
+        partial_path_0 = self.partial_path(nodes, source, meta_graph)
         print(partial_path_0)
         # Optimize the partial path using the 2-opt heuristic.
         partial_path_1 = self.two_opt(partial_path_0, meta_graph)
@@ -358,8 +314,12 @@ class Two_opt(Player):
         # Construct the complete path, including intermediate steps, from the partial path.
         route = self.complete_path(partial_path_1, meta_graph)
 
+        # Routes in the contracted maze are expanded to cells only now, once for the complete path.
+        if self.contracted_graph is not None:
+            route = self.contracted_graph.expand_route(route)
+
         # Convert the complete path into a series of game actions (e.g., "up", "down", etc.).
-        actions = maze.locations_to_actions(route)
+        actions = self.maze_graph.route_actions(route)
 
         # Store the generated actions for use during the game.
         self.actions = actions
@@ -383,7 +343,7 @@ class Two_opt(Player):
                 * action: One of the possible actions.
         """
         # Return the next action to perform during this turn.
-        return self.actions.pop(0)
+        return next(self.actions)
 
 #############################################################################################################################################
 
@@ -16,10 +16,23 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
 import time
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
+
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph, maze_key
+from MetaGraph import MetaGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS, predecessors_to_route, nearest_target
+from DistanceTable import DistanceTable, APSP_MAX_VERTICES
+from LandmarkOracle import LandmarkOracle, DEFAULT_NB_LANDMARKS
+from ActionTable import ActionTable
+from ShortestPathTreeCache import shortest_path_tree_cache
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
@@ -33,10 +46,15 @@ class Two_opt_reactive(Player):
     #                                                                CONSTRUCTOR                                                                #
     #############################################################################################################################################
 
-    def __init__ ( self:     Self,
-                   *args:    Any,
-                   **kwargs: Any
-                 ) ->        Self:
+    def __init__ ( self:               Self,
+                   *args:              Any,
+                   engine:             ShortestPathEngine = ShortestPathEngine.HEAP,
+                   table_max_vertices: Integral = APSP_MAX_VERTICES,
+                   nb_landmarks:       Integral = DEFAULT_NB_LANDMARKS,
+                   use_tree_cache:     bool = True,
+                   use_action_table:   bool = False,
+                   **kwargs:           Any
+                 ) ->                  Self:
 
         """
             This function is the constructor of the class.
@@ -45,19 +63,54 @@ class Two_opt_reactive(Player):
             Arguments *args and **kwargs are used to pass arguments to the parent constructor.
             This is useful not to declare again all the parent's attributes in the child class.
             In:
-                * self:   Reference to the current object.
-                * args:   Arguments to pass to the parent constructor.
-                * kwargs: Keyword arguments to pass to the parent constructor.
+                * self:               Reference to the current object.
+                * args:               Arguments to pass to the parent constructor.
+                * engine:             Shortest-path engine used by the searches of the player.
+                * table_max_vertices: Largest number of vertices for which a table of all shortest paths is built in preprocessing.
+                * nb_landmarks:       Number of landmarks of the distance oracle built in preprocessing for larger mazes (0 to disable it).
+                * use_tree_cache:     Indicates if searches are kept in the cache of the process, so that games replayed on the same maze reuse them.
+                * use_action_table:   Indicates if the actions toward each piece of cheese are tabulated in preprocessing, so that turns need neither search nor route (this replaces the table, the oracle and the searches of replans).
+                * kwargs:             Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
         """
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+        assert isinstance(table_max_vertices, Integral) # Type check for table_max_vertices
+        assert isinstance(nb_landmarks, Integral) # Type check for nb_landmarks
+        assert isinstance(use_tree_cache, bool) # Type check for use_tree_cache
+        assert isinstance(use_action_table, bool) # Type check for use_action_table
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
+
+        # Table of all shortest paths, built in preprocessing for small mazes
+        self.table_max_vertices = table_max_vertices
+        self.distance_table = None
+
+        # Landmark distance oracle, built in preprocessing for larger mazes
+        self.nb_landmarks = nb_landmarks
+        self.landmark_oracle = None
+
+        # Cache of searches shared by all players of the process, and key of the maze in it (computed in preprocessing)
+        self.tree_cache = shortest_path_tree_cache() if use_tree_cache else None
+        self.maze_key = None
+
+        # Table of the actions leading to each piece of cheese, built in preprocessing (it replaces the table and the oracle)
+        self.use_action_table = use_action_table
+        self.action_table = None
         self.graph={}
         self.the_nearest={}
+
+        # Vertex at which the current route started (a node, or the location of the last replan, kept as a transient node of the meta-graph)
+        self.origin = None
         self.partial_path_1=[]
-        self.actions=[]
+        self.actions=iter([])
         self.destination=None
        
     #############################################################################################################################################
@@ -66,7 +119,7 @@ class Two_opt_reactive(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -77,59 +130,15 @@ class Two_opt_reactive(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
 
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
-
-            # Mark the current vertex as visited.
-            visited.add(vertice)
-
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -187,44 +196,13 @@ class Two_opt_reactive(Player):
             * pieces_of_cheese (list): A list of positions of the pieces of cheese in the maze.
 
         Out:
-            * dict: A complete graph (meta-graph) where:
+            * MetaGraph: A complete graph (meta-graph) where:
                 - Nodes are the source and the pieces of cheese.
                 - Edges are the shortest paths (and their distances) between these nodes.
-                Each edge is represented as a tuple containing the distance and the path.
+                Distances are stored in a matrix, and routes are rebuilt from the predecessors of the searches when needed.
         """
-        # Initialize the complete meta-graph
-        complete_graph = {}
-
-        # Add the source and all pieces of cheese as nodes in the meta-graph
-        sources = pieces_of_cheese + [source]
-        for element in sources:
-            complete_graph[element] = {}
-
-        # Copy the list of nodes to iterate over
-        nodes = sources.copy()
-
-        # Process each node to calculate shortest paths to other nodes
-        while len(nodes) > 0:
-            # Pop a node to serve as the starting point
-            start = nodes.pop()
-
-            # Identify all target nodes that are not yet connected to the start node
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
-
-            # Calculate shortest paths and update the meta-graph
-            for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
-
-                # Update the meta-graph with the shortest path and distance
-                complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
-                complete_graph[start][target] = (distance, route)        # Forward path
-
-        # Return the complete meta-graph
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese (searches kept in the cache of the process are reused)
+        return MetaGraph(maze, pieces_of_cheese + [source], self.engine, cache=self.tree_cache)
     
 
     def partial_path(self: Self, pieces_of_cheese: list, source, meta_graph):
@@ -235,43 +213,24 @@ class Two_opt_reactive(Player):
                 * self (Self): Reference to the current object.
                 * pieces_of_cheese (list): A list of vertices representing the positions of the remaining pieces of cheese.
                 * source: The starting vertex for the path.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list: 
                     - A list of vertices representing the partial path starting from the source and visiting pieces of cheese
                     in a greedy manner, choosing the closest unvisited vertex at each step.
         """
-        # Create a copy of the pieces of cheese to track unvisited vertices.
-        non_visited = pieces_of_cheese.copy()
-
-        # Initialize the partial path with the source vertex.
-        partial_path = [source]
-
-        # Start the traversal from the source.
-        current_vertex = source
+        # Closest unvisited piece of cheese at each step, chosen with vectorized queries on the distance matrix
+        return meta_graph.greedy_path(source, pieces_of_cheese)
 
-        # Continue until all pieces of cheese are visited.
-        while len(non_visited) > 0:
-            # Compare distances to all unvisited vertices and choose the nearest one.
-            comparaison = [(v, meta_graph[current_vertex][v][0]) for v in non_visited]
-            current_vertex = min(comparaison, key=lambda x: x[1])[0]
-
-            # Add the selected vertex to the partial path and mark it as visited.
-            partial_path.append(current_vertex)
-            non_visited.remove(current_vertex)
-
-        return partial_path
-
-    def complete_path(self: Self, partial_path: list, meta_graph: dict):
+    def complete_path(self: Self, partial_path: list, meta_graph: MetaGraph):
         """
         Constructs the complete path based on a partial path and the meta-graph.
 
             In:
                 * self (Self): Reference to the current object.
                 * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                    - The meta-graph's edges should include the shortest route between connected nodes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list:
@@ -285,21 +244,21 @@ class Two_opt_reactive(Player):
         for i in range(len(partial_path) - 1):
             # Add the route from the current vertex to the next vertex, excluding the last node in the segment
             # (to avoid duplication in the final path).
-            path += meta_graph[partial_path[i]][partial_path[i + 1]][1][:-1]
+            path += meta_graph.route(partial_path[i], partial_path[i + 1])[:-1]
 
         # Append the last vertex of the partial path to the complete path.
         path.append(partial_path[-1])
 
         return path
 
-    def two_opt(self:Self , partial_path:list,meta_graph:dict,initial_time:float,time_limit:float):
+    def two_opt(self:Self , partial_path:list,meta_graph:MetaGraph,initial_time:float,time_limit:float):
         """
         Applies the 2-opt heuristic to optimize the given partial path.
+        The changes in length of all swaps of a vertex are computed at once from the distance matrix.
 
         In:
             * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-            * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                - The meta-graph's edges should include the shortest route between connected nodes.
+            * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
         Out:
             * list: A list of vertices representing the optimized path after applying the 2-opt heuristic.
@@ -307,11 +266,9 @@ class Two_opt_reactive(Player):
         time_1=time.time()
         time_2=time.time()
         delta_time=time_2-time_1+initial_time
-        def path_length(path):
-            return sum([meta_graph[path[i]][path[i+1]][0] for i in range(len(path)-1)])
-        # Initialize the best path as the given partial path.
+        # Initialize the best path as the given partial path, with the indices of its vertices in the meta-graph.
         best_path = partial_path.copy()
-        best_length=path_length(best_path)
+        indices = meta_graph.indices(best_path)
         # Initialize the flag to indicate whether the path has been improved.
         improved = True
         
@@ -322,22 +279,41 @@ class Two_opt_reactive(Player):
 
             # Iterate over all pairs of edges in the path.
             for i in range(1, len(partial_path) - 1):
-                for j in range(i + 1, len(partial_path)-1):
-                    new_path=best_path.copy()
-                    new_path[i] ,new_path[j]= new_path[j],new_path[i]
-                    new_path_length=path_length(new_path)
-                    if new_path_length<best_length:
-                        # Reverse the segment between i and j in the path.
-                        best_path[i] ,best_path[j]= best_path[j],best_path[i]
-                        best_length=new_path_length
-                        # Update the flag to indicate an improvement.
-                        improved = True
+                start = i + 1
+                while start < len(partial_path) - 1:
+                    # Apply the first swap that shortens the path, then look for the next one after it.
+                    shorter = (meta_graph.swap_deltas(indices, i, start) < 0).nonzero()[0]
+                    if len(shorter) == 0:
+                        break
+                    j = start + int(shorter[0])
+                    best_path[i] ,best_path[j]= best_path[j],best_path[i]
+                    indices[i], indices[j] = indices[j], indices[i]
+                    start = j + 1
+                    # Update the flag to indicate an improvement.
+                    improved = True
             time_2=time.time()
             delta_time=time_2-time_1+initial_time            
         return best_path
 
 
 
+    def known_route(self, position, stolen):
+        """
+            Adds the current position of the player to the meta-graph as a transient node, and checks if the route to the destination is known.
+            The player is on its route from the origin to the stolen piece of cheese, so the distances to both are exact, and bound the distances to all other pieces of cheese.
+            When the bounds are equal, a shortest path goes through one of these two vertices, and no search is needed.
+
+            In:
+                * self (Self): Reference to the current object.
+                * position: The current position of the player.
+                * stolen: The former destination of the player, that is no longer a valid piece of cheese.
+
+            Out:
+                * bool: True if the route from the position to the destination is known by the meta-graph.
+        """
+        # The transient node is kept until the player reaches a piece of cheese (only a few of them are kept anyway).
+        return self.graph.add_transient(position, self.origin, stolen, self.maze_graph) and self.graph.distance(position, self.destination) >= 0
+
     def next_destination(self, maze, position, pieces_of_cheese):
         """
             Determines the next destination for the player based on its current position and the positions 
@@ -366,29 +342,60 @@ class Two_opt_reactive(Player):
 
             # Update the player's destination to the nearest valid piece of cheese.
             self.destination = self.partial_path_1.pop(i)
+
+            # The player is on a node again, so the former locations it replanned from are not needed anymore.
+            self.graph.retire()
+            return True
+
+        # Case 2 (with the table of actions): The current destination is no longer a valid piece of cheese.
+        elif self.destination not in pieces_of_cheese and self.action_table is not None:
+            # Identify possible destinations among the remaining pieces of cheese.
+            possible_destinations = set(pieces_of_cheese)
+            i = 0
+
+            # Find the nearest piece of cheese from the current position that is still available.
+            while self.partial_path_1[i] not in possible_destinations:
+                i += 1
+
+            # No route is needed, as moves toward any piece of cheese are read from the table.
+            self.destination = self.partial_path_1.pop(i)
             return True
 
         # Case 2: The current destination is no longer a valid piece of cheese.
-        elif self.destination not in pieces_of_cheese:
-            # Perform a traversal to compute distances and routing information from the current position.
-            distances, routing_table = self.traversal(maze, position, pieces_of_cheese)
+        elif self.destination not in pieces_of_cheese and self.distance_table is not None:
+            # Identify possible destinations among the remaining pieces of cheese.
+            possible_destinations = set(pieces_of_cheese)
+            i = 0
 
-            # Initialize or update the graph representation for the current position.
-            self.graph[position] = {}
+            # Find the nearest piece of cheese from the current position that is still available.
+            while self.partial_path_1[i] not in possible_destinations:
+                i += 1
+            stolen, self.destination = self.destination, self.partial_path_1.pop(i)
 
-            # Variables to track the nearest piece of cheese.
-            min_distance = float('inf')
-            destination = position
+            # Only the route to this destination is needed, it is known if the player is on a shortest path to it, or read from the table without any search.
+            if not self.known_route(position, stolen):
+                self.graph.set_route(position, self.destination, self.distance_table.distance(position, self.destination), self.distance_table.route(position, self.destination))
+            return True
+
+        # Case 2 (with landmarks): The current destination is no longer a valid piece of cheese.
+        elif self.destination not in pieces_of_cheese and self.landmark_oracle is not None:
+            # Identify possible destinations among the remaining pieces of cheese.
+            possible_destinations = set(pieces_of_cheese)
+            i = 0
 
-            # Evaluate all pieces of cheese to find the nearest one.
-            for target in pieces_of_cheese:
-                # Find the shortest route and its distance from the current position to the target.
-                route, distance = self.find_route_and_distance(routing_table, distances, position, target)
+            # Find the nearest piece of cheese from the current position that is still available.
+            while self.partial_path_1[i] not in possible_destinations:
+                i += 1
+            stolen, self.destination = self.destination, self.partial_path_1.pop(i)
 
-                # Update the graph with the computed route and distance.
-                self.graph[target][position] = (distance, route[::-1])  # Reverse the route for the reverse direction.
-                self.graph[position][target] = (distance, route)
+            # Only the route to this destination is needed, it is known if the player is on a shortest path to it, or found by an A* search guided by the landmarks.
+            if not self.known_route(position, stolen):
+                distance, route, _ = self.landmark_oracle.astar(position, self.destination)
+                self.graph.set_route(position, self.destination, distance, route)
+            return True
 
+        # Case 2 (without table): The current destination is no longer a valid piece of cheese.
+        elif self.destination not in pieces_of_cheese:
             # Identify possible destinations among the remaining pieces of cheese.
             possible_destinations = set(pieces_of_cheese)
             i = 0
@@ -398,7 +405,18 @@ class Two_opt_reactive(Player):
                 i += 1
 
             # Update the player's destination to the nearest valid piece of cheese.
-            self.destination = self.partial_path_1.pop(i)
+            stolen, self.destination = self.destination, self.partial_path_1.pop(i)
+
+            # Only the route to this destination is needed, it is known if the player is on a shortest path to it.
+            # Otherwise, the search stops as soon as it is settled (a search kept in the cache of the process is reused).
+            if self.known_route(position, stolen):
+                pass
+            elif self.tree_cache is not None:
+                target_distances, predecessors = self.tree_cache.search(self.maze_graph, position, [self.destination], self.engine, self.maze_key)
+                self.graph.set_route(position, self.destination, target_distances[self.destination], predecessors_to_route(predecessors, position, self.destination))
+            else:
+                _, distance, route = nearest_target(self.maze_graph, position, [self.destination], 1, self.engine)[0]
+                self.graph.set_route(position, self.destination, distance, route)
             return True
 
 
@@ -424,13 +442,32 @@ class Two_opt_reactive(Player):
             Out:
                 * None.
         """
+
         time_1=time.time()
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+        if self.tree_cache is not None:
+            self.maze_key = maze_key(self.maze_graph)
+
         # Get the player's current location and the locations of the remaining cheese.
         source = game_state.player_locations[self.name]
         pieces_of_cheese = game_state.cheese
 
+        # Actions toward each piece of cheese from any cell are computed now, so that turns only need a lookup
+        if self.use_action_table:
+            self.action_table = ActionTable(self.maze_graph, pieces_of_cheese, self.engine)
+
+        # In small mazes, all shortest paths are computed now, so that turns need no search
+        elif self.maze_graph.nb_vertices <= self.table_max_vertices:
+            self.distance_table = DistanceTable(self.maze_graph)
+
+        # In larger mazes, distances from a few landmarks are computed now, so that searches during turns are guided by tight lower bounds
+        elif self.nb_landmarks > 0:
+            self.landmark_oracle = LandmarkOracle(self.maze_graph, self.nb_landmarks)
+
         # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        self.graph = self.meta_graph(maze, source, pieces_of_cheese)
+        self.graph = self.meta_graph(self.maze_graph, source, pieces_of_cheese)
         partial_path_0 = self.partial_path(pieces_of_cheese, source, self.graph)
         #define the partial path
         time_2=time.time()
@@ -439,15 +476,12 @@ class Two_opt_reactive(Player):
         self.partial_path_1.pop(0)
         # Set the first piece of cheese  in partial path as the next destination.
         self.destination = self.partial_path_1.pop(0)
-        
-        # Retrieve the shortest route from the source to the destination.
-        route = self.graph[source][self.destination][1]
 
-        # Convert the route into a series of actions the player can take in the maze.
-        actions = maze.locations_to_actions(route)
-
-        # Store the actions for execution during the game.
-        self.actions = actions
+        # Without the table of actions, the route from the source to the destination is converted into a series of actions
+        if self.action_table is None:
+            route = self.graph.route(source, self.destination)
+            self.actions = self.maze_graph.route_actions(route)
+            self.origin = source
 
 
     #############################################################################################################################################
@@ -479,16 +513,22 @@ class Two_opt_reactive(Player):
         # Determine if the player needs to update their destination or route.
         boolv = self.next_destination(maze, position, pieces_of_cheese)
 
+        # With the table of actions, the next move toward the destination is a lookup.
+        if self.action_table is not None:
+            return self.action_table.action(position, self.destination)
+
         # If a new route is required, compute it and update the player's actions.
         if boolv:
-            route = self.graph[position][self.destination][1]
+            # The route is read from the meta-graph, the position being a node or a transient node.
+            route = self.graph.route(position, self.destination)
+            self.origin = position
             # Convert the route (list of locations) into a series of actions.
-            actions = maze.locations_to_actions(route)
+            actions = self.maze_graph.route_actions(route)
             # Store the actions for future turns.
             self.actions = actions
 
         # Return the next action to perform during this turn.
-        return self.actions.pop(0)
+        return next(self.actions)
 
 
 
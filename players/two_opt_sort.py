@@ -16,10 +16,18 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import heapq
+import os
+import sys
+
+# Add needed directories to the path
+this_directory = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(this_directory, "..", "utils"))
 
 # PyRat imports
 from pyrat import Player, Maze, GameState, Action
+from MazeGraph import MazeGraph
+from MetaGraph import MetaGraph
+from shortest_paths import ShortestPathEngine, TRAVERSALS
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
 #####################################################################################################################################################
@@ -34,6 +42,7 @@ class Player_tournoi(Player):
 
     def __init__ ( self:     Self,
                    *args:    Any,
+                   engine:   ShortestPathEngine = ShortestPathEngine.HEAP,
                    **kwargs: Any
                  ) ->        Self:
 
@@ -46,6 +55,7 @@ class Player_tournoi(Player):
             In:
                 * self:   Reference to the current object.
                 * args:   Arguments to pass to the parent constructor.
+                * engine: Shortest-path engine used by the searches of the player.
                 * kwargs: Keyword arguments to pass to the parent constructor.
             Out:
                 * A new instance of the class.
@@ -53,6 +63,13 @@ class Player_tournoi(Player):
 
         # Inherit from parent class
         super().__init__(*args, **kwargs)
+        self.maze_graph = None
+
+        # Debug
+        assert isinstance(engine, ShortestPathEngine) # Type check for engine
+
+        # Shortest-path engine used by all searches
+        self.engine = engine
         self.actions=[]
        
     #############################################################################################################################################
@@ -61,7 +78,7 @@ class Player_tournoi(Player):
     def traversal ( self:   Self,
                 maze:  Maze,
                 source: Integral,
-                targets
+                targets: Optional[Iterable[Integral]] = None
               ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
 
         """
@@ -72,59 +89,15 @@ class Player_tournoi(Player):
                 * self: Reference to the current object.
                 * graph: The graph to traverse.
                 * source: The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
             Out:
                * distances:  The distances from the source to each explored vertex.
                * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
         """
-        # Initialize a priority queue (min-heap) to keep track of vertices to explore.
-        min_heap = []
-        targets=set(targets)
-
-        # Push the source vertex onto the heap with a distance of 0.
-        heapq.heappush(min_heap, (0, source))
-
-        # Create a set to keep track of visited vertices to avoid reprocessing them.
-        visited = set()
-
-        # Initialize the distances dictionary with the source vertex set to 0.
-        distances = {source: 0}
-
-        # Initialize the routing table with the source vertex having no parent (None).
-        routing_table = {source: None}
-
-        # While there are vertices in the priority queue, continue the traversal.
-        while len(min_heap) > 0 and not targets.issubset(visited):
-            # Extract the vertex with the smallest distance from the heap.
-            distance, vertice = heapq.heappop(min_heap)
 
-            # Mark the current vertex as visited.
-            visited.add(vertice)
+        # Delegate to the shortest-path engine chosen at construction
+        return TRAVERSALS[self.engine](maze, source, targets)
 
-            # Get the neighbors of the current vertex.
-            neighbors = maze.get_neighbors(vertice)
-
-            # Iterate over all neighbors of the current vertex.
-            for neighbor in neighbors:
-                # Get the weight of the edge between the current vertex and the neighbor.
-                weight = maze.get_weight(vertice, neighbor)
-
-                # Calculate the new distance to the neighbor via the current vertex.
-                new_distance = distance + weight
-
-                # If the neighbor hasn't been visited or the new distance is smaller, update.
-                if neighbor not in distances or new_distance < distances[neighbor]:
-                    # Update the shortest distance to the neighbor.
-                    distances[neighbor] = new_distance
-
-                    # Update the routing table to record the current vertex as the parent of the neighbor.
-                    routing_table[neighbor] = vertice
-
-                    # Push the neighbor onto the heap with the updated distance.
-                    heapq.heappush(min_heap, (new_distance, neighbor))
-
-        # Return the distances and routing table as the result of the traversal.
-        return distances, routing_table
-    
     def find_route_and_distance(self: Self,
                                 routing_table: Dict[Integral, Optional[Integral]],
                                 distances: Dict[Integral, Integral],
@@ -181,44 +154,13 @@ class Player_tournoi(Player):
             * pieces_of_cheese (list): A list of positions of the pieces of cheese in the maze.
 
         Out:
-            * dict: A complete graph (meta-graph) where:
+            * MetaGraph: A complete graph (meta-graph) where:
                 - Nodes are the source and the pieces of cheese.
                 - Edges are the shortest paths (and their distances) between these nodes.
-                Each edge is represented as a tuple containing the distance and the path.
+                Distances are stored in a matrix, and routes are rebuilt from the predecessors of the searches when needed.
         """
-        # Initialize the complete meta-graph
-        complete_graph = {}
-
-        # Add the source and all pieces of cheese as nodes in the meta-graph
-        sources = pieces_of_cheese + [source]
-        for element in sources:
-            complete_graph[element] = {}
-
-        # Copy the list of nodes to iterate over
-        nodes = sources.copy()
-
-        # Process each node to calculate shortest paths to other nodes
-        while len(nodes) > 0:
-            # Pop a node to serve as the starting point
-            start = nodes.pop()
-
-            # Identify all target nodes that are not yet connected to the start node
-            targets = [target for target in sources if target != start and target not in complete_graph[start]]
-
-            # Perform a traversal to find distances and routing tables
-            distances, routing_table = self.traversal(maze, start, targets)
-
-            # Calculate shortest paths and update the meta-graph
-            for target in targets:
-                # Find the shortest path and distance between start and target
-                route, distance = self.find_route_and_distance(routing_table, distances, start, target)
-
-                # Update the meta-graph with the shortest path and distance
-                complete_graph[target][start] = (distance, route[::-1])  # Reverse the route for backward path
-                complete_graph[start][target] = (distance, route)        # Forward path
-
-        # Return the complete meta-graph
-        return complete_graph
+        # The source is the last node, so it is searched first, toward all pieces of cheese
+        return MetaGraph(maze, pieces_of_cheese + [source], self.engine)
 
     def partial_path(self: Self, pieces_of_cheese: list, source, meta_graph):
         """
@@ -228,43 +170,24 @@ class Player_tournoi(Player):
                 * self (Self): Reference to the current object.
                 * pieces_of_cheese (list): A list of vertices representing the positions of the remaining pieces of cheese.
                 * source: The starting vertex for the path.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list: 
                     - A list of vertices representing the partial path starting from the source and visiting pieces of cheese
                     in a greedy manner, choosing the closest unvisited vertex at each step.
         """
-        # Create a copy of the pieces of cheese to track unvisited vertices.
-        non_visited = pieces_of_cheese.copy()
-
-        # Initialize the partial path with the source vertex.
-        partial_path = [source]
+        # Closest unvisited piece of cheese at each step, chosen with vectorized queries on the distance matrix
+        return meta_graph.greedy_path(source, pieces_of_cheese)
 
-        # Start the traversal from the source.
-        current_vertex = source
-
-        # Continue until all pieces of cheese are visited.
-        while len(non_visited) > 0:
-            # Compare distances to all unvisited vertices and choose the nearest one.
-            comparaison = [(v, meta_graph[current_vertex][v][0]) for v in non_visited]
-            current_vertex = min(comparaison, key=lambda x: x[1])[0]
-
-            # Add the selected vertex to the partial path and mark it as visited.
-            partial_path.append(current_vertex)
-            non_visited.remove(current_vertex)
-
-        return partial_path
-
-    def complete_path(self: Self, partial_path: list, meta_graph: dict):
+    def complete_path(self: Self, partial_path: list, meta_graph: MetaGraph):
         """
         Constructs the complete path based on a partial path and the meta-graph.
 
             In:
                 * self (Self): Reference to the current object.
                 * partial_path (list): A list of vertices representing the ordered sequence of nodes to visit.
-                * meta_graph (dict): A meta-graph where each vertex is connected to other vertices with distances and routes.
-                    - The meta-graph's edges should include the shortest route between connected nodes.
+                * meta_graph (MetaGraph): A meta-graph where each vertex is connected to other vertices with distances and routes.
 
             Out:
                 * list:
@@ -278,7 +201,7 @@ class Player_tournoi(Player):
         for i in range(len(partial_path) - 1):
             # Add the route from the current vertex to the next vertex, excluding the last node in the segment
             # (to avoid duplication in the final path).
-            path += meta_graph[partial_path[i]][partial_path[i + 1]][1][:-1]
+            path += meta_graph.route(partial_path[i], partial_path[i + 1])[:-1]
 
         # Append the last vertex of the partial path to the complete path.
         path.append(partial_path[-1])
@@ -324,13 +247,13 @@ class Player_tournoi(Player):
                         improved = True
         return best_path"""
     
-    def two_opt_sort(self:Self,partial_path:list,meta_graph:dict):
-        def path_length(path):
-            return sum([meta_graph[path[i]][path[i+1]][0] for i in range(len(path)-1)])
+    def two_opt_sort(self:Self,partial_path:list,meta_graph:MetaGraph):
+        # Lengths of paths are sums over the distance matrix
+        path_length = meta_graph.path_length
         # Initialize the best path as the given partial path.
         best_path = partial_path.copy()
         best_length=path_length(best_path)
-        lenths_edges=[[i,partial_path[i],i+1,partial_path[i+1],meta_graph[partial_path[i]][partial_path[i+1]][0]] for i in range(len(partial_path)-1)]
+        lenths_edges=[[i,partial_path[i],i+1,partial_path[i+1],meta_graph.distance(partial_path[i], partial_path[i+1])] for i in range(len(partial_path)-1)]
         lenths_edges=sorted(lenths_edges, key=lambda x: x[-1])
 
         # Initialize the flag to indicate whether the path has been improved.
@@ -352,8 +275,8 @@ class Player_tournoi(Player):
                     new_lenths_edges[i][-3],new_lenths_edges[j][-3]=new_lenths_edges[j][-3],new_lenths_edges[i][-3]
                     new_lenths_edges[i][-2],new_lenths_edges[j][-2]=new_lenths_edges[j][-2],new_lenths_edges[i][-2]
                     if new_lenths_edges[i][3]!=new_lenths_edges[i][1] and  new_lenths_edges[j][3]!=new_lenths_edges[j][1]:
-                        new_lenths_edges[i][-1]=meta_graph[new_lenths_edges[i][1]][new_lenths_edges[i][3]][0]
-                        new_lenths_edges[j][-1]=meta_graph[new_lenths_edges[j][1]][new_lenths_edges[j][3]][0]
+                        new_lenths_edges[i][-1]=meta_graph.distance(new_lenths_edges[i][1], new_lenths_edges[i][3])
+                        new_lenths_edges[j][-1]=meta_graph.distance(new_lenths_edges[j][1], new_lenths_edges[j][3])
 
                         new_path_length=path_length(new_path)
                         if new_path_length<best_length:
@@ -381,6 +304,10 @@ class Player_tournoi(Player):
             Out:
                 * None.
         """
+
+        # Take a snapshot of the maze once, all searches below run on it
+        self.maze_graph = MazeGraph(maze)
+
         # Get the current location of the player from the game state.
         source = game_state.player_locations[self.name]
 
@@ -388,8 +315,8 @@ class Player_tournoi(Player):
         pieces_of_cheese = game_state.cheese
 
         # Build the meta-graph to calculate shortest paths between the source and all pieces of cheese.
-        meta_graph = self.meta_graph(maze, source, pieces_of_cheese)
-        print([(i,meta_graph[i].keys()) for i in meta_graph.keys()])
+        meta_graph = self.meta_graph(self.maze_graph, source, pieces_of_cheese)
+        print([(i,list(meta_graph[i])) for i in meta_graph.keys()])
         # Generate a partial path using a greedy approach to visit the pieces of cheese.
         partial_path = self.partial_path(pieces_of_cheese, source, meta_graph)
         print(partial_path)
@@ -0,0 +1,169 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a table of the actions leading to some targets of a maze.
+    For each target, a full shortest-path tree is rooted at it: the parent of a cell in this tree is the next cell on a shortest path from this cell to the target.
+    The action leading to this parent is stored as a small integer, so that a player only needs a lookup at each turn, whatever its changes of target.
+    Players in mud are not asked for actions, so looking up the action from the current location of the player is always valid.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import numpy
+
+# Scipy is an optional dependency
+try:
+    import scipy.sparse.csgraph
+except ImportError:
+    pass
+
+# PyRat imports
+from pyrat import Maze, Action
+from MazeGraph import MazeGraph, as_maze_graph
+from shortest_paths import ShortestPathEngine, multi_target_dijkstra, sparse_matrix
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Actions in the order of their codes in the table
+ACTIONS = [Action.NOTHING, Action.NORTH, Action.SOUTH, Action.EAST, Action.WEST]
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ActionTable ():
+
+    """
+        This class stores, for each cell and each target, the action to perform to follow a shortest path to the target.
+        The graph must be a maze of cells (not a ContractedGraph), so that each parent in a tree is a neighbor on the grid.
+        The following attributes are available:
+            * targets: The targets of the table, in order.
+            * index:   Dictionary associating each target with its row in the table.
+            * actions: Array of type int8 and shape (nb_targets, nb_cells), where actions[i, cell] is the code of the action (see ACTIONS).
+        The code is 0 (nothing) on the target itself, and for cells that cannot reach it.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:    Self,
+                   graph:   Union[Maze, MazeGraph],
+                   targets: List[Integral],
+                   engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+                 ) ->       Self:
+
+        """
+            This function is the constructor of the class.
+            All trees are built in a single call to scipy.sparse.csgraph if scipy is installed, or with one full multi_target_dijkstra per target otherwise.
+            In:
+                * self:    Reference to the current object.
+                * graph:   The maze to analyze.
+                * targets: The cells toward which actions are needed (duplicates are ignored).
+                * engine:  Priority queue of the searches, if scipy is not installed.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Index of each target
+        maze_graph = as_maze_graph(graph)
+        self.targets = list(dict.fromkeys(targets))
+        self.index = {target: index for index, target in enumerate(self.targets)}
+        self.actions = numpy.zeros((len(self.targets), maze_graph.nb_cells), dtype=numpy.int8)
+        if len(self.targets) == 0:
+            return
+
+        # Trees rooted at all targets in compiled code
+        if "scipy" in globals():
+            _, predecessors = scipy.sparse.csgraph.dijkstra(sparse_matrix(maze_graph), indices=self.targets, return_predecessors=True)
+            self._encode(predecessors, maze_graph.width, slice(None))
+
+        # One full search per target otherwise
+        else:
+            for index, target in enumerate(self.targets):
+                _, predecessors = multi_target_dijkstra(maze_graph, target, maze_graph.vertices, engine)
+                self._encode(numpy.frombuffer(predecessors, dtype=numpy.int32), maze_graph.width, index)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def _encode ( self:         Self,
+                  predecessors: numpy.ndarray,
+                  width:        Integral,
+                  rows:         Union[Integral, slice]
+                ) ->            None:
+
+        """
+            Fills rows of the table with the codes of the moves from each cell to its parent.
+            Horizontal moves are encoded first, so that vertical moves win in mazes of width 1, where both differences are equal.
+            In:
+                * self:         Reference to the current object.
+                * predecessors: Parents of all cells in the trees of the rows (negative when there is none).
+                * width:        Width of the maze.
+                * rows:         Rows of the table to fill.
+            Out:
+                * None.
+        """
+
+        # Differences between each parent and its cell, then codes of the actions
+        difference = numpy.where(predecessors >= 0, predecessors - numpy.arange(predecessors.shape[-1]), 0)
+        codes = numpy.zeros(difference.shape, dtype=numpy.int8)
+        codes[difference == 1] = ACTIONS.index(Action.EAST)
+        codes[difference == -1] = ACTIONS.index(Action.WEST)
+        codes[difference == width] = ACTIONS.index(Action.SOUTH)
+        codes[difference == -width] = ACTIONS.index(Action.NORTH)
+        self.actions[rows] = codes
+
+    #############################################################################################################################################
+
+    @property
+    def nbytes ( self: Self,
+               ) ->    Integral:
+
+        """
+            Memory used by the table, in bytes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nbytes: Size of the array of actions.
+        """
+
+        # One byte per cell and target
+        return self.actions.nbytes
+
+    #############################################################################################################################################
+
+    def action ( self:   Self,
+                 cell:   Integral,
+                 target: Integral
+               ) ->      Action:
+
+        """
+            Returns the action to perform in a cell to follow a shortest path to a target.
+            In:
+                * self:   Reference to the current object.
+                * cell:   The cell where the player is.
+                * target: One of the targets of the table.
+            Out:
+                * action: The action to perform (nothing if the player is on the target).
+        """
+
+        # Lookup
+        return ACTIONS[self.actions[self.index[target], cell]]
+
+#####################################################################################################################################################
+#####################################################################################################################################################
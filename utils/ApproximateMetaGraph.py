@@ -0,0 +1,349 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define an approximate meta-graph, for games with hundreds of pieces of cheese.
+    Even with one search per node, a MetaGraph needs k searches of the maze, which is too slow with 500 pieces of cheese or more.
+    Here, a single search seeded from all nodes at once labels each cell with its closest node, which splits the maze into Voronoi regions.
+    Each edge between two regions gives a walk between their nodes, going down the tree of the search on both sides.
+    Shortest paths in the sparse graph of these walks approximate the distances between nodes (Mehlhorn's construction), and are never shorter.
+    Only the pairs actually used by a tour are then refined, with exact searches, so that the routes followed by a player are shortest paths.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import array
+import heapq
+import collections
+import numpy
+
+# Scipy is an optional dependency
+try:
+    import scipy.sparse
+    import scipy.sparse.csgraph
+except ImportError:
+    pass
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+from shortest_paths import ShortestPathEngine, multi_target_dijkstra, predecessors_to_route, voronoi_regions
+from MetaGraph import MetaGraph, DEFAULT_MAX_TRANSIENT
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ApproximateMetaGraph (MetaGraph):
+
+    """
+        This class extends the MetaGraph class with distances approximated from a single search, instead of one search per node.
+        Distances of the matrix are lengths of actual walks between nodes, so they are upper bounds of the exact distances, until pairs are refined.
+        All queries of MetaGraph (greedy paths, 2-opt moves, etc.) run unchanged on the matrix.
+        The following attributes are added:
+            * maze_graph:             The snapshot in which nodes were searched, kept for refinements.
+            * engine:                 Shortest-path engine used by the searches.
+            * regions:                Array giving for each cell the index of its closest node (-1 if no node reaches it).
+            * tree:                   Array of predecessors of the search from all nodes, where each cell points toward its closest node.
+            * links:                  Dictionary associating each pair (i, j) of neighboring regions, with i < j, with the edge (u, v) between them that gives the shortest walk.
+            * closure_predecessors:   Matrix of type int32, where closure_predecessors[i, j] is the region before j on the best walk from node i (-1 if none).
+            * refined:                Dictionary associating each refined pair (i, j), with i < j, with the shortest path from node i to node j.
+        The bounds of transient vertices need exact distances, so add_transient always fails and callers fall back to their own searches.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:   Self,
+                   graph:  Union[Maze, MazeGraph],
+                   nodes:  List[Integral],
+                   engine: ShortestPathEngine = ShortestPathEngine.HEAP
+                 ) ->      Self:
+
+        """
+            This function is the constructor of the class.
+            The parent constructor is not called, as it would search from all nodes.
+            In:
+                * self:   Reference to the current object.
+                * graph:  The maze in which to search.
+                * nodes:  The vertices of the meta-graph (duplicates are ignored).
+                * engine: Shortest-path engine used by the searches.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Attributes of a meta-graph, routes being built from the tree instead of one array of predecessors per node
+        self.nodes = list(dict.fromkeys(nodes))
+        self.index = {vertex: index for index, vertex in enumerate(self.nodes)}
+        self.predecessors = [None] * len(self.nodes)
+        self.routes = None
+        self.present = numpy.ones(len(self.nodes), dtype=bool)
+        self.transients = collections.OrderedDict()
+        self.max_transient = DEFAULT_MAX_TRANSIENT
+        self.maze_graph = as_maze_graph(graph)
+        self.engine = engine
+        self.refined = {}
+
+        # A single search from all nodes gives the Voronoi regions
+        regions, cell_distances, tree = voronoi_regions(self.maze_graph, self.nodes, engine)
+        self.regions = regions
+        self.tree = array.array("i", tree.tobytes())
+
+        # Edges between two regions, stored once per direction in the CSR arrays, are kept from the region with the smallest index
+        sources = numpy.repeat(numpy.arange(self.maze_graph.nb_cells, dtype=numpy.int32), numpy.diff(self.maze_graph.indptr))
+        targets = self.maze_graph.indices
+        boundary = (regions[sources] >= 0) & (regions[targets] > regions[sources])
+        sources, targets = sources[boundary], targets[boundary]
+        source_regions, target_regions = regions[sources], regions[targets]
+        lengths = cell_distances[sources] + self.maze_graph.weights[boundary] + cell_distances[targets]
+
+        # The shortest walk between each pair of neighboring regions
+        order = numpy.lexsort((lengths, target_regions, source_regions))
+        pair_keys = source_regions[order].astype(numpy.int64) * len(self.nodes) + target_regions[order]
+        _, first = numpy.unique(pair_keys, return_index=True)
+        best = order[first]
+        self.links = {(i, j): (u, v) for i, j, u, v in zip(source_regions[best].tolist(), target_regions[best].tolist(), sources[best].tolist(), targets[best].tolist())}
+
+        # Shortest walks between all nodes in the graph of regions
+        self.distances, self.closure_predecessors = self._closure(source_regions[best], target_regions[best], lengths[best])
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @property
+    def nbytes ( self: Self,
+               ) ->    Integral:
+
+        """
+            Memory used by the arrays of the meta-graph, in bytes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nbytes: Size of the distance matrix, of the predecessors in the graph of regions, and of the search from all nodes.
+        """
+
+        # Sum of all arrays
+        return self.distances.nbytes + self.closure_predecessors.nbytes + self.regions.nbytes + self.tree.itemsize * len(self.tree)
+
+    #############################################################################################################################################
+
+    @override
+    def to_arrays ( self: Self,
+                  ) ->    Dict[str, numpy.ndarray]:
+
+        """
+            This method redefines the method of the parent class.
+            Approximate meta-graphs have no array of predecessors per node, so they cannot be converted.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None, an error is raised.
+        """
+
+        # Not supported
+        raise NotImplementedError("Approximate meta-graphs cannot be converted to arrays.")
+
+    #############################################################################################################################################
+
+    @override
+    def route ( self:   Self,
+                source: Integral,
+                target: Integral
+              ) ->      List[Integral]:
+
+        """
+            This method redefines the method of the parent class.
+            Refined pairs give a shortest path, other pairs give the walk whose length is in the matrix.
+            The walk crosses the regions on the way, going up the tree of the search to each boundary edge and down to the next node.
+            In:
+                * self:   Reference to the current object.
+                * source: The source vertex.
+                * target: The target vertex, that must be reachable from the source.
+            Out:
+                * route: The route from source to target.
+        """
+
+        # Transient vertices are handled by the parent class
+        if source in self.transients or target in self.transients:
+            return super().route(source, target)
+
+        # Refined pairs, reversed if needed
+        source_index, target_index = self.index[source], self.index[target]
+        if source_index == target_index:
+            return [source]
+        pair = (min(source_index, target_index), max(source_index, target_index))
+        if pair in self.refined:
+            return self.refined[pair] if pair[0] == source_index else self.refined[pair][::-1]
+        if self.distances[source_index, target_index] < 0:
+            raise KeyError(target)
+
+        # Regions crossed by the walk
+        crossed = [target_index]
+        while crossed[-1] != source_index:
+            crossed.append(int(self.closure_predecessors[source_index, crossed[-1]]))
+        crossed = crossed[::-1]
+
+        # Up the tree to the boundary edge, and down the tree to the next node
+        route = [source]
+        for region, next_region in zip(crossed[:-1], crossed[1:]):
+            u, v = self.links[(min(region, next_region), max(region, next_region))]
+            if self.regions[u] != region:
+                u, v = v, u
+            route += predecessors_to_route(self.tree, self.nodes[region], u)[1:]
+            route += predecessors_to_route(self.tree, self.nodes[next_region], v)[::-1]
+        return route
+
+    #############################################################################################################################################
+
+    @override
+    def add_transient ( self:   Self,
+                        vertex: Integral,
+                        source: Integral,
+                        target: Integral,
+                        graph:  Union[Maze, MazeGraph]
+                      ) ->      bool:
+
+        """
+            This method redefines the method of the parent class.
+            The triangle inequality only bounds distances when the matrix is exact, so transient vertices are never added.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The vertex to add.
+                * source: The vertex at which the route starts.
+                * target: The vertex at which the route ends.
+                * graph:  The maze.
+            Out:
+                * added: True if the vertex is a node, False otherwise.
+        """
+
+        # Nodes only
+        return vertex in self.index
+
+    #############################################################################################################################################
+
+    def refine ( self: Self,
+                 path: List[Integral]
+               ) ->    Integral:
+
+        """
+            Replaces the approximate distances between consecutive vertices of a path with exact ones, and keeps the corresponding shortest paths.
+            Searches are done from every other vertex of the path, toward its previous and next vertices, so that each search refines two pairs.
+            In:
+                * self: Reference to the current object.
+                * path: The nodes of the path, in order (e.g., a tour).
+            Out:
+                * nb_changed: Number of pairs whose distance decreased (0 if the path length is now exact and was already).
+        """
+
+        # Pairs that are not refined yet, attached to their vertex at an odd position
+        pending = {}
+        for position in range(len(path) - 1):
+            i, j = self.index[path[position]], self.index[path[position + 1]]
+            if i != j and (min(i, j), max(i, j)) not in self.refined and self.distances[i, j] >= 0:
+                start, end = (path[position], j) if position % 2 == 1 else (path[position + 1], i)
+                pending.setdefault(start, set()).add(end)
+
+        # One search per vertex
+        nb_changed = 0
+        for start, ends in pending.items():
+            target_distances, predecessors = multi_target_dijkstra(self.maze_graph, start, [self.nodes[end] for end in ends], self.engine)
+            start_index = self.index[start]
+            for end in ends:
+                distance = target_distances[self.nodes[end]]
+                route = predecessors_to_route(predecessors, start, self.nodes[end])
+                self.refined[(min(start_index, end), max(start_index, end))] = route if start_index < end else route[::-1]
+                if distance < self.distances[start_index, end]:
+                    nb_changed += 1
+                self.distances[start_index, end] = self.distances[end, start_index] = distance
+        return nb_changed
+
+    #############################################################################################################################################
+
+    def is_refined ( self:   Self,
+                     source: Integral,
+                     target: Integral
+                   ) ->      bool:
+
+        """
+            Indicates if the distance between two nodes is known to be exact.
+            In:
+                * self:   Reference to the current object.
+                * source: The source vertex.
+                * target: The target vertex.
+            Out:
+                * refined: True if the pair was refined (or if both vertices are the same).
+        """
+
+        # Lookup
+        source_index, target_index = self.index[source], self.index[target]
+        return source_index == target_index or (min(source_index, target_index), max(source_index, target_index)) in self.refined
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _closure ( self:    Self,
+                   sources: numpy.ndarray,
+                   targets: numpy.ndarray,
+                   lengths: numpy.ndarray
+                 ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+        """
+            Computes the shortest walks between all nodes in the undirected graph of regions.
+            This graph has one vertex per node and a few edges per region, so it is solved by scipy.sparse.csgraph if installed, by a binary heap otherwise.
+            In:
+                * self:    Reference to the current object.
+                * sources: Region at one end of each edge.
+                * targets: Region at the other end of each edge.
+                * lengths: Length of the walk given by each edge.
+            Out:
+                * distances:    Matrix of type int32 of the lengths of the shortest walks (-1 if not reachable).
+                * predecessors: Matrix of type int32 giving the region before each region on these walks (-1 if none).
+        """
+
+        # Compiled searches if available
+        nb_nodes = len(self.nodes)
+        if "scipy" in globals():
+            matrix = scipy.sparse.csr_matrix((lengths.astype(numpy.float64), (sources, targets)), shape=(nb_nodes, nb_nodes))
+            distances, predecessors = scipy.sparse.csgraph.dijkstra(matrix, directed=False, return_predecessors=True)
+            reachable = numpy.isfinite(distances)
+            return numpy.where(reachable, distances, -1).astype(numpy.int32), numpy.where(predecessors >= 0, predecessors, -1).astype(numpy.int32)
+
+        # Adjacency lists of the graph of regions
+        edges = [[] for _ in range(nb_nodes)]
+        for source, target, length in zip(sources.tolist(), targets.tolist(), lengths.tolist()):
+            edges[source].append((target, length))
+            edges[target].append((source, length))
+
+        # Binary heap of (distance, region) pairs from each node
+        distances = numpy.full((nb_nodes, nb_nodes), -1, dtype=numpy.int32)
+        predecessors = numpy.full((nb_nodes, nb_nodes), -1, dtype=numpy.int32)
+        for start in range(nb_nodes):
+            row, parents = {start: 0}, {start: -1}
+            settled = set()
+            min_heap = [(0, start)]
+            while len(min_heap) > 0:
+                distance, region = heapq.heappop(min_heap)
+                if region in settled:
+                    continue
+                settled.add(region)
+                for neighbor, length in edges[region]:
+                    if neighbor not in row or distance + length < row[neighbor]:
+                        row[neighbor] = distance + length
+                        parents[neighbor] = region
+                        heapq.heappush(min_heap, (distance + length, neighbor))
+            distances[start, list(row)] = list(row.values())
+            predecessors[start, list(parents)] = list(parents.values())
+        return distances, predecessors
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,252 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define an on-disk cache of preprocessing results (distance tables, meta-graphs, tours).
+    Batch runners replay the same seeded games many times, and recompute identical results for identical (maze, pieces of cheese, start) inputs.
+    Each entry is a directory named after a hash of these inputs, holding one .npy file per array.
+    Arrays are loaded as read-only memory maps, so that a hit only reads the pages that are actually used.
+    When the directory exceeds its size, the least recently used entries are removed.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import os
+import shutil
+import tempfile
+import hashlib
+import numpy
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, maze_key
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Default maximum size of a cache directory, in bytes
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ArtifactCache ():
+
+    """
+        This class is a directory of arrays, grouped in entries identified by a key (see artifact_key).
+        The following attributes are available:
+            * directory: Path of the cache directory.
+            * max_bytes: Maximum size of all entries, in bytes.
+            * hits:      Number of loads that found their entry.
+            * misses:    Number of loads that did not find their entry.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:      Self,
+                   directory: str,
+                   max_bytes: Integral = DEFAULT_MAX_BYTES
+                 ) ->         Self:
+
+        """
+            This function is the constructor of the class.
+            The directory is created if needed, and may be shared by several processes.
+            In:
+                * self:      Reference to the current object.
+                * directory: Path of the cache directory.
+                * max_bytes: Maximum size of all entries, in bytes.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Create the directory
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def load ( self: Self,
+               key:  str
+             ) ->    Optional[Dict[str, numpy.ndarray]]:
+
+        """
+            Loads the arrays of an entry, as read-only memory maps, and marks the entry as the most recently used.
+            In:
+                * self: Reference to the current object.
+                * key:  Key of the entry.
+            Out:
+                * arrays: None if the entry does not exist, or dictionary associating each name with its array.
+        """
+
+        # Map all files of the entry (it may be removed meanwhile by another process)
+        path = os.path.join(self.directory, key)
+        try:
+            arrays = {file_name[:-4]: numpy.load(os.path.join(path, file_name), mmap_mode="r") for file_name in os.listdir(path) if file_name.endswith(".npy")}
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    #############################################################################################################################################
+
+    def save ( self:   Self,
+               key:    str,
+               arrays: Dict[str, numpy.ndarray]
+             ) ->      None:
+
+        """
+            Saves the arrays of an entry, and removes the least recently used entries if the directory is too large.
+            Files are written in a temporary directory that is then renamed, so that other processes never load a partial entry.
+            In:
+                * self:   Reference to the current object.
+                * key:    Key of the entry.
+                * arrays: Dictionary associating each name with its array.
+            Out:
+                * None.
+        """
+
+        # Write the entry aside, then publish it (if another process published it first, keep that one)
+        temporary = tempfile.mkdtemp(prefix=".", dir=self.directory)
+        try:
+            for name, values in arrays.items():
+                numpy.save(os.path.join(temporary, name + ".npy"), numpy.ascontiguousarray(values))
+            os.rename(temporary, os.path.join(self.directory, key))
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+        # Stay within the size of the directory
+        self._evict()
+
+    #############################################################################################################################################
+
+    @property
+    def nbytes ( self: Self,
+               ) ->    Integral:
+
+        """
+            Size of all entries, in bytes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nbytes: Total size of the files of the entries.
+        """
+
+        # Sum over entries
+        return sum(size for _, _, size in self._entries())
+
+    #############################################################################################################################################
+
+    def clear ( self: Self,
+              ) ->    None:
+
+        """
+            Removes all entries of the directory.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Remove all entries
+        for _, path, _ in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _entries ( self: Self,
+                 ) ->    List[Tuple[float, str, Integral]]:
+
+        """
+            Lists the published entries of the directory.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * entries: List of (time of last use, path, size) triplets.
+        """
+
+        # Temporary directories are hidden
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and not entry.name.startswith("."):
+                try:
+                    size = sum(file.stat().st_size for file in os.scandir(entry.path))
+                    entries.append((entry.stat().st_mtime, entry.path, size))
+                except OSError:
+                    pass
+        return entries
+
+    #############################################################################################################################################
+
+    def _evict ( self: Self,
+               ) ->    None:
+
+        """
+            Removes the least recently used entries until the directory is within its size.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Oldest entries first
+        entries = sorted(self._entries())
+        nbytes = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if nbytes <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            nbytes -= size
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def artifact_key ( name:             str,
+                   graph:            Union[Maze, MazeGraph],
+                   pieces_of_cheese: Iterable[Integral] = (),
+                   source:           Optional[Integral] = None
+                 ) ->                str:
+
+    """
+        Returns the key of an entry from the inputs of the preprocessing that produced it.
+        The order of the pieces of cheese is part of the key, as it determines the order of the nodes of meta-graphs.
+        In:
+            * name:             Name of the kind of entry (e.g., the player that produced it), so that different results for the same inputs do not collide.
+            * graph:            The maze (or graph with corridors contracted) that was preprocessed.
+            * pieces_of_cheese: The pieces of cheese that were preprocessed.
+            * source:           The initial location of the player (None if not used).
+        Out:
+            * key: Hexadecimal digest of the inputs.
+    """
+
+    # Hash of all inputs
+    digest = hashlib.sha1(name.encode())
+    digest.update(maze_key(graph).encode())
+    digest.update(repr(([int(cell) for cell in pieces_of_cheese], source)).encode())
+    return digest.hexdigest()
+
+#####################################################################################################################################################
+#####################################################################################################################################################
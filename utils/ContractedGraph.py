@@ -0,0 +1,158 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a maze in which corridors are contracted.
+    A corridor is a chain of cells with exactly two neighbors, that a search can only cross from one end to the other.
+    Each corridor is replaced by a single edge, whose weight is the length of the corridor, so searches visit much fewer vertices.
+    Routes found in the contracted maze are expanded back to cells only when needed, e.g., before calling locations_to_actions.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import math
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ContractedGraph (MazeGraph):
+
+    """
+        This class extends the MazeGraph class with corridors contracted into single edges.
+        Kept vertices are the cells that do not have exactly two neighbors, and the pinned cells (pieces of cheese, players).
+        Cells inside corridors have no neighbors in the contracted graph, and all searches of the snapshot can run on it unchanged.
+        The following attributes are added:
+            * maze_graph: The snapshot of the full maze.
+            * chains:     Dictionary associating each edge (u, v) with the list of cells crossed between u and v, in order.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:   Self,
+                   graph:  Union[Maze, MazeGraph],
+                   pinned: Iterable[Integral] = ()
+                 ) ->      Self:
+
+        """
+            This function is the constructor of the class.
+            Each corridor is followed once, from a kept vertex to the next one, and stored in both directions.
+            Corridors that come back to their start are dropped, and only the shortest of parallel corridors is kept.
+            In:
+                * self:   Reference to the current object.
+                * graph:  The maze to contract.
+                * pinned: Cells that must stay vertices of the contracted graph (sources and targets of future searches).
+            Out:
+                * A new instance of the class.
+        """
+
+        # Kept vertices, at least one if the maze is a single cycle
+        self.maze_graph = as_maze_graph(graph)
+        edges = self.maze_graph.edges
+        is_kept = bytearray(self.maze_graph.nb_cells)
+        for vertex in self.maze_graph.vertices:
+            if len(edges[vertex]) != 2:
+                is_kept[vertex] = 1
+        for vertex in pinned:
+            is_kept[vertex] = 1
+        if sum(is_kept) == 0 and len(self.maze_graph.vertices) > 0:
+            is_kept[self.maze_graph.vertices[0]] = 1
+
+        # Follow each corridor once, from the first kept vertex that reaches it, and store it in both directions
+        adjacency = {vertex: {} for vertex in self.maze_graph.vertices if is_kept[vertex]}
+        self.chains = {}
+        walked = bytearray(self.maze_graph.nb_cells)
+        for vertex in adjacency:
+            for neighbor, weight in edges[vertex]:
+                if walked[neighbor]:
+                    continue
+                previous, cell, length, chain = vertex, neighbor, weight, []
+                while not is_kept[cell]:
+                    walked[cell] = 1
+                    chain.append(cell)
+                    (cell_1, weight_1), (cell_2, weight_2) = edges[cell]
+                    previous, cell, step = (cell, cell_2, weight_2) if cell_1 == previous else (cell, cell_1, weight_1)
+                    length += step
+                if cell != vertex and length < adjacency[vertex].get(cell, math.inf):
+                    adjacency[vertex][cell] = adjacency[cell][vertex] = length
+                    self.chains[(vertex, cell)] = chain
+                    self.chains[(cell, vertex)] = chain[::-1]
+
+        # Build the snapshot of the contracted graph
+        self._build(adjacency, self.maze_graph.width, self.maze_graph.height)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @property
+    @override
+    def is_unit_weight ( self: Self,
+                       ) ->    bool:
+
+        """
+            This method redefines the property of the parent class.
+            Edges of the contracted graph are not moves on the grid, so searches that rely on the grid (bit-parallel BFS) must not be used.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * unit: Always False.
+        """
+
+        # Grid-specific searches are disabled
+        return False
+
+    #############################################################################################################################################
+
+    def expand_route ( self:  Self,
+                       route: List[Integral]
+                     ) ->     List[Integral]:
+
+        """
+            Expands a route of the contracted graph into the corresponding route of cells of the maze.
+            Consecutive cells that are not the ends of an edge of the contracted graph are left as they are (e.g., excursions in pruned pockets).
+            In:
+                * self:  Reference to the current object.
+                * route: Route in the contracted graph, as a list of kept vertices.
+            Out:
+                * cells: Route in the maze, with the cells of all crossed corridors.
+        """
+
+        # Insert the cells of each corridor between its ends
+        cells = route[:1]
+        for vertex, next_vertex in zip(route, route[1:]):
+            cells.extend(self.chains.get((vertex, next_vertex), ()))
+            cells.append(next_vertex)
+        return cells
+
+    #############################################################################################################################################
+
+    def reduction_ratio ( self: Self,
+                        ) ->    float:
+
+        """
+            Returns the fraction of vertices of the maze that remain in the contracted graph.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * ratio: Number of kept vertices divided by the number of vertices of the maze.
+        """
+
+        # Compare the numbers of vertices
+        return self.nb_vertices / max(1, self.maze_graph.nb_vertices)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
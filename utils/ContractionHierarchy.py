@@ -0,0 +1,385 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a contraction hierarchy of a maze.
+    Vertices are contracted one by one, from the least important to the most important one.
+    When a vertex is contracted, shortcuts are added between its neighbors if it is on their only shortest path, so that distances are preserved.
+    Then, any shortest path goes up the hierarchy and then down, and a query only needs two tiny searches on edges going up, one from each end.
+    The hierarchy is costly to build, but does not depend on the players or pieces of cheese, so it is built once per maze and reused across games.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import heapq
+import math
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph, maze_key
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Maximum number of vertices settled by a witness search, beyond which a shortcut is added anyway (this never makes distances wrong)
+WITNESS_MAX_SETTLED = 64
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ContractionHierarchy ():
+
+    """
+        This class stores a contraction hierarchy of a maze, and answers exact shortest-path queries with it.
+        Vertices are ordered by edge difference (shortcuts added minus edges removed) plus number of contracted neighbors, with lazy updates.
+        The following attributes are available:
+            * maze_graph:     The snapshot of the maze.
+            * rank:           List giving the position of each cell in the contraction order (-1 for cells not in the maze).
+            * upward_edges:   List giving for each cell the (neighbor, weight) pairs of its edges toward more important vertices, shortcuts included.
+            * middles:        Dictionary associating each shortcut (u, v) with the contracted vertex it skips.
+            * unpacked_edges: Dictionary associating edges (u, v) already unpacked with the cells after u until v, filled by unpack.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:  Self,
+                   graph: Union[Maze, MazeGraph]
+                 ) ->     Self:
+
+        """
+            This function is the constructor of the class.
+            It contracts all vertices of the maze.
+            In:
+                * self:  Reference to the current object.
+                * graph: The maze to preprocess.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Remaining graph, in which contracted vertices are removed and shortcuts are added
+        self.maze_graph = as_maze_graph(graph)
+        self.remaining = [dict() for _ in range(self.maze_graph.nb_cells)]
+        for vertex in self.maze_graph.vertices:
+            self.remaining[vertex] = dict(self.maze_graph.adjacency[vertex])
+        self.rank = [-1] * self.maze_graph.nb_cells
+        self.upward_edges = [[] for _ in range(self.maze_graph.nb_cells)]
+        self.middles = {}
+        self.unpacked_edges = {}
+        nb_contracted_neighbors = [0] * self.maze_graph.nb_cells
+
+        # Priority of a vertex given the shortcuts its contraction would need
+        def priority (vertex):
+            return len(self._shortcuts(vertex)) - len(self.remaining[vertex]) + nb_contracted_neighbors[vertex]
+
+        # Contract vertices by increasing priority, updating the priority of the vertex at the top of the heap until it stays the smallest
+        min_heap = [(priority(vertex), vertex) for vertex in self.maze_graph.vertices]
+        heapq.heapify(min_heap)
+        while len(min_heap) > 0:
+            _, vertex = heapq.heappop(min_heap)
+            new_priority = priority(vertex)
+            if len(min_heap) > 0 and new_priority > min_heap[0][0]:
+                heapq.heappush(min_heap, (new_priority, vertex))
+                continue
+
+            # Remaining neighbors are more important, so edges toward them go up
+            self.rank[vertex] = self.maze_graph.nb_vertices - len(min_heap) - 1
+            self.upward_edges[vertex] = list(self.remaining[vertex].items())
+
+            # Add the shortcuts and remove the vertex
+            for neighbor_1, neighbor_2, weight in self._shortcuts(vertex):
+                self.remaining[neighbor_1][neighbor_2] = self.remaining[neighbor_2][neighbor_1] = weight
+                self.middles[(neighbor_1, neighbor_2)] = self.middles[(neighbor_2, neighbor_1)] = vertex
+            for neighbor in self.remaining[vertex]:
+                del self.remaining[neighbor][vertex]
+                nb_contracted_neighbors[neighbor] += 1
+            self.remaining[vertex] = {}
+
+        # The remaining graph is not needed anymore
+        del self.remaining
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def _shortcuts ( self:   Self,
+                     vertex: Integral
+                   ) ->      List[Tuple[Integral, Integral, Integral]]:
+
+        """
+            Lists the shortcuts needed to contract a vertex of the remaining graph.
+            A shortcut between two neighbors is needed if no path avoiding the vertex is as short as going through it.
+            Witness searches are limited, so a few shortcuts may be useless, but none is missing.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The vertex to contract.
+            Out:
+                * shortcuts: List of (neighbor_1, neighbor_2, weight) triplets, with neighbor_1 < neighbor_2.
+        """
+
+        # One witness search from each neighbor, toward the following ones
+        neighbors = sorted(self.remaining[vertex].items())
+        shortcuts = []
+        for index, (source, source_weight) in enumerate(neighbors[:-1]):
+            targets = {target: source_weight + target_weight for target, target_weight in neighbors[index + 1:]}
+            max_distance = max(targets.values())
+
+            # Dijkstra avoiding the vertex, stopped after a few settled vertices or when paths become too long
+            distances = {source: 0}
+            min_heap = [(0, source)]
+            settled = set()
+            while len(min_heap) > 0 and len(settled) < WITNESS_MAX_SETTLED:
+                distance, current = heapq.heappop(min_heap)
+                if current in settled:
+                    continue
+                if distance > max_distance:
+                    break
+                settled.add(current)
+                for neighbor, weight in self.remaining[current].items():
+                    new_distance = distance + weight
+                    if neighbor != vertex and new_distance < distances.get(neighbor, math.inf):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(min_heap, (new_distance, neighbor))
+
+            # Shortcuts for targets without a witness path
+            for target, via_distance in targets.items():
+                if distances.get(target, math.inf) > via_distance:
+                    shortcuts.append((source, target, via_distance))
+        return shortcuts
+
+    #############################################################################################################################################
+
+    def upward_search ( self:   Self,
+                        source: Integral
+                      ) ->      Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
+
+        """
+            Performs a Dijkstra search from a cell, following only edges that go up the hierarchy.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+            Out:
+                * distances:     The distances from the source to each vertex of its search space (upper bounds of true distances).
+                * routing_table: The parent of each vertex in the search.
+        """
+
+        # Standard Dijkstra on the upward edges
+        distances = {source: 0}
+        routing_table = {source: None}
+        min_heap = [(0, source)]
+        upward_edges = self.upward_edges
+        while len(min_heap) > 0:
+            distance, vertex = heapq.heappop(min_heap)
+            if distance > distances[vertex]:
+                continue
+            for neighbor, weight in upward_edges[vertex]:
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = new_distance
+                    routing_table[neighbor] = vertex
+                    heapq.heappush(min_heap, (new_distance, neighbor))
+        return distances, routing_table
+
+    #############################################################################################################################################
+
+    def unpack ( self:  Self,
+                 route: List[Integral]
+               ) ->     List[Integral]:
+
+        """
+            Replaces the shortcuts of a route with the cells they skip, recursively.
+            The cells of each unpacked edge are kept, as routes between many pairs of cells share the same edges near the top of the hierarchy.
+            In:
+                * self:  Reference to the current object.
+                * route: Route in the hierarchy, with shortcuts.
+            Out:
+                * cells: Route in the maze.
+        """
+
+        # Concatenate the cells of all edges, unpacking them the first time they are seen
+        cells = route[:1]
+        for vertex, next_vertex in zip(route, route[1:]):
+            edge_cells = self.unpacked_edges.get((vertex, next_vertex))
+            if edge_cells is None:
+                edge_cells = []
+                stack = [(vertex, next_vertex)]
+                while len(stack) > 0:
+                    edge = stack.pop()
+                    middle = self.middles.get(edge)
+                    if middle is None:
+                        edge_cells.append(edge[1])
+                    else:
+                        stack.append((middle, edge[1]))
+                        stack.append((edge[0], middle))
+                self.unpacked_edges[(vertex, next_vertex)] = edge_cells
+            cells.extend(edge_cells)
+        return cells
+
+    #############################################################################################################################################
+
+    def _join ( self:         Self,
+                meeting:      Integral,
+                source_table: Dict[Integral, Optional[Integral]],
+                target_table: Dict[Integral, Optional[Integral]]
+              ) ->            List[Integral]:
+
+        """
+            Builds the route in the maze from the routing tables of both upward searches, through the vertex where they meet.
+            In:
+                * self:         Reference to the current object.
+                * meeting:      Most important vertex of the shortest path.
+                * source_table: Routing table of the upward search from the source.
+                * target_table: Routing table of the upward search from the target.
+            Out:
+                * route: The route from the source to the target.
+        """
+
+        # Up from the source, then down to the target
+        route = []
+        vertex = meeting
+        while vertex is not None:
+            route.append(vertex)
+            vertex = source_table[vertex]
+        route.reverse()
+        vertex = target_table[meeting]
+        while vertex is not None:
+            route.append(vertex)
+            vertex = target_table[vertex]
+        return self.unpack(route)
+
+    #############################################################################################################################################
+
+    def query ( self:   Self,
+                source: Integral,
+                target: Integral
+              ) ->      Tuple[Number, List[Integral]]:
+
+        """
+            Finds a shortest path between two cells.
+            The most important vertex of the path is in the search spaces of both ends, where its distances are exact.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+                * target: The target cell.
+            Out:
+                * distance: The length of the shortest path (infinity if there is none).
+                * route:    The route from the source to the target (empty if there is none).
+        """
+
+        # Meet in the middle
+        source_distances, source_table = self.upward_search(source)
+        target_distances, target_table = self.upward_search(target)
+        best_distance, meeting = math.inf, None
+        for vertex, distance in source_distances.items():
+            if vertex in target_distances and distance + target_distances[vertex] < best_distance:
+                best_distance, meeting = distance + target_distances[vertex], vertex
+        if meeting is None:
+            return math.inf, []
+        return best_distance, self._join(meeting, source_table, target_table)
+
+    #############################################################################################################################################
+
+    def distance ( self:   Self,
+                   source: Integral,
+                   target: Integral
+                 ) ->      Number:
+
+        """
+            Returns the length of a shortest path between two cells.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+                * target: The target cell.
+            Out:
+                * distance: The length of the shortest path (infinity if there is none).
+        """
+
+        # Query without building the route
+        source_distances, _ = self.upward_search(source)
+        target_distances, _ = self.upward_search(target)
+        return min((distance + target_distances[vertex] for vertex, distance in source_distances.items() if vertex in target_distances), default=math.inf)
+
+    #############################################################################################################################################
+
+    def meta_graph ( self:  Self,
+                     cells: List[Integral]
+                   ) ->     Dict[Integral, Dict[Integral, Tuple[Integral, List[Integral]]]]:
+
+        """
+            Builds the complete graph of shortest paths between some cells, in the format of the meta-graphs of players.
+            One upward search is done per cell, and their search spaces are matched through buckets stored at each vertex.
+            In:
+                * self:  Reference to the current object.
+                * cells: The vertices of the meta-graph.
+            Out:
+                * complete_graph: Dictionary associating each pair of reachable cells with the distance and route between them.
+        """
+
+        # Search spaces of all cells, and buckets of (cell, distance) pairs at each vertex reached
+        cells = list(dict.fromkeys(cells))
+        searches = {cell: self.upward_search(cell) for cell in cells}
+        buckets = {}
+        for cell in cells:
+            for vertex, distance in searches[cell][0].items():
+                buckets.setdefault(vertex, []).append((cell, distance))
+
+        # Best meeting vertex for each pair, scanning buckets from the search space of each cell
+        complete_graph = {cell: {} for cell in cells}
+        for index, source in enumerate(cells):
+            best = {}
+            for vertex, distance in searches[source][0].items():
+                for target, target_distance in buckets[vertex]:
+                    if distance + target_distance < best.get(target, (math.inf,))[0]:
+                        best[target] = (distance + target_distance, vertex)
+
+            # Routes are built once per pair, and reversed for the other direction
+            for target in cells[index + 1:]:
+                if target in best:
+                    distance, meeting = best[target]
+                    route = self._join(meeting, searches[source][1], searches[target][1])
+                    complete_graph[source][target] = (distance, route)
+                    complete_graph[target][source] = (distance, route[::-1])
+        return complete_graph
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+# Hierarchies already built in this process, by maze
+_HIERARCHIES = {}
+
+#####################################################################################################################################################
+
+def contraction_hierarchy ( graph: Union[Maze, MazeGraph]
+                          ) ->     ContractionHierarchy:
+
+    """
+        Returns the contraction hierarchy of a maze, built only the first time the maze is seen in the process.
+        Games generated with the same maze seed have the same maze, so they share the hierarchy.
+        In:
+            * graph: The maze to preprocess.
+        Out:
+            * hierarchy: Its contraction hierarchy.
+    """
+
+    # Build if needed
+    key = maze_key(graph)
+    if key not in _HIERARCHIES:
+        _HIERARCHIES[key] = ContractionHierarchy(graph)
+    return _HIERARCHIES[key]
+
+#####################################################################################################################################################
+#####################################################################################################################################################
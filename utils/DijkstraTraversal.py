@@ -19,18 +19,22 @@ from numbers import *
 import heapq
 
 # PyRat imports
+from pyrat import Graph
 from Traversal import Traversal
+from MazeGraph import as_maze_graph
 
 #####################################################################################################################################################
 ###################################################################### CLASSES ######################################################################
 #####################################################################################################################################################
 
-class DFSTraversal (Traversal):
+class DijkstraTraversal (Traversal):
 
     """
-        This class extends the Traversal class to perform a depth-first traversal.
-        It explores the maze by going as far as possible along a path before backtracking.
-        It has no guarantee to find the shortest path to the cheese.
+        This class extends the Traversal class to perform a weighted traversal (Dijkstra's algorithm).
+        Elements stored in the structure are pairs (distance, vertex), and the structure is a priority queue on distances.
+        Here, the priority queue is a binary heap.
+        Other priority queues can be used by child classes that redefine the initialize_structure, add_to_structure, and get_from_structure methods.
+        It is guaranteed to find the shortest path to the cheese if it exists, taking mud into account.
     """
 
     #############################################################################################################################################
@@ -55,14 +59,70 @@ class DFSTraversal (Traversal):
         # Inherit from parent class
         super().__init__(*args, **kwargs)
 
+        # Largest weight of the graph, set at each traversal for the structures that need it
+        self.max_weight = 1
+
     #############################################################################################################################################
     #                                                                  METHODS                                                                  #
     #############################################################################################################################################
 
+    @override
+    def traversal ( self:    Self,
+                    graph:   Graph,
+                    source:  Integral,
+                    targets: Optional[Iterable[Integral]] = None
+                  ) ->       None:
+
+        """
+            This method redefines the method of the parent class to take weights into account.
+            Elements stored in the structure are pairs (distance, vertex), and outdated elements (vertices already visited) are skipped.
+            It stops when all the targets are visited, or when all vertices are visited if no targets are given.
+            In:
+                * self:    Reference to the current object.
+                * graph:   The graph to traverse (a maze or a MazeGraph snapshot).
+                * source:  The source vertex of the traversal.
+                * targets: The vertices to reach (all vertices if None).
+            Out:
+                * None.
+        """
+
+        # Initialization
+        maze_graph = as_maze_graph(graph)
+        self.max_weight = maze_graph.max_weight
+        self.source = source
+        self.routing_table = {source: None}
+        self.distances = {source: 0}
+        remaining = set(targets) if targets is not None else None
+        visited = set()
+
+        # The number of stored elements is counted here, so that structures do not need to provide it
+        queue = self.initialize_structure()
+        queue = self.add_to_structure(queue, (0, source))
+        nb_pending = 1
+
+        # Explore vertices by increasing distance
+        while nb_pending > 0 and (remaining is None or len(remaining) > 0):
+            (distance, vertex), queue = self.get_from_structure(queue)
+            nb_pending -= 1
+            if vertex in visited:
+                continue
+            visited.add(vertex)
+            if remaining is not None:
+                remaining.discard(vertex)
+            for neighbor, weight in maze_graph.edges[vertex]:
+                new_distance = distance + weight
+                if neighbor not in self.distances or new_distance < self.distances[neighbor]:
+                    self.distances[neighbor] = new_distance
+                    self.routing_table[neighbor] = vertex
+                    queue = self.add_to_structure(queue, (new_distance, neighbor))
+                    nb_pending += 1
+
+    #############################################################################################################################################
+
     @override
     def initialize_structure ( self: Self,
                              ) ->    Any:
-    
+
         """
             This method redefines the abstract method of the parent class.
             It initializes the data structure needed for the traversal.
@@ -72,10 +132,10 @@ class DFSTraversal (Traversal):
                 * structure: Initialized data structure.
         """
 
-        # Here, we work with a list
+        # Here, we work with a list managed as a binary heap
         structure = []
         return structure
-    
+
     #############################################################################################################################################
 
     @override
@@ -83,20 +143,20 @@ class DFSTraversal (Traversal):
                            structure: Any,
                            element:   Any
                          ) ->         Any:
-    
+
         """
             This method redefines the abstract method of the parent class.
             It adds an element to the data structure.
             In:
                 * self:      Reference to the current object.
                 * structure: Data structure to update.
-                * element:   Element to add.
+                * element:   Element to add, as a pair (distance, vertex).
             Out:
                 * structure: Updated data structure.
         """
 
-        # We append the element to the end of the list
-        heapq.heappush(structure, (element))
+        # We push the element in the heap
+        heapq.heappush(structure, element)
 
         # The structure was updated in place
         return structure
@@ -107,7 +167,7 @@ class DFSTraversal (Traversal):
     def get_from_structure ( self:      Self,
                              structure: Any,
                            ) ->         Tuple[Any, Any]:
-    
+
         """
             This method redefines the abstract method of the parent class.
             It gets an element from the data structure.
@@ -115,15 +175,15 @@ class DFSTraversal (Traversal):
                 * self:      Reference to the current object.
                 * structure: Data structure to update.
             Out:
-                * element:   Element to get.
+                * element:   Element to get, with the smallest distance.
                 * structure: Updated data structure.
         """
 
-        # Extract the element from the end of the list
+        # Extract the element with the smallest distance
         element = heapq.heappop(structure)
 
         # The structure was updated in place
         return element, structure
 
 #####################################################################################################################################################
-#####################################################################################################################################################
\ No newline at end of file
+#####################################################################################################################################################
@@ -0,0 +1,250 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a table of all shortest paths of a maze.
+    The table is built once (typically in preprocessing), and then answers distance and next-step queries in O(1), without any search.
+    It is meant for small mazes, as its size grows with the square of the number of cells.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import numpy
+
+# Scipy is an optional dependency
+try:
+    import scipy.sparse.csgraph
+except ImportError:
+    pass
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+from shortest_paths import multi_target_dijkstra, sparse_matrix
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Default maximum number of vertices for which players build a table
+# Without scipy, the table of a 300-vertex maze takes about 0.2s and 0.6MB, and the table of a 1000-vertex maze about 2s and 4MB
+APSP_MAX_VERTICES = 300
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class DistanceTable ():
+
+    """
+        This class stores the shortest paths between all pairs of cells of a maze.
+        The following arrays of shape (nb_cells, nb_cells) are available (of type int16 when values fit, int32 otherwise):
+            * distances: distances[source, target] is the length of a shortest path (-1 if not reachable).
+            * next_hops: next_hops[source, target] is the cell after source on a shortest path to target (-1 if source == target or not reachable).
+        As mazes are undirected, the next hops toward a target are the predecessors of a search from that target.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:  Self,
+                   graph: Union[Maze, MazeGraph]
+                 ) ->     Self:
+
+        """
+            This function is the constructor of the class.
+            All searches are done in a single call to scipy.sparse.csgraph if scipy is installed, or with one multi_target_dijkstra per vertex otherwise.
+            In:
+                * self:  Reference to the current object.
+                * graph: The maze to analyze.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Smallest types that can hold the values
+        maze_graph = as_maze_graph(graph)
+        nb_cells = maze_graph.nb_cells
+        distance_type = numpy.int16 if maze_graph.nb_vertices * maze_graph.max_weight < 2**15 else numpy.int32
+        hop_type = numpy.int16 if nb_cells < 2**15 else numpy.int32
+
+        # All searches in compiled code
+        if "scipy" in globals():
+            distances, predecessors = scipy.sparse.csgraph.dijkstra(sparse_matrix(maze_graph), return_predecessors=True)
+            self.distances = numpy.where(numpy.isfinite(distances), distances, -1).astype(distance_type)
+            self.next_hops = numpy.where(predecessors >= 0, predecessors, -1).T.astype(hop_type)
+
+            # Cells that are not in the maze are not reachable, even from themselves
+            holes = numpy.setdiff1d(numpy.arange(nb_cells), maze_graph.vertices)
+            self.distances[holes, holes] = -1
+
+        # One search per vertex otherwise, filling a column of next hops each time
+        else:
+            self.distances = numpy.full((nb_cells, nb_cells), -1, dtype=distance_type)
+            self.next_hops = numpy.full((nb_cells, nb_cells), -1, dtype=hop_type)
+            for target in maze_graph.vertices:
+                target_distances, predecessors = multi_target_dijkstra(maze_graph, target, maze_graph.vertices)
+                reached = list(target_distances)
+                self.distances[target, reached] = list(target_distances.values())
+                self.next_hops[:, target] = numpy.frombuffer(predecessors, dtype=numpy.int32)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @classmethod
+    def from_arrays ( cls:    Type[Self],
+                      arrays: Dict[str, numpy.ndarray]
+                    ) ->      Self:
+
+        """
+            Builds a table from the arrays returned by to_arrays, without any search.
+            Arrays are used as they are, so that memory-mapped arrays are only read where queried.
+            In:
+                * cls:    The class.
+                * arrays: Dictionary of arrays, as returned by to_arrays.
+            Out:
+                * distance_table: The corresponding table.
+        """
+
+        # Bypass the constructor
+        distance_table = cls.__new__(cls)
+        distance_table.distances = arrays["distances"]
+        distance_table.next_hops = arrays["next_hops"]
+        return distance_table
+
+    #############################################################################################################################################
+
+    def to_arrays ( self: Self,
+                  ) ->    Dict[str, numpy.ndarray]:
+
+        """
+            Converts the table into arrays, e.g., to save it with numpy.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * arrays: Dictionary with the distances and next hops arrays.
+        """
+
+        # Both arrays as they are
+        return {"distances": self.distances, "next_hops": self.next_hops}
+
+    #############################################################################################################################################
+
+    @property
+    def nbytes ( self: Self,
+               ) ->    Integral:
+
+        """
+            Memory used by the arrays of the table, in bytes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nbytes: Size of the distances and next hops arrays.
+        """
+
+        # Sum of both arrays
+        return self.distances.nbytes + self.next_hops.nbytes
+
+    #############################################################################################################################################
+
+    def distance ( self:   Self,
+                   source: Integral,
+                   target: Integral
+                 ) ->      Integral:
+
+        """
+            Returns the length of a shortest path between two cells.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+                * target: The target cell.
+            Out:
+                * distance: The distance from source to target (-1 if not reachable).
+        """
+
+        # Lookup
+        return int(self.distances[source, target])
+
+    #############################################################################################################################################
+
+    def next_step ( self:   Self,
+                    source: Integral,
+                    target: Integral
+                  ) ->      Integral:
+
+        """
+            Returns the cell to go to from source, to follow a shortest path to target.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+                * target: The target cell.
+            Out:
+                * cell: The next cell on the path (-1 if source == target or not reachable).
+        """
+
+        # Lookup
+        return int(self.next_hops[source, target])
+
+    #############################################################################################################################################
+
+    def route ( self:   Self,
+                source: Integral,
+                target: Integral
+              ) ->      List[Integral]:
+
+        """
+            Returns a shortest path between two cells, following the next hops.
+            In:
+                * self:   Reference to the current object.
+                * source: The source cell.
+                * target: The target cell, that must be reachable from the source.
+            Out:
+                * route: The route from source to target.
+        """
+
+        # All next hops toward the target are in the same column
+        next_hops = self.next_hops[:, target]
+        route = [source]
+        while route[-1] != target:
+            route.append(int(next_hops[route[-1]]))
+        return route
+
+    #############################################################################################################################################
+
+    def nearest ( self:    Self,
+                  source:  Integral,
+                  targets: List[Integral]
+                ) ->       Tuple[Integral, Integral]:
+
+        """
+            Returns the reachable target that is the closest to the source.
+            In:
+                * self:    Reference to the current object.
+                * source:  The source cell.
+                * targets: The candidate cells.
+            Out:
+                * target:   The closest target (None if no target is reachable).
+                * distance: The distance to this target.
+        """
+
+        # Smallest non-negative distance in the row of the source
+        row = self.distances[source, targets].astype(numpy.int64)
+        row[row < 0] = numpy.iinfo(numpy.int64).max
+        if len(targets) == 0 or row.min() == numpy.iinfo(numpy.int64).max:
+            return None, -1
+        index = int(numpy.argmin(row))
+        return targets[index], int(row[index])
+
+#####################################################################################################################################################
+#####################################################################################################################################################
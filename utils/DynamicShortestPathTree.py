@@ -0,0 +1,208 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a tree of shortest paths from a player, kept across turns while the player moves.
+    Reactive players used to search from their location each time they replan, although they have only moved a few cells since the previous search.
+    Let r be the root of the last search, s the current location of the player, and d the distances from r (undirected maze):
+        * For a cell v in the subtree of s, the path r -> s -> v of the tree is shortest, so its distance from s is exactly d(v) - d(s).
+        * For any other cell v, the triangle inequality gives a distance from s of at least d(v) - d(s).
+    Thus, the exact distance of a cell in the subtree of s is equal to its lower bound, and the target with the smallest bound is the best one as soon as it is in this subtree.
+    A new search (from s, which becomes the root) is only needed when the bounds cannot prove which target is the best.
+    Removing targets (eaten pieces of cheese) does not invalidate anything, as distances to the remaining ones are unchanged.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import math
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+from shortest_paths import ShortestPathEngine, multi_target_dijkstra
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class DynamicShortestPathTree ():
+
+    """
+        This class keeps the tree of the last multi-target search from a player, and re-roots it at the current location of the player.
+        The following attributes are available:
+            * root:           The source of the last search.
+            * source:         The current location of the player.
+            * shift:          Length of the path of the tree from root to source (None if source was not reached by the last search).
+            * root_distances: Dictionary associating each target of the last search with its distance from root.
+            * predecessors:   Array of predecessors of the last search, see predecessors_to_route.
+            * nb_searches:    Number of searches done since the creation of the tree.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:    Self,
+                   graph:   Union[Maze, MazeGraph],
+                   source:  Integral,
+                   targets: List[Integral],
+                   engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+                 ) ->       Self:
+
+        """
+            This function is the constructor of the class.
+            A first search is done from the source until all targets are settled.
+            In:
+                * self:    Reference to the current object.
+                * graph:   The maze in which to search.
+                * source:  The initial location of the player.
+                * targets: The cells to reach (e.g., pieces of cheese).
+                * engine:  Shortest-path engine used by the searches.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # First search
+        self.maze_graph = as_maze_graph(graph)
+        self.engine = engine
+        self.nb_searches = 0
+        self.source = source
+        self._search(targets)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def move_to ( self:   Self,
+                  source: Integral
+                ) ->      None:
+
+        """
+            Re-roots the tree at a new location of the player, without any search.
+            Only the length of the path of the tree from the root to the new location is computed.
+            In:
+                * self:   Reference to the current object.
+                * source: The new location of the player.
+            Out:
+                * None.
+        """
+
+        # Walk up the tree (for a cell that was reached but not settled, this gives an upper bound, which keeps all lower bounds valid)
+        self.source = source
+        self.shift, vertex = 0, source
+        while vertex != self.root:
+            parent = self.predecessors[vertex]
+            if parent < 0:
+                self.shift = None
+                return
+            self.shift += self.maze_graph.get_weight(parent, vertex)
+            vertex = parent
+
+    #############################################################################################################################################
+
+    def nearest ( self:     Self,
+                  targets:  List[Integral],
+                  divisors: Optional[List[Number]] = None
+                ) ->        Tuple[Integral, Integral]:
+
+        """
+            Returns the best target from the current location, i.e., the one minimizing its distance divided by its divisor.
+            Ties are broken by order in the list of targets, as a loop keeping the first strict minimum would do.
+            In:
+                * self:     Reference to the current object.
+                * targets:  The remaining targets, that must have been targets of the tree (other ones cause a new search).
+                * divisors: Positive value associated with each target (all 1 if None, to get the nearest target).
+            Out:
+                * target:   The best target.
+                * distance: Its distance from the current location.
+        """
+
+        # The target with the smallest lower bound is the best one if it is in the subtree of the current location
+        if divisors is None:
+            divisors = [1] * len(targets)
+        if self.shift is not None and all(target in self.root_distances for target in targets):
+            _, index = min(((self.root_distances[target] - self.shift) / divisor, index) for index, (target, divisor) in enumerate(zip(targets, divisors)))
+            if self._contains(targets[index]):
+                return targets[index], self.root_distances[targets[index]] - self.shift
+
+        # Otherwise, search again from the current location, so that all distances are exact
+        self._search(targets)
+        _, index = min((self.root_distances.get(target, math.inf) / divisor, index) for index, (target, divisor) in enumerate(zip(targets, divisors)))
+        return targets[index], self.root_distances.get(targets[index], math.inf)
+
+    #############################################################################################################################################
+
+    def route ( self:   Self,
+                target: Integral
+              ) ->      List[Integral]:
+
+        """
+            Returns the route of the tree from the current location to a target in its subtree (e.g., returned by nearest).
+            In:
+                * self:   Reference to the current object.
+                * target: The target to reach.
+            Out:
+                * route: The route from the current location to the target.
+        """
+
+        # Walk up the tree from the target
+        route = [target]
+        while route[-1] != self.source:
+            route.append(self.predecessors[route[-1]])
+        return route[::-1]
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _search ( self:    Self,
+                  targets: List[Integral]
+                ) ->       None:
+
+        """
+            Searches from the current location until all targets are settled, and makes it the root of the tree.
+            In:
+                * self:    Reference to the current object.
+                * targets: The cells to reach.
+            Out:
+                * None.
+        """
+
+        # New tree
+        self.root = self.source
+        self.shift = 0
+        self.root_distances, self.predecessors = multi_target_dijkstra(self.maze_graph, self.source, targets, self.engine)
+        self.nb_searches += 1
+
+    #############################################################################################################################################
+
+    def _contains ( self:   Self,
+                    vertex: Integral
+                  ) ->      bool:
+
+        """
+            Checks if a settled cell is in the subtree of the current location, i.e., if the current location is on its path from the root.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The cell to check.
+            Out:
+                * contained: True if the path of the tree from the root to the cell goes through the current location.
+        """
+
+        # Walk up the tree until the current location or the root
+        while vertex != self.source and vertex != self.root:
+            vertex = self.predecessors[vertex]
+        return vertex == self.source
+
+#####################################################################################################################################################
+#####################################################################################################################################################
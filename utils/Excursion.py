@@ -0,0 +1,115 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define an excursion in a maze.
+    An excursion collects all pieces of cheese of a tree-like pocket of the maze, entering and leaving it through the same cell.
+    Excursions can replace these pieces of cheese in a meta-graph, so that TSP solvers work on fewer nodes.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class Excursion ():
+
+    """
+        This class defines an excursion, used as a node of a meta-graph.
+        Excursions are compared by identity, so that two excursions never collide with each other or with a cell in a meta-graph.
+        The excursion is split at its last piece of cheese, which is the farthest one from the root:
+            * The entry goes from the root to the last piece of cheese, collecting all the others on the way.
+            * The exit goes back from the last piece of cheese to the root, and is not needed if the excursion is the last one.
+        The following attributes are available:
+            * root:             Cell through which the pocket is entered and left.
+            * end:              Cell of the last piece of cheese.
+            * pieces_of_cheese: Pieces of cheese collected by the excursion.
+            * entry_route:      Cells of the entry, from the root to the end.
+            * exit_route:       Cells of the exit, from the end to the root.
+            * entry_cost:       Length of the entry.
+            * exit_cost:        Length of the exit.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:             Self,
+                   pieces_of_cheese: List[Integral],
+                   entry_route:      List[Integral],
+                   exit_route:       List[Integral],
+                   entry_cost:       Integral,
+                   exit_cost:        Integral
+                 ) ->                Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:             Reference to the current object.
+                * pieces_of_cheese: Pieces of cheese collected by the excursion.
+                * entry_route:      Cells of the entry, from the root to the last piece of cheese.
+                * exit_route:       Cells of the exit, from the last piece of cheese to the root.
+                * entry_cost:       Length of the entry.
+                * exit_cost:        Length of the exit.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Store the attributes
+        self.root = entry_route[0]
+        self.end = entry_route[-1]
+        self.pieces_of_cheese = pieces_of_cheese
+        self.entry_route = entry_route
+        self.exit_route = exit_route
+        self.entry_cost = entry_cost
+        self.exit_cost = exit_cost
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @property
+    def cost ( self: Self,
+             ) ->    Integral:
+
+        """
+            Length of the whole excursion, from the root back to the root.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * cost: Sum of the lengths of the entry and of the exit.
+        """
+
+        # Both parts
+        return self.entry_cost + self.exit_cost
+
+    #############################################################################################################################################
+
+    def __repr__ ( self: Self,
+                 ) ->    str:
+
+        """
+            Returns a readable description of the excursion, e.g., when printing a meta-graph.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * description: The root, number of pieces of cheese and cost of the excursion.
+        """
+
+        # Short description
+        return "Excursion(root=%d, %d pieces of cheese, cost=%d)" % (self.root, len(self.pieces_of_cheese), self.cost)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
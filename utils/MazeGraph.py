@@ -0,0 +1,406 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a compact snapshot of a maze.
+    The snapshot is built once per maze (typically in preprocessing) and stores the graph in CSR form (indptr, indices, weights).
+    It exposes the same get_neighbors and get_weight methods as a maze, so that any traversal can run on it instead of the maze.
+    These methods are simple lookups, without the checks performed by the PyRat Maze class at each call.
+    The action along each edge is also precomputed, so that routes are converted into actions lazily, one lookup per step.
+    The arrays are also hashed by maze_key, so that caches recognize the same maze across games.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import hashlib
+import numpy
+
+# PyRat imports
+from pyrat import Maze, Action
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class MazeGraph ():
+
+    """
+        This class is a read-only snapshot of a maze.
+        Cells are indexed as in the maze, from 0 to width * height - 1, and cells that are not in the maze have no neighbors.
+        The following arrays are available (all of type int32):
+            * indptr:      Neighbors of cell i are indices[indptr[i]:indptr[i+1]].
+            * indices:     Concatenated neighbors of all cells.
+            * weights:     Weights of the corresponding edges in indices.
+            * coordinates: Array of shape (nb_cells, 2) giving the (row, col) of each cell.
+        Python lists mirroring these arrays are also kept, as they are faster to iterate in pure Python loops.
+        The list edge_actions gives for each cell a dictionary associating the cell itself and its adjacent neighbors with the action leading to them.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self: Self,
+                   maze: Maze,
+                 ) ->    Self:
+
+        """
+            This function is the constructor of the class.
+            It reads the maze once through Maze.as_dict and builds all the arrays.
+            In:
+                * self: Reference to the current object.
+                * maze: The maze to take a snapshot of.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Build from the adjacency dictionary of the maze
+        self._build(maze.as_dict(), maze.width, maze.height)
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @classmethod
+    def from_dict ( cls:       Type[Self],
+                    adjacency: Dict[Integral, Dict[Integral, Integral]],
+                    width:     Integral,
+                    height:    Integral
+                  ) ->         Self:
+
+        """
+            Builds a snapshot directly from an adjacency dictionary, as returned by Maze.as_dict.
+            This avoids creating a PyRat maze, which is slow for large sizes (e.g., in benchmarks).
+            In:
+                * cls:       The class.
+                * adjacency: Dictionary associating each cell with a dictionary of its neighbors and weights.
+                * width:     Width of the maze.
+                * height:    Height of the maze.
+            Out:
+                * maze_graph: The corresponding snapshot.
+        """
+
+        # Bypass the constructor
+        maze_graph = cls.__new__(cls)
+        maze_graph._build(adjacency, width, height)
+        return maze_graph
+
+    #############################################################################################################################################
+
+    @classmethod
+    def from_csr ( cls:     Type[Self],
+                   indptr:  numpy.ndarray,
+                   indices: numpy.ndarray,
+                   weights: numpy.ndarray,
+                   width:   Integral,
+                   height:  Integral
+                 ) ->       Self:
+
+        """
+            Builds a snapshot from the CSR arrays of another snapshot, e.g., received through shared memory by another process.
+            Cells without neighbors are not vertices of the result.
+            In:
+                * cls:     The class.
+                * indptr:  Neighbors of cell i are indices[indptr[i]:indptr[i+1]].
+                * indices: Concatenated neighbors of all cells.
+                * weights: Weights of the corresponding edges in indices.
+                * width:   Width of the maze.
+                * height:  Height of the maze.
+            Out:
+                * maze_graph: The corresponding snapshot.
+        """
+
+        # Rebuild the adjacency dictionary
+        indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+        adjacency = {cell: dict(zip(indices[indptr[cell]:indptr[cell + 1]], weights[indptr[cell]:indptr[cell + 1]])) for cell in range(width * height) if indptr[cell + 1] > indptr[cell]}
+        return cls.from_dict(adjacency, width, height)
+
+    #############################################################################################################################################
+
+    @property
+    def nb_vertices ( self: Self,
+                    ) ->    Integral:
+
+        """
+            Returns the number of cells that exist in the maze.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nb_vertices: Number of vertices in the graph.
+        """
+
+        # Holes are not counted
+        return len(self.vertices)
+
+    #############################################################################################################################################
+
+    @property
+    def is_unit_weight ( self: Self,
+                       ) ->    bool:
+
+        """
+            Indicates if all edges have weight 1, i.e., if there is no mud in the maze.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * unit: True if all weights are 1.
+        """
+
+        # Weights are at least 1 in PyRat
+        return self.max_weight == 1
+
+    #############################################################################################################################################
+
+    def get_neighbors ( self:   Self,
+                        vertex: Integral
+                      ) ->      List[Integral]:
+
+        """
+            Returns the list of neighbors of a vertex, as Maze.get_neighbors does.
+            The returned list is shared with the snapshot and should not be modified.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex of which to get neighbors.
+            Out:
+                * neighbors: List of neighbors of the vertex.
+        """
+
+        # Direct lookup
+        return self.neighbors[vertex]
+
+    #############################################################################################################################################
+
+    def get_weight ( self:     Self,
+                     vertex_1: Integral,
+                     vertex_2: Integral
+                   ) ->        Integral:
+
+        """
+            Returns the weight of an edge, as Maze.get_weight does.
+            In:
+                * self:     Reference to the current object.
+                * vertex_1: First vertex.
+                * vertex_2: Second vertex.
+            Out:
+                * weight: Weight of the edge.
+        """
+
+        # Direct lookup
+        return self.adjacency[vertex_1][vertex_2]
+
+    #############################################################################################################################################
+
+    def has_edge ( self:     Self,
+                   vertex_1: Integral,
+                   vertex_2: Integral
+                 ) ->        bool:
+
+        """
+            Checks if there is an edge between two vertices.
+            In:
+                * self:     Reference to the current object.
+                * vertex_1: First vertex.
+                * vertex_2: Second vertex.
+            Out:
+                * exists: True if the edge exists.
+        """
+
+        # Direct lookup
+        return vertex_1 in self.adjacency and vertex_2 in self.adjacency[vertex_1]
+
+    #############################################################################################################################################
+
+    def route_actions ( self:  Self,
+                        route: List[Integral]
+                      ) ->     Iterator[Action]:
+
+        """
+            Converts a route into the actions to follow it, as Maze.locations_to_actions does.
+            Actions are produced one at a time with lookups in edge_actions, so that long routes are not converted upfront.
+            Consecutive cells of the route must be equal or adjacent in the maze.
+            In:
+                * self:  Reference to the current object.
+                * route: List of cells to go through.
+            Out:
+                * actions: Iterator over the actions to go from one cell to the next.
+        """
+
+        # One lookup per step
+        edge_actions = self.edge_actions
+        for index in range(1, len(route)):
+            yield edge_actions[route[index - 1]][route[index]]
+
+    #############################################################################################################################################
+
+    def i_exists ( self:  Self,
+                   index: Integral
+                 ) ->     bool:
+
+        """
+            Checks if a given index is a valid cell in the maze.
+            In:
+                * self:  Reference to the current object.
+                * index: Index of the cell.
+            Out:
+                * exists: True if the cell exists.
+        """
+
+        # Direct lookup
+        return index in self.adjacency
+
+    #############################################################################################################################################
+
+    def i_to_rc ( self:  Self,
+                  index: Integral
+                ) ->     Tuple[Integral, Integral]:
+
+        """
+            Transforms a cell index in a pair (row, col), using the precomputed table.
+            In:
+                * self:  Reference to the current object.
+                * index: Index of the cell.
+            Out:
+                * row: Row of the cell.
+                * col: Column of the cell.
+        """
+
+        # Direct lookup
+        return self.cell_rc[index]
+
+    #############################################################################################################################################
+
+    def rc_to_i ( self: Self,
+                  row:  Integral,
+                  col:  Integral
+                ) ->    Integral:
+
+        """
+            Transforms a pair (row, col) in a cell index.
+            In:
+                * self: Reference to the current object.
+                * row:  Row of the cell.
+                * col:  Column of the cell.
+            Out:
+                * index: Index of the cell.
+        """
+
+        # Lexicographic order, as in the maze
+        return row * self.width + col
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _build ( self:      Self,
+                 adjacency: Dict[Integral, Dict[Integral, Integral]],
+                 width:     Integral,
+                 height:    Integral
+               ) ->         None:
+
+        """
+            Fills all the attributes of the snapshot from an adjacency dictionary.
+            In:
+                * self:      Reference to the current object.
+                * adjacency: Dictionary associating each cell with a dictionary of its neighbors and weights.
+                * width:     Width of the maze.
+                * height:    Height of the maze.
+            Out:
+                * None.
+        """
+
+        # Dimensions of the grid
+        self.width = width
+        self.height = height
+        self.nb_cells = self.width * self.height
+
+        # Adjacency as a dictionary, used for weight lookups
+        self.adjacency = {vertex: dict(adjacency[vertex]) for vertex in adjacency}
+        self.vertices = sorted(self.adjacency)
+
+        # Python lists of neighbors and of (neighbor, weight) pairs for each cell
+        self.neighbors = [[] for _ in range(self.nb_cells)]
+        self.edges = [[] for _ in range(self.nb_cells)]
+        for vertex in self.vertices:
+            for neighbor in sorted(self.adjacency[vertex]):
+                self.neighbors[vertex].append(neighbor)
+                self.edges[vertex].append((neighbor, self.adjacency[vertex][neighbor]))
+
+        # CSR arrays
+        degrees = [len(self.neighbors[cell]) for cell in range(self.nb_cells)]
+        self.indptr = numpy.zeros(self.nb_cells + 1, dtype=numpy.int32)
+        self.indptr[1:] = numpy.cumsum(degrees, dtype=numpy.int32)
+        self.indices = numpy.array([neighbor for cell in range(self.nb_cells) for neighbor, _ in self.edges[cell]], dtype=numpy.int32)
+        self.weights = numpy.array([weight for cell in range(self.nb_cells) for _, weight in self.edges[cell]], dtype=numpy.int32)
+
+        # Cell to (row, col) table
+        self.cell_rc = [(cell // self.width, cell % self.width) for cell in range(self.nb_cells)]
+        self.coordinates = numpy.array(self.cell_rc, dtype=numpy.int32).reshape(self.nb_cells, 2)
+
+        # Action along each edge between adjacent cells (edges of contracted graphs that cross corridors have none), and for staying in a cell
+        moves = {(0, 0): Action.NOTHING, (-1, 0): Action.NORTH, (1, 0): Action.SOUTH, (0, 1): Action.EAST, (0, -1): Action.WEST}
+        self.edge_actions = [{} for _ in range(self.nb_cells)]
+        for vertex in self.vertices:
+            row, col = self.cell_rc[vertex]
+            for neighbor in [vertex] + self.neighbors[vertex]:
+                neighbor_row, neighbor_col = self.cell_rc[neighbor]
+                move = moves.get((neighbor_row - row, neighbor_col - col))
+                if move is not None:
+                    self.edge_actions[vertex][neighbor] = move
+
+        # Bounds on the weights
+        self.min_weight = int(self.weights.min()) if len(self.weights) > 0 else 1
+        self.max_weight = int(self.weights.max()) if len(self.weights) > 0 else 1
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def as_maze_graph ( graph: Union[Maze, MazeGraph]
+                  ) ->     MazeGraph:
+
+    """
+        Returns a snapshot of the given graph.
+        If the graph is already a snapshot, it is returned as is, so that calling this function is free when the snapshot was built in preprocessing.
+        In:
+            * graph: A maze or a snapshot.
+        Out:
+            * maze_graph: The corresponding snapshot.
+    """
+
+    # Build only if needed
+    if isinstance(graph, MazeGraph):
+        return graph
+    return MazeGraph(graph)
+
+#####################################################################################################################################################
+
+def maze_key ( graph: Union[Maze, MazeGraph]
+             ) ->     str:
+
+    """
+        Returns a key identifying a maze from its dimensions and CSR arrays, so that the same maze gives the same key across games.
+        In:
+            * graph: The maze to identify.
+        Out:
+            * key: Hexadecimal digest of the maze.
+    """
+
+    # Hash of the arrays of the snapshot
+    maze_graph = as_maze_graph(graph)
+    digest = hashlib.sha1(b"%d,%d," % (maze_graph.width, maze_graph.height))
+    for values in (maze_graph.indptr, maze_graph.indices, maze_graph.weights):
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+#####################################################################################################################################################
+#####################################################################################################################################################
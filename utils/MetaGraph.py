@@ -0,0 +1,994 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a compact meta-graph, i.e., the complete graph of shortest paths between some cells of a maze.
+    Meta-graphs as dictionaries store two lists of cells per pair of vertices, which takes hundreds of megabytes with many pieces of cheese in big mazes.
+    Here, distances are stored in a dense matrix, and one array of predecessors is kept per search, so that each pair is stored once.
+    Routes are only built when a player commits to a leg of its tour.
+    When searches cannot be batched (i.e., with mud and without scipy), they are sharded across a pool of processes if there are enough of them and several cores.
+    The snapshot is then shipped once to the workers through shared memory, and the workers write their results in shared matrices.
+    A cache of searches can be given, so that meta-graphs built again on the same maze (e.g., when a seeded game is replayed) reuse previous searches.
+    Meta-graphs can also be converted to arrays and back, e.g., to be kept in an ArtifactCache on disk.
+    Tour heuristics (greedy choices, path lengths, sorted candidates, 2-opt moves) are vectorized over the distance matrix.
+    A mask of the nodes that are still present (e.g., pieces of cheese not eaten yet) restricts these queries without changing the matrix.
+    Reactive players replan from cells that are not nodes, which are added as transient nodes instead of new rows of the matrix.
+    A transient node lies on a route between nodes, so its distances to the ends are exact, and the triangle inequality bounds the other ones without any search.
+    Only a few transient nodes are kept, the least recently used ones being retired, so that memory stays bounded over long games.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import array
+import sys
+import os
+import itertools
+import concurrent.futures
+import collections
+import multiprocessing.shared_memory
+import numpy
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph, maze_key
+from shortest_paths import ShortestPathEngine, multi_target_dijkstra, predecessors_to_route, batched_searches
+from ShortestPathTreeCache import ShortestPathTreeCache
+from MetaGraphRow import MetaGraphRow
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Minimum number of nodes times number of vertices for which searches are sharded across processes
+# Starting the pool and rebuilding the snapshot in the workers costs about 0.15s for 100x100 mazes, when serial searches cost about 1us per node and vertex
+PARALLEL_MIN_WORK = 400000
+
+# Shared arrays and snapshot of a worker process, set when the pool starts
+_WORKER = {}
+
+# Default maximum number of transient nodes kept at once
+DEFAULT_MAX_TRANSIENT = 8
+
+# Distance given to unreachable nodes in vectorized queries, so that they are never the smallest
+_UNREACHABLE = numpy.iinfo(numpy.int64).max
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class MetaGraph ():
+
+    """
+        This class stores the shortest paths between all pairs of some vertices of a maze.
+        Searches are done from the last vertex to the first one, each toward the vertices before it, as in the meta_graph method of players.
+        Thus, the route between two vertices is given by the predecessors of the search from the one with the largest index.
+        The following attributes are available:
+            * nodes:        The vertices of the meta-graph, in order.
+            * index:        Dictionary associating each vertex with its index in nodes.
+            * distances:    Symmetric matrix of type int32 and shape (k, k), where distances[i, j] is the distance between nodes i and j (-1 if not reachable).
+            * predecessors: List giving for each node the int32 array of predecessors of its search (None for the first node, which needs no search).
+            * routes:       None, or the meta-graph as dictionaries that was given to from_dict (routes are then read from it).
+            * present:      Boolean array indicating for each node if it is still present (all nodes initially), see update_presence.
+            * transients:    Ordered dictionary associating each transient vertex (see add_transient) with the bounds of its distances to the nodes and its known routes.
+            * max_transient: Maximum number of transient vertices, the least recently used ones being retired first.
+        For code written for meta-graphs as dictionaries, meta_graph[vertex][target] gives the (distance, route) pair of an edge, and routes are only built when read.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:         Self,
+                   graph:        Union[Maze, MazeGraph],
+                   nodes:        List[Integral],
+                   engine:       ShortestPathEngine = ShortestPathEngine.HEAP,
+                   nb_processes:  Optional[Integral] = None,
+                   cache:         Optional[ShortestPathTreeCache] = None,
+                   max_transient: Integral = DEFAULT_MAX_TRANSIENT
+                 ) ->             Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:         Reference to the current object.
+                * graph:        The maze in which to search.
+                * nodes:        The vertices of the meta-graph (duplicates are ignored).
+                * engine:       Shortest-path engine used by the searches.
+                * nb_processes: Number of processes among which searches may be sharded (number of available cores if None, 1 to stay serial).
+                * cache:        Cache consulted before each search, and in which new searches are kept (no cache if None).
+                * max_transient: Maximum number of transient vertices kept at once.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Index of each vertex
+        self.nodes = list(dict.fromkeys(nodes))
+        self.index = {vertex: index for index, vertex in enumerate(self.nodes)}
+        self.distances = numpy.full((len(self.nodes), len(self.nodes)), -1, dtype=numpy.int32)
+        numpy.fill_diagonal(self.distances, 0)
+        self.predecessors = [None] * len(self.nodes)
+        self.routes = None
+        self.present = numpy.ones(len(self.nodes), dtype=bool)
+        self.transients = collections.OrderedDict()
+        self.max_transient = max_transient
+
+        # Searches kept in the cache are reused
+        maze_graph = as_maze_graph(graph)
+        key = maze_key(maze_graph) if cache is not None else None
+        cached = {}
+        if cache is not None:
+            for index in range(len(self.nodes) - 1, 0, -1):
+                search = cache.lookup(key, self.nodes[index], self.nodes[:index], engine)
+                if search is not None:
+                    cached[self.nodes[index]] = search
+
+        # With the scipy engine or in mazes without mud, the searches from all nodes are done together
+        searches = batched_searches(maze_graph, self.nodes, engine) if len(cached) < len(self.nodes) - 1 else None
+
+        # Otherwise, with enough work and several cores, searches are sharded across processes (serial searches are used if the pool fails)
+        if nb_processes is None:
+            nb_processes = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        if searches is None and len(cached) == 0 and nb_processes > 1 and len(self.nodes) > 2 and len(self.nodes) * maze_graph.nb_vertices >= PARALLEL_MIN_WORK:
+            try:
+                self._parallel_searches(maze_graph, engine, nb_processes)
+                if cache is not None:
+                    for index in range(len(self.nodes) - 1, 0, -1):
+                        target_distances = {target: int(distance) for target, distance in zip(self.nodes[:index], self.distances[index, :index]) if distance >= 0}
+                        cache.store(key, self.nodes[index], engine, target_distances, self.predecessors[index])
+                return
+            except (OSError, RuntimeError):
+                pass
+
+        # Each node searches toward the nodes before it, and keeps its predecessors (decoded ones are copied to an array)
+        nb_cells = maze_graph.nb_cells
+        for index in range(len(self.nodes) - 1, 0, -1):
+            start, targets = self.nodes[index], self.nodes[:index]
+            if start in cached:
+                target_distances, predecessors = cached[start]
+            else:
+                target_distances, predecessors = searches[start] if searches is not None else multi_target_dijkstra(maze_graph, start, targets, engine)
+                if isinstance(predecessors, dict):
+                    decoded, predecessors = predecessors, array.array("i", [-1]) * nb_cells
+                    for cell, parent in decoded.items():
+                        predecessors[cell] = parent
+                if cache is not None:
+                    cache.store(key, start, engine, target_distances, predecessors)
+            self.predecessors[index] = predecessors
+            row = [target_distances.get(target, -1) for target in targets]
+            self.distances[index, :index] = row
+            self.distances[:index, index] = row
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    @classmethod
+    def from_arrays ( cls:    Type[Self],
+                      arrays: Dict[str, numpy.ndarray]
+                    ) ->      Self:
+
+        """
+            Builds a meta-graph from the arrays returned by to_arrays, without any search.
+            Arrays are used as they are, so that memory-mapped arrays are only read when routes are built.
+            In:
+                * cls:    The class.
+                * arrays: Dictionary of arrays, as returned by to_arrays.
+            Out:
+                * meta_graph: The corresponding meta-graph.
+        """
+
+        # Bypass the constructor (rows of predecessors are viewed through memoryviews, that give Python integers as arrays do)
+        meta_graph = cls.__new__(cls)
+        meta_graph.nodes = arrays["nodes"].tolist()
+        meta_graph.index = {vertex: index for index, vertex in enumerate(meta_graph.nodes)}
+        meta_graph.distances = arrays["distances"]
+        meta_graph.predecessors = [None] + [memoryview(arrays["predecessors"][index]) for index in range(1, len(meta_graph.nodes))]
+        meta_graph.routes = None
+        meta_graph.present = numpy.ones(len(meta_graph.nodes), dtype=bool)
+        meta_graph.transients = collections.OrderedDict()
+        meta_graph.max_transient = DEFAULT_MAX_TRANSIENT
+        return meta_graph
+
+    #############################################################################################################################################
+
+    @classmethod
+    def from_dict ( cls:            Type[Self],
+                    complete_graph: Dict[Any, Dict[Any, Tuple[Integral, List[Integral]]]]
+                  ) ->              Self:
+
+        """
+            Builds a meta-graph from a meta-graph as dictionaries, so that tour heuristics can use the vectorized methods of the class.
+            Nodes may be any hashable objects (e.g., the excursions of compress_excursions), and missing edges are not reachable.
+            The distance matrix is not symmetric if the dictionaries are not (e.g., after compress_excursions).
+            In:
+                * cls:            The class.
+                * complete_graph: Dictionary associating each vertex with a dictionary of (distance, route) pairs.
+            Out:
+                * meta_graph: The corresponding meta-graph, reading its routes from the dictionaries.
+        """
+
+        # Nodes are the keys, then the other vertices that are only targets
+        meta_graph = cls.__new__(cls)
+        meta_graph.nodes = list(dict.fromkeys([vertex for vertex in complete_graph] + [target for vertex in complete_graph for target in complete_graph[vertex]]))
+        meta_graph.index = {vertex: index for index, vertex in enumerate(meta_graph.nodes)}
+        meta_graph.distances = numpy.full((len(meta_graph.nodes), len(meta_graph.nodes)), -1, dtype=numpy.int32)
+        numpy.fill_diagonal(meta_graph.distances, 0)
+        for vertex in complete_graph:
+            for target, (distance, _) in complete_graph[vertex].items():
+                meta_graph.distances[meta_graph.index[vertex], meta_graph.index[target]] = distance
+        meta_graph.predecessors = [None] * len(meta_graph.nodes)
+        meta_graph.routes = complete_graph
+        meta_graph.present = numpy.ones(len(meta_graph.nodes), dtype=bool)
+        meta_graph.transients = collections.OrderedDict()
+        meta_graph.max_transient = DEFAULT_MAX_TRANSIENT
+        return meta_graph
+
+    #############################################################################################################################################
+
+    def to_arrays ( self: Self,
+                  ) ->    Dict[str, numpy.ndarray]:
+
+        """
+            Converts the meta-graph into arrays, e.g., to save it with numpy.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * arrays: Dictionary with the nodes, the distance matrix, and a matrix of predecessors with one row per node (-1 for the first one).
+        """
+
+        # Stack the arrays of predecessors
+        nb_cells = len(self.predecessors[1]) if len(self.nodes) > 1 else 0
+        predecessors = numpy.full((len(self.nodes), nb_cells), -1, dtype=numpy.int32)
+        for index in range(1, len(self.nodes)):
+            predecessors[index] = numpy.frombuffer(self.predecessors[index], dtype=numpy.int32)
+        return {"nodes": numpy.array(self.nodes, dtype=numpy.int32), "distances": numpy.asarray(self.distances), "predecessors": predecessors}
+
+    #############################################################################################################################################
+
+    @property
+    def nbytes ( self: Self,
+               ) ->    Integral:
+
+        """
+            Memory used by the arrays of the meta-graph, in bytes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * nbytes: Size of the distance matrix and of all arrays of predecessors.
+        """
+
+        # Sum of all arrays
+        return self.distances.nbytes + sum(predecessors.itemsize * len(predecessors) for predecessors in self.predecessors if predecessors is not None)
+
+    #############################################################################################################################################
+
+    def distance ( self:   Self,
+                   source: Integral,
+                   target: Integral
+                 ) ->      Integral:
+
+        """
+            Returns the length of a shortest path between two vertices of the meta-graph.
+            One of them may be a transient vertex, whose distances are only known when their bounds are equal or when a route was set.
+            In:
+                * self:   Reference to the current object.
+                * source: The source vertex.
+                * target: The target vertex.
+            Out:
+                * distance: The distance from source to target (-1 if not reachable or not known).
+        """
+
+        # Exact distances of transient vertices
+        if source in self.transients or target in self.transients:
+            vertex, node = (source, target) if source in self.transients else (target, source)
+            lower, upper, _, _ = self.transients[vertex]
+            index = self.index[node]
+            return int(upper[index]) if lower[index] == upper[index] else -1
+
+        # Lookup
+        return int(self.distances[self.index[source], self.index[target]])
+
+    #############################################################################################################################################
+
+    def route ( self:   Self,
+                source: Integral,
+                target: Integral
+              ) ->      List[Integral]:
+
+        """
+            Builds a shortest path between two vertices of the meta-graph, from the predecessors of the search that found it.
+            One of them may be a transient vertex, if its distance to the other one is known.
+            In:
+                * self:   Reference to the current object.
+                * source: The source vertex.
+                * target: The target vertex, that must be reachable from the source.
+            Out:
+                * route: The route from source to target.
+        """
+
+        # Routes of transient vertices are set ones, or go through the end of their route that gives the exact distance
+        if target in self.transients:
+            return self.route(target, source)[::-1]
+        if source in self.transients:
+            lower, upper, ends, routes = self.transients[source]
+            if target in routes:
+                return routes[target]
+            for end, end_distance, end_route in ends:
+                if end_distance + self.distance(end, target) == upper[self.index[target]] == lower[self.index[target]]:
+                    return end_route + self.route(end, target)[1:]
+            raise KeyError(target)
+
+        # Routes given to from_dict are read as they are
+        if self.routes is not None:
+            return [source] if source == target else self.routes[source][target][1]
+
+        # The search from the vertex with the largest index gives the route, reversed if needed
+        source_index, target_index = self.index[source], self.index[target]
+        if source_index == target_index:
+            return [source]
+        if source_index > target_index:
+            return predecessors_to_route(self.predecessors[source_index], source, target)
+        return predecessors_to_route(self.predecessors[target_index], target, source)[::-1]
+
+    #############################################################################################################################################
+
+    def add_transient ( self:   Self,
+                        vertex: Integral,
+                        source: Integral,
+                        target: Integral,
+                        graph:  Union[Maze, MazeGraph]
+                      ) ->      bool:
+
+        """
+            Adds a transient vertex, lying on the route from source to target (e.g., a player following its route to a destination), without any search.
+            Distances to the ends of the route that are nodes are exact, and give bounds on the distances to all other nodes by the triangle inequality.
+            If the vertex is already transient, its bounds are tightened with the ones given by this route.
+            The least recently used transient vertices are retired if there are too many of them.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The vertex to add (nothing is done if it is a node).
+                * source: The vertex at which the route starts (a node or a transient vertex).
+                * target: The vertex at which the route ends (a node, reachable from the source).
+                * graph:  The maze, giving the weights of the cells of the route.
+            Out:
+                * added: True if the vertex is a node or a transient vertex after the call, False if it is not on the route.
+        """
+
+        # Nodes need nothing
+        if vertex in self.index:
+            return True
+
+        # Distances to both ends along the route
+        maze_graph = as_maze_graph(graph)
+        route = self.route(source, target)
+        if vertex not in route:
+            return False
+        position = route.index(vertex)
+        source_distance = sum(maze_graph.get_weight(route[i], route[i + 1]) for i in range(position))
+        target_distance = self.distance(source, target) - source_distance
+        ends = [(source, source_distance, route[position::-1]), (target, target_distance, route[position:])]
+
+        # Bounds from the ends that are nodes (an end that is transient would only give looser bounds)
+        lower, upper, known_ends, _ = self._transient(vertex)
+        ends = [end for end in ends if end[0] in self.index]
+        known_ends.extend(ends)
+        for end, end_distance, _ in ends:
+            row = self.distances[self.index[end]].astype(numpy.int64)
+            reachable = row >= 0
+            lower[reachable] = numpy.maximum(lower[reachable], numpy.abs(row[reachable] - end_distance))
+            upper[reachable] = numpy.minimum(upper[reachable], row[reachable] + end_distance)
+        return True
+
+    #############################################################################################################################################
+
+    def set_route ( self:     Self,
+                    vertex:   Integral,
+                    target:   Integral,
+                    distance: Integral,
+                    route:    List[Integral]
+                  ) ->        None:
+
+        """
+            Records a shortest path from a transient vertex to a node, found elsewhere (e.g., by a search, a table or an oracle).
+            The vertex is added as a transient vertex with no known distance if needed.
+            In:
+                * self:     Reference to the current object.
+                * vertex:   The transient vertex (nothing is done if it is a node).
+                * target:   The node reached by the route.
+                * distance: The length of the route.
+                * route:    The route from the vertex to the target.
+            Out:
+                * None.
+        """
+
+        # Nodes already know their routes
+        if vertex in self.index:
+            return
+
+        # The distance is now exact
+        lower, upper, _, routes = self._transient(vertex)
+        lower[self.index[target]] = upper[self.index[target]] = distance
+        routes[target] = route
+
+    #############################################################################################################################################
+
+    def retire ( self:   Self,
+                 vertex: Optional[Integral] = None
+               ) ->      None:
+
+        """
+            Retires a transient vertex, e.g., when a player does not need the routes from a former location anymore.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The transient vertex to retire (all transient vertices if None, nothing is done for other vertices).
+            Out:
+                * None.
+        """
+
+        # Forget the bounds and routes
+        if vertex is None:
+            self.transients.clear()
+        else:
+            self.transients.pop(vertex, None)
+
+    #############################################################################################################################################
+
+    def bounds ( self:    Self,
+                 vertex:  Integral,
+                 targets: List[Integral]
+               ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+        """
+            Returns bounds on the distances from a vertex to some nodes, that are equal when distances are known.
+            In:
+                * self:    Reference to the current object.
+                * vertex:  A node or a transient vertex.
+                * targets: The nodes.
+            Out:
+                * lower: Array of type int64 with a lower bound of each distance.
+                * upper: Array of type int64 with an upper bound of each distance (the largest int64 if unknown or not reachable).
+        """
+
+        # Exact distances of nodes
+        indices = self.indices(targets)
+        if vertex in self.index:
+            row = self._finite_distances(self.distances[self.index[vertex], indices])
+            return row, row.copy()
+
+        # Bounds of transient vertices
+        lower, upper, _, _ = self.transients[vertex]
+        return lower[indices], upper[indices]
+
+    #############################################################################################################################################
+
+    def best_target ( self:     Self,
+                      vertex:   Integral,
+                      targets:  List[Integral],
+                      divisors: Optional[List[Number]] = None
+                    ) ->        Tuple[Optional[Integral], Integral]:
+
+        """
+            Returns the best target from a vertex, i.e., the one minimizing its distance divided by its divisor, if the bounds of the distances prove it.
+            Ties are broken by order in the list of targets, as a loop keeping the first strict minimum would do.
+            In:
+                * self:     Reference to the current object.
+                * vertex:   A node or a transient vertex.
+                * targets:  The candidate nodes.
+                * divisors: Positive value associated with each target (all 1 if None, to get the nearest target).
+            Out:
+                * target:   The best target (None if the bounds cannot prove which one it is, e.g., without any target).
+                * distance: Its distance from the vertex (-1 if None).
+        """
+
+        # The target with the smallest upper bound must have an exact distance, and a better weight than the lower bounds of all others
+        lower, upper = self.bounds(vertex, targets)
+        divisors = numpy.ones(len(targets)) if divisors is None else numpy.asarray(divisors, dtype=float)
+        if len(targets) == 0:
+            return None, -1
+        best = int(numpy.argmin(upper / divisors))
+        weight = upper[best] / divisors[best]
+        lower_weights = lower / divisors
+        if upper[best] == _UNREACHABLE or lower[best] != upper[best] or (lower_weights[:best] <= weight).any() or (lower_weights[best + 1:] < weight).any():
+            return None, -1
+        return targets[best], int(upper[best])
+
+    #############################################################################################################################################
+
+    def update_presence ( self:     Self,
+                          vertices: Iterable[Any]
+                        ) ->        None:
+
+        """
+            Marks the given vertices as present, and all other nodes as absent (e.g., with the remaining pieces of cheese of the game state).
+            Vertices that are not nodes of the meta-graph are ignored.
+            In:
+                * self:     Reference to the current object.
+                * vertices: The vertices that are still present.
+            Out:
+                * None.
+        """
+
+        # Reset the mask
+        self.present[:] = False
+        self.present[[self.index[vertex] for vertex in vertices if vertex in self.index]] = True
+
+    #############################################################################################################################################
+
+    def remove ( self:   Self,
+                 vertex: Any
+               ) ->      None:
+
+        """
+            Marks a node as absent.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The node that is not present anymore.
+            Out:
+                * None.
+        """
+
+        # Update the mask
+        self.present[self.index[vertex]] = False
+
+    #############################################################################################################################################
+
+    def nearest ( self:    Self,
+                  source:  Any,
+                  targets: Optional[List[Any]] = None
+                ) ->       Tuple[Any, Integral]:
+
+        """
+            Returns the target that is the closest to a vertex of the meta-graph.
+            Ties are broken by order of the targets, as min does on a list.
+            In:
+                * self:    Reference to the current object.
+                * source:  The source vertex.
+                * targets: The candidate vertices (the present nodes if None, in the order of nodes), the source is never a candidate.
+            Out:
+                * target:   The closest reachable target (None if there is none).
+                * distance: The distance to this target (-1 if there is none).
+        """
+
+        # Smallest distance among reachable candidates
+        candidates = self._candidates(source, targets)
+        row = self._finite_distances(self.distances[self.index[source], candidates])
+        if len(candidates) == 0 or row.min() == _UNREACHABLE:
+            return None, -1
+        position = int(row.argmin())
+        return self.nodes[candidates[position]], int(row[position])
+
+    #############################################################################################################################################
+
+    def sorted_targets ( self:    Self,
+                         source:  Any,
+                         targets: Optional[List[Any]] = None
+                       ) ->       List[Tuple[Any, Integral]]:
+
+        """
+            Sorts targets by increasing distance from a vertex of the meta-graph.
+            Ties are broken by order of the targets, as sorted does on a list.
+            In:
+                * self:    Reference to the current object.
+                * source:  The source vertex.
+                * targets: The vertices to sort (the present nodes if None, in the order of nodes), the source is excluded.
+            Out:
+                * sorted_targets: List of (target, distance) pairs for reachable targets, by increasing distance.
+        """
+
+        # Stable sort of the row of the source
+        candidates = self._candidates(source, targets)
+        row = self.distances[self.index[source], candidates]
+        order = numpy.argsort(row, kind="stable")
+        return [(self.nodes[candidates[position]], int(row[position])) for position in order if row[position] >= 0]
+
+    #############################################################################################################################################
+
+    def greedy_path ( self:    Self,
+                      source:  Any,
+                      targets: Optional[List[Any]] = None
+                    ) ->       List[Any]:
+
+        """
+            Builds a path from a vertex of the meta-graph that goes to the closest unvisited target at each step.
+            Ties are broken by order of the targets, as in the partial_path method of players.
+            In:
+                * self:    Reference to the current object.
+                * source:  The source vertex.
+                * targets: The vertices to visit (the present nodes if None, in the order of nodes), the source is excluded.
+            Out:
+                * path: The source followed by the reachable targets in the order of visit.
+        """
+
+        # Submatrix of distances between the source and the candidates, where visited candidates are made unreachable
+        candidates = self._candidates(source, targets)
+        submatrix = self._finite_distances(self.distances[numpy.ix_(numpy.append(candidates, self.index[source]), candidates)])
+        path, current = [source], len(candidates)
+        for _ in range(len(candidates)):
+            position = int(submatrix[current].argmin())
+            if submatrix[current, position] == _UNREACHABLE:
+                break
+            submatrix[:, position] = _UNREACHABLE
+            path.append(self.nodes[candidates[position]])
+            current = position
+        return path
+
+    #############################################################################################################################################
+
+    def path_length ( self: Self,
+                      path: List[Any]
+                    ) ->    Integral:
+
+        """
+            Returns the length of a path going through vertices of the meta-graph.
+            In:
+                * self: Reference to the current object.
+                * path: The vertices of the path, in order.
+            Out:
+                * length: The sum of the distances between consecutive vertices.
+        """
+
+        # Sum of the consecutive pairs
+        indices = self.indices(path)
+        return int(self.distances[indices[:-1], indices[1:]].sum(dtype=numpy.int64))
+
+    #############################################################################################################################################
+
+    def swap_deltas ( self:    Self,
+                      indices: numpy.ndarray,
+                      i:       Integral,
+                      start:   Optional[Integral] = None
+                    ) ->       numpy.ndarray:
+
+        """
+            Returns the changes in length of a path when swapping the vertex at position i with the vertex at each position j, as done by 2-opt.
+            Only the edges around positions i and j change, so all changes are computed at once from the distance matrix.
+            In:
+                * self:    Reference to the current object.
+                * indices: Indices of the vertices of the path, as returned by indices.
+                * i:       Position to swap, between 1 and len(indices) - 2.
+                * start:   First position j to consider (i + 1 if None), positions go up to len(indices) - 2.
+            Out:
+                * deltas: Array of type int64, where deltas[j - start] is the new length minus the current one.
+        """
+
+        # Edges before and after the swapped vertices
+        start = i + 1 if start is None else start
+        distances = lambda sources, targets: self.distances[sources, targets].astype(numpy.int64)
+        j = numpy.arange(start, len(indices) - 1)
+        before_i, at_i, after_i = indices[i - 1], indices[i], indices[i + 1]
+        before_j, at_j, after_j = indices[j - 1], indices[j], indices[j + 1]
+        deltas = distances(before_i, at_j) + distances(at_j, after_i) + distances(before_j, at_i) + distances(at_i, after_j) \
+               - distances(before_i, at_i) - distances(at_i, after_i) - distances(before_j, at_j) - distances(at_j, after_j)
+
+        # Adjacent positions share an edge, that is reversed by the swap
+        if start == i + 1 and len(j) > 0:
+            deltas[0] = distances(before_i, at_j[0]) + distances(at_j[0], at_i) + distances(at_i, after_j[0]) \
+                      - distances(before_i, at_i) - distances(at_i, at_j[0]) - distances(at_j[0], after_j[0])
+        return deltas
+
+    #############################################################################################################################################
+
+    def indices ( self:     Self,
+                  vertices: List[Any]
+                ) ->        numpy.ndarray:
+
+        """
+            Returns the indices of vertices of the meta-graph, e.g., to evaluate 2-opt moves with swap_deltas.
+            In:
+                * self:     Reference to the current object.
+                * vertices: The vertices.
+            Out:
+                * indices: Array of the indices of the vertices in nodes.
+        """
+
+        # Lookups
+        return numpy.array([self.index[vertex] for vertex in vertices], dtype=numpy.intp)
+
+    #############################################################################################################################################
+
+    def keys ( self: Self,
+             ) ->    List[Any]:
+
+        """
+            Returns the vertices of the meta-graph, as for a dictionary.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * vertices: The nodes, in order.
+        """
+
+        # Nodes in order
+        return self.nodes
+
+    #############################################################################################################################################
+
+    def __getitem__ ( self:   Self,
+                      source: Any
+                    ) ->      MetaGraphRow:
+
+        """
+            Returns the row of a vertex, that behaves as in a meta-graph as dictionaries.
+            This is meant for code that is not yet written for this class, distance and route should be preferred in loops.
+            In:
+                * self:   Reference to the current object.
+                * source: The source vertex.
+            Out:
+                * row: Mapping associating each other reachable vertex with the distance and route to it (routes are built when read).
+        """
+
+        # Lazy row
+        if source not in self.index:
+            raise KeyError(source)
+        return MetaGraphRow(self, source)
+
+    #############################################################################################################################################
+
+    def __contains__ ( self:   Self,
+                       vertex: Integral
+                     ) ->      bool:
+
+        """
+            Indicates if a vertex is in the meta-graph.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The vertex to check.
+            Out:
+                * present: True if the vertex is a node of the meta-graph.
+        """
+
+        # Lookup
+        return vertex in self.index
+
+    #############################################################################################################################################
+
+    def __iter__ ( self: Self,
+                 ) ->    Iterator[Integral]:
+
+        """
+            Iterates over the vertices of the meta-graph, as for a dictionary.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * vertices: Iterator over the nodes.
+        """
+
+        # Nodes in order
+        return iter(self.nodes)
+
+    #############################################################################################################################################
+
+    def __len__ ( self: Self,
+                ) ->    Integral:
+
+        """
+            Returns the number of vertices of the meta-graph.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * length: Number of nodes.
+        """
+
+        # Number of nodes
+        return len(self.nodes)
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _transient ( self:   Self,
+                     vertex: Integral
+                   ) ->      Tuple[numpy.ndarray, numpy.ndarray, List[Tuple[Integral, Integral, List[Integral]]], Dict[Integral, List[Integral]]]:
+
+        """
+            Returns the data of a transient vertex, marked as the most recently used, after creating it with no known distance if needed.
+            The least recently used transient vertices are retired if there are too many of them.
+            In:
+                * self:   Reference to the current object.
+                * vertex: The transient vertex.
+            Out:
+                * lower:  Lower bounds of the distances to all nodes.
+                * upper:  Upper bounds of the distances to all nodes.
+                * ends:   Ends of the routes the vertex lies on, as (node, distance, route from the vertex) triplets.
+                * routes: Routes that were set, associated with the node they reach.
+        """
+
+        # Most recently used
+        if vertex in self.transients:
+            self.transients.move_to_end(vertex)
+            return self.transients[vertex]
+
+        # Bounded number of transient vertices
+        self.transients[vertex] = (numpy.zeros(len(self.nodes), dtype=numpy.int64), numpy.full(len(self.nodes), _UNREACHABLE, dtype=numpy.int64), [], {})
+        while len(self.transients) > self.max_transient:
+            self.transients.popitem(last=False)
+        return self.transients[vertex]
+
+    #############################################################################################################################################
+
+    def _candidates ( self:    Self,
+                      source:  Any,
+                      targets: Optional[List[Any]]
+                    ) ->       numpy.ndarray:
+
+        """
+            Returns the indices of the candidates of a query from a vertex.
+            In:
+                * self:    Reference to the current object.
+                * source:  The source vertex, that is never a candidate.
+                * targets: The candidate vertices, or None for the present nodes.
+            Out:
+                * candidates: Array of the indices of the candidates, in the order of the targets (or of nodes).
+        """
+
+        # Present nodes, or given targets
+        candidates = numpy.flatnonzero(self.present) if targets is None else self.indices(targets)
+        return candidates[candidates != self.index[source]]
+
+    #############################################################################################################################################
+
+    def _finite_distances ( self:      Self,
+                            distances: numpy.ndarray
+                          ) ->         numpy.ndarray:
+
+        """
+            Converts distances to int64, where unreachable nodes get the largest value, so that argmin ignores them.
+            In:
+                * self:      Reference to the current object.
+                * distances: Distances extracted from the matrix.
+            Out:
+                * distances: Copy of type int64.
+        """
+
+        # Replace -1 values
+        distances = distances.astype(numpy.int64)
+        distances[distances < 0] = _UNREACHABLE
+        return distances
+
+    #############################################################################################################################################
+
+    def _parallel_searches ( self:         Self,
+                             maze_graph:   MazeGraph,
+                             engine:       ShortestPathEngine,
+                             nb_processes: Integral
+                           ) ->            None:
+
+        """
+            Runs the searches of all nodes in a pool of processes, and fills the distances and predecessors of the meta-graph.
+            The CSR arrays of the snapshot and the result matrices are placed in shared memory, so that nothing large is pickled.
+            Nodes are dealt to the processes in turn, as searches from nodes with a larger index have more targets.
+            In:
+                * self:         Reference to the current object.
+                * maze_graph:   The snapshot in which to search.
+                * engine:       Shortest-path engine used by the searches.
+                * nb_processes: Number of processes of the pool.
+            Out:
+                * None.
+        """
+
+        # Shared copies of the snapshot, and shared matrices for the results
+        arrays = {"indptr": maze_graph.indptr,
+                  "indices": maze_graph.indices,
+                  "weights": maze_graph.weights,
+                  "distances": self.distances,
+                  "predecessors": numpy.full((len(self.nodes), maze_graph.nb_cells), -1, dtype=numpy.int32)}
+        blocks, descriptions = {}, {}
+        try:
+            for name, values in arrays.items():
+                blocks[name] = multiprocessing.shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+                numpy.ndarray(values.shape, dtype=values.dtype, buffer=blocks[name].buf)[...] = values
+                descriptions[name] = (blocks[name].name, values.shape, values.dtype.str)
+
+            # Each process runs the searches of one shard of nodes
+            shards = [list(range(len(self.nodes) - 1 - shard, 0, -nb_processes)) for shard in range(nb_processes)]
+            with concurrent.futures.ProcessPoolExecutor(nb_processes, initializer=_attach_worker, initargs=(descriptions, maze_graph.width, maze_graph.height)) as executor:
+                list(executor.map(_search_shard, shards, itertools.repeat(self.nodes), itertools.repeat(engine)))
+
+            # Copy the results before releasing the shared memory
+            self.distances[...] = numpy.ndarray(self.distances.shape, dtype=self.distances.dtype, buffer=blocks["distances"].buf)
+            predecessors = numpy.ndarray(arrays["predecessors"].shape, dtype=numpy.int32, buffer=blocks["predecessors"].buf)
+            for index in range(1, len(self.nodes)):
+                self.predecessors[index] = array.array("i", predecessors[index].tobytes())
+            del predecessors
+
+        # Release the shared memory in all cases
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def _attach_worker ( descriptions: Dict[str, Tuple[str, Tuple[Integral, ...], str]],
+                     width:        Integral,
+                     height:       Integral
+                   ) ->            None:
+
+    """
+        Initializes a worker process of MetaGraph._parallel_searches.
+        The shared arrays are attached once per process, and the snapshot is rebuilt from the CSR arrays.
+        In:
+            * descriptions: Dictionary associating the name of each array with the name, shape and type of its shared memory block.
+            * width:        Width of the maze.
+            * height:       Height of the maze.
+        Out:
+            * None.
+    """
+
+    # Attach all blocks, keeping them referenced as long as the process lives
+    for name, (block_name, shape, dtype) in descriptions.items():
+        block = multiprocessing.shared_memory.SharedMemory(name=block_name)
+        _WORKER[name + "_block"] = block
+        _WORKER[name] = numpy.ndarray(shape, dtype=numpy.dtype(dtype), buffer=block.buf)
+    _WORKER["maze_graph"] = MazeGraph.from_csr(_WORKER["indptr"], _WORKER["indices"], _WORKER["weights"], width, height)
+
+#####################################################################################################################################################
+
+def _search_shard ( indices: List[Integral],
+                    nodes:   List[Integral],
+                    engine:  ShortestPathEngine
+                  ) ->       None:
+
+    """
+        Runs the searches of some nodes in a worker process, as the serial loop of MetaGraph does, and writes their results in the shared matrices.
+        Each search only writes its own row and column of the distances, so that workers never write at the same place.
+        In:
+            * indices: Indices of the nodes to search from.
+            * nodes:   The vertices of the meta-graph.
+            * engine:  Shortest-path engine used by the searches.
+        Out:
+            * None.
+    """
+
+    # Search from each node toward the nodes before it
+    for index in indices:
+        target_distances, predecessors = multi_target_dijkstra(_WORKER["maze_graph"], nodes[index], nodes[:index], engine)
+        row = [target_distances.get(target, -1) for target in nodes[:index]]
+        _WORKER["distances"][index, :index] = row
+        _WORKER["distances"][:index, index] = row
+        _WORKER["predecessors"][index] = numpy.frombuffer(predecessors, dtype=numpy.int32)
+
+#####################################################################################################################################################
+
+def meta_graph_nbytes ( complete_graph: Dict[Integral, Dict[Integral, Tuple[Integral, List[Integral]]]]
+                      ) ->              Integral:
+
+    """
+        Measures the memory used by a meta-graph as dictionaries of (distance, route) pairs, to compare it with a MetaGraph.
+        All Python objects reachable from the dictionary are counted once (dictionaries, tuples, lists and integers).
+        In:
+            * complete_graph: The meta-graph to measure.
+        Out:
+            * nbytes: The total size of these objects, in bytes.
+    """
+
+    # Count each object once, as the same integers may be shared
+    seen = set()
+    def size (element):
+        if id(element) in seen:
+            return 0
+        seen.add(id(element))
+        return sys.getsizeof(element)
+
+    # Walk the structure
+    nbytes = size(complete_graph)
+    for vertex, row in complete_graph.items():
+        nbytes += size(vertex) + size(row)
+        for target, leg in row.items():
+            distance, route = leg
+            nbytes += size(target) + size(leg) + size(distance) + size(route) + sum(size(cell) for cell in route)
+    return nbytes
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,132 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define the row of a vertex in a MetaGraph.
+    Rows let code written for meta-graphs as dictionaries (i.e., meta_graph[vertex][target] gives a (distance, route) pair) run on a MetaGraph.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import collections.abc
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class MetaGraphRow (collections.abc.Mapping):
+
+    """
+        This class is the row of a vertex in a MetaGraph, that behaves as the dictionary of this vertex in a meta-graph as dictionaries.
+        Distances are read from the matrix, and routes are only built when an edge is read.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:       Self,
+                   meta_graph: "MetaGraph",
+                   source:     Any
+                 ) ->          Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:       Reference to the current object.
+                * meta_graph: The meta-graph.
+                * source:     The vertex of the row.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Row of the matrix
+        self.meta_graph = meta_graph
+        self.source = source
+        self.row = meta_graph.distances[meta_graph.index[source]]
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def __getitem__ ( self:   Self,
+                      target: Any
+                    ) ->      Tuple[Integral, List[Integral]]:
+
+        """
+            Returns the edge from the vertex of the row to a target.
+            In:
+                * self:   Reference to the current object.
+                * target: The target vertex.
+            Out:
+                * distance: The distance to the target.
+                * route:    The route to the target.
+        """
+
+        # Other reachable nodes only
+        if target not in self:
+            raise KeyError(target)
+        return int(self.row[self.meta_graph.index[target]]), self.meta_graph.route(self.source, target)
+
+    #############################################################################################################################################
+
+    def __contains__ ( self:   Self,
+                       target: Any
+                     ) ->      bool:
+
+        """
+            Indicates if there is an edge from the vertex of the row to a target.
+            In:
+                * self:   Reference to the current object.
+                * target: The target vertex.
+            Out:
+                * present: True if the target is another reachable node.
+        """
+
+        # Lookup without building the route
+        return target != self.source and target in self.meta_graph.index and self.row[self.meta_graph.index[target]] >= 0
+
+    #############################################################################################################################################
+
+    def __iter__ ( self: Self,
+                 ) ->    Iterator[Any]:
+
+        """
+            Iterates over the targets of the row, in the order of nodes.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * targets: Iterator over the other reachable nodes.
+        """
+
+        # Filter the nodes
+        return (target for target in self.meta_graph.nodes if target in self)
+
+    #############################################################################################################################################
+
+    def __len__ ( self: Self,
+                ) ->    Integral:
+
+        """
+            Returns the number of targets of the row.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * length: Number of other reachable nodes.
+        """
+
+        # Count the reachable nodes, except the source
+        return int((self.row >= 0).sum()) - int(self.row[self.meta_graph.index[self.source]] >= 0)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
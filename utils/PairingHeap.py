@@ -0,0 +1,148 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a pairing heap.
+    It is a priority queue with O(1) insertion, and O(log n) amortized extraction of the smallest element.
+    It is used as a priority queue by PairingHeapTraversal.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class PairingHeap ():
+
+    """
+        This class defines a min pairing heap.
+        Each node is a list [element, children], where children is a list of nodes whose elements are not smaller.
+        Insertion merges a new node with the root, and extraction merges the children of the root two by two (two-pass pairing).
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self: Self,
+                 ) ->    Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Root node and number of elements
+        self.root = None
+        self.size = 0
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def __len__ ( self: Self,
+                ) ->    Integral:
+
+        """
+            This method returns the number of elements in the heap.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * size: Number of elements in the heap.
+        """
+
+        # Return the counter
+        return self.size
+
+    #############################################################################################################################################
+
+    def push ( self:    Self,
+               element: Any
+             ) ->       None:
+
+        """
+            This method adds an element to the heap.
+            In:
+                * self:    Reference to the current object.
+                * element: Element to add, comparable with the others.
+            Out:
+                * None.
+        """
+
+        # Merge a single-node heap with the root
+        self.root = self._merge(self.root, [element, []])
+        self.size += 1
+
+    #############################################################################################################################################
+
+    def pop ( self: Self,
+            ) ->    Any:
+
+        """
+            This method extracts the smallest element of the heap.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * element: Smallest element of the heap.
+        """
+
+        # Debug
+        assert self.root is not None # Should not be called on an empty heap
+
+        # First pass: merge children two by two, from left to right
+        element, children = self.root
+        pairs = [self._merge(children[i], children[i + 1] if i + 1 < len(children) else None) for i in range(0, len(children), 2)]
+
+        # Second pass: merge the pairs from right to left
+        root = None
+        for node in reversed(pairs):
+            root = self._merge(node, root)
+        self.root = root
+        self.size -= 1
+        return element
+
+    #############################################################################################################################################
+    #                                                             PROTECTED METHODS                                                             #
+    #############################################################################################################################################
+
+    def _merge ( self:   Self,
+                 node_1: Optional[List[Any]],
+                 node_2: Optional[List[Any]]
+               ) ->      Optional[List[Any]]:
+
+        """
+            This method merges two heaps, the root with the larger element becomes a child of the other.
+            In:
+                * self:   Reference to the current object.
+                * node_1: Root of the first heap (None if empty).
+                * node_2: Root of the second heap (None if empty).
+            Out:
+                * node: Root of the merged heap.
+        """
+
+        # Merge with an empty heap
+        if node_1 is None:
+            return node_2
+        if node_2 is None:
+            return node_1
+
+        # Link the roots
+        if node_2[0] < node_1[0]:
+            node_1, node_2 = node_2, node_1
+        node_1[1].append(node_2)
+        return node_1
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,252 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful elements to define a cache of shortest-path searches, shared by all players of a process.
+    In comparisons, the same seeded maze is played many times, and players build meta-graphs over the same maze and pieces of cheese.
+    The results of multi_target_dijkstra are kept with a key made of the maze (see maze_key), the source and the engine.
+    A search is a hit when a kept search from the same source has settled all the requested targets, as its predecessors are then final for them.
+    Searches are evicted in least recently used order when the memory they use exceeds a budget.
+    The cache lives in the memory of the process, so hits only happen when games and players share a process, i.e., in SEQUENTIAL or SIMULATION mode.
+    In MATCH mode (the default of PyRat), each player of each game runs in a new process, and starts with an empty cache.
+    Results that must be shared across processes are kept on disk with an ArtifactCache instead.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import array
+import collections
+import sys
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, maze_key
+from shortest_paths import ShortestPathEngine, multi_target_dijkstra
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Default memory budget of the cache, in bytes (a search in a 100x100 maze uses about 40kB)
+DEFAULT_BUDGET = 64 * 2**20
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ShortestPathTreeCache ():
+
+    """
+        This class is a cache of the results of multi_target_dijkstra, with least recently used eviction.
+        The following attributes are available:
+            * budget:    Maximum memory used by the kept searches, in bytes.
+            * nbytes:    Memory currently used by the kept searches, in bytes.
+            * hits:      Number of lookups answered by a kept search.
+            * misses:    Number of lookups that needed a new search.
+            * evictions: Number of searches evicted to stay within the budget.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:   Self,
+                   budget: Integral = DEFAULT_BUDGET
+                 ) ->      Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * budget: Maximum memory used by the kept searches, in bytes.
+            Out:
+                * A new instance of the class.
+        """
+
+        # Inherit from parent class
+        super().__init__()
+
+        # Kept searches, from the least to the most recently used
+        self.budget = budget
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._searches = collections.OrderedDict()
+
+    #############################################################################################################################################
+    #                                                                  METHODS                                                                  #
+    #############################################################################################################################################
+
+    def lookup ( self:    Self,
+                 key:     str,
+                 source:  Integral,
+                 targets: Iterable[Integral],
+                 engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+               ) ->       Optional[Tuple[Dict[Integral, Integral], array.array]]:
+
+        """
+            Returns a kept search from a source that has settled all given targets, if any.
+            In:
+                * self:    Reference to the current object.
+                * key:     Key of the maze, as returned by maze_key.
+                * source:  The source vertex of the search.
+                * targets: The vertices to reach.
+                * engine:  Priority queue of the search (ties are broken differently by each engine).
+            Out:
+                * search: None, or the distances to the settled targets and the predecessors, as returned by multi_target_dijkstra (the returned objects must not be modified).
+        """
+
+        # The kept search must cover all targets
+        search = self._searches.get((key, source, engine))
+        if search is None or any(target not in search[0] for target in targets):
+            self.misses += 1
+            return None
+
+        # Mark the search as the most recently used
+        self._searches.move_to_end((key, source, engine))
+        self.hits += 1
+        return search[:2]
+
+    #############################################################################################################################################
+
+    def store ( self:             Self,
+                key:              str,
+                source:           Integral,
+                engine:           ShortestPathEngine,
+                target_distances: Dict[Integral, Integral],
+                predecessors:     array.array
+              ) ->                None:
+
+        """
+            Keeps the result of a search, and evicts the least recently used searches if the budget is exceeded.
+            A kept search from the same source is only replaced if the new one has settled at least as many targets.
+            In:
+                * self:             Reference to the current object.
+                * key:              Key of the maze, as returned by maze_key.
+                * source:           The source vertex of the search.
+                * engine:           Priority queue of the search.
+                * target_distances: The distances to the settled targets, as returned by multi_target_dijkstra.
+                * predecessors:     The array of predecessors, as returned by multi_target_dijkstra.
+            Out:
+                * None.
+        """
+
+        # Replace a smaller search
+        previous = self._searches.get((key, source, engine))
+        if previous is not None:
+            if len(previous[0]) > len(target_distances):
+                return
+            self.nbytes -= previous[2]
+            del self._searches[(key, source, engine)]
+        nbytes = sys.getsizeof(target_distances) + predecessors.itemsize * len(predecessors)
+        self._searches[(key, source, engine)] = (target_distances, predecessors, nbytes)
+        self.nbytes += nbytes
+
+        # Evict the least recently used searches
+        while self.nbytes > self.budget and len(self._searches) > 0:
+            _, (_, _, nbytes) = self._searches.popitem(last=False)
+            self.nbytes -= nbytes
+            self.evictions += 1
+
+    #############################################################################################################################################
+
+    def search ( self:    Self,
+                 graph:   Union[Maze, MazeGraph],
+                 source:  Integral,
+                 targets: Iterable[Integral],
+                 engine:  ShortestPathEngine = ShortestPathEngine.HEAP,
+                 key:     Optional[str] = None
+               ) ->       Tuple[Dict[Integral, Integral], array.array]:
+
+        """
+            Returns a kept search from a source that has settled all given targets, or runs and keeps a new one.
+            In:
+                * self:    Reference to the current object.
+                * graph:   The graph to search.
+                * source:  The source vertex of the search.
+                * targets: The vertices to reach.
+                * engine:  Priority queue to use, as in multi_target_dijkstra.
+                * key:     Key of the maze, as returned by maze_key (computed if None, callers searching often should compute it once).
+            Out:
+                * target_distances: The distances from the source to the settled targets (possibly more targets than asked).
+                * predecessors:     Array giving the parent of each explored cell, see predecessors_to_route.
+        """
+
+        # Search only on a miss
+        targets = list(targets)
+        key = maze_key(graph) if key is None else key
+        search = self.lookup(key, source, targets, engine)
+        if search is None:
+            search = multi_target_dijkstra(graph, source, targets, engine)
+            self.store(key, source, engine, *search)
+        return search
+
+    #############################################################################################################################################
+
+    def clear ( self: Self,
+              ) ->    None:
+
+        """
+            Forgets all kept searches and resets the counters.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Empty the cache
+        self._searches.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #############################################################################################################################################
+
+    def __len__ ( self: Self,
+                ) ->    Integral:
+
+        """
+            Returns the number of kept searches.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * length: Number of kept searches.
+        """
+
+        # Number of entries
+        return len(self._searches)
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+# Cache shared by all players of this process
+_CACHE = ShortestPathTreeCache()
+
+#####################################################################################################################################################
+
+def shortest_path_tree_cache ( ) -> ShortestPathTreeCache:
+
+    """
+        Returns the cache of searches shared by all players of this process, e.g., to read its counters or to change its budget.
+        Players of a game in MATCH mode run in their own processes, so they do not share it.
+        In:
+            * None.
+        Out:
+            * cache: The cache of the process.
+    """
+
+    # Single instance
+    return _CACHE
+
+#####################################################################################################################################################
+#####################################################################################################################################################
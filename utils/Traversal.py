@@ -54,6 +54,7 @@ class Traversal (abc.ABC):
         # Calling traversal will set these attributes
         self.routing_table = None
         self.distances = None
+        self.source = None
        
     #############################################################################################################################################
     #                                                                  METHODS                                                                  #
@@ -66,17 +67,19 @@ class Traversal (abc.ABC):
 
         """
             This method performs a traversal of a graph.
-            It computes the distances from the source to all other vertices.
+            It computes the distances from the source to all other vertices, counting moves (weights are ignored).
             It also computes the routing table, that is, the parent of each vertex in the traversal.
+            Weighted traversals are defined in DijkstraTraversal, which redefines this method.
             In:
                 * self:   Reference to the current object.
-                * graph:  The graph to traverse.
+                * graph:  The graph to traverse (a maze, or a MazeGraph snapshot of it, which is faster to query).
                 * source: The source vertex of the traversal.
             Out:
                 * None.
         """
 
         # Initialization
+        self.source = source
         self.routing_table = {source:None}
         self.distances = {source:0}
         visited=set()
@@ -111,7 +114,9 @@ class Traversal (abc.ABC):
 
         # Debug
         assert(self.routing_table is not None) # Should not be called before traversal
-        source=list(self.routing_table.keys())[0]
+
+        # Backtrack from the target to the source kept by traversal
+        source=self.source
         route=[]
         current_vertex=target
         while current_vertex!=source:
@@ -0,0 +1,240 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful functions to compute breadth-first distance fields with NumPy.
+    Instead of visiting cells one at a time, all cells of the frontier are moved in the four directions at once, using wall masks of the grid.
+    Several sources are processed together, each one in its own row of the result, so all cheese-to-cheese distances come from a single computation.
+    With bit_parallel_bfs, up to 64 sources share the same frontier, as the sources that reached a cell are stored as bits of a single integer.
+    Distances count moves, so they are shortest-path distances only in mazes without mud.
+    No player calls bfs_distance_field, which is only exercised by games/compare_time_vectorized_BFS.py.
+    Meta-graphs of mazes without mud use bit_parallel_bfs instead, through unit_weight_searches in shortest_paths.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import numpy
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def wall_masks ( graph: Union[Maze, MazeGraph]
+               ) ->     Tuple[List[Integral], List[numpy.ndarray]]:
+
+    """
+        This function computes, for each of the four moves, the cells from which the move is possible.
+        They are obtained from the CSR arrays of the snapshot, as the offset between a cell and its neighbor gives the direction of the move.
+        In:
+            * graph: The maze to analyze.
+        Out:
+            * offsets: The offset of the index of a cell when moving up, down, left and right.
+            * masks:   For each move, a boolean array over cells telling if the move is possible (no wall and a cell on the other side).
+    """
+
+    # Offset of each edge, from its origin to its end
+    maze_graph = as_maze_graph(graph)
+    origins = numpy.repeat(numpy.arange(maze_graph.nb_cells, dtype=numpy.int32), numpy.diff(maze_graph.indptr))
+    edge_offsets = maze_graph.indices - origins
+
+    # One mask per direction
+    offsets = [-maze_graph.width, maze_graph.width, -1, 1]
+    masks = []
+    for offset in offsets:
+        mask = numpy.zeros(maze_graph.nb_cells, dtype=bool)
+        mask[origins[edge_offsets == offset]] = True
+        masks.append(mask)
+    return offsets, masks
+
+#####################################################################################################################################################
+
+def bfs_distance_field ( graph:   Union[Maze, MazeGraph],
+                         sources: Union[Integral, Iterable[Integral]]
+                       ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        This function computes the number of moves from one or several sources to every cell of the maze, level by level.
+        The frontier of all sources is stored as a single array of keys source_index * nb_cells + cell.
+        At each level, keys are shifted by the offset of each possible move, and keys already reached are discarded.
+        When a cell is reached from several cells of the frontier, the parent is the first one in the order up, down, left, right.
+        In:
+            * graph:   The maze to traverse.
+            * sources: A source vertex, or a list of source vertices.
+        Out:
+            * distances: Array of int32 with the number of moves from the source to each cell (-1 if not reachable), of shape (nb_sources, nb_cells) if several sources are given, (nb_cells,) otherwise.
+            * parents:   Array of int32 with the parent of each cell in the traversal (-1 for the source and unreachable cells), with the same shape.
+    """
+
+    # Initialization
+    maze_graph = as_maze_graph(graph)
+    nb_cells = maze_graph.nb_cells
+    offsets, masks = wall_masks(maze_graph)
+    single_source = isinstance(sources, Integral)
+    sources = numpy.atleast_1d(numpy.asarray(sources, dtype=numpy.int64))
+    distances = numpy.full(len(sources) * nb_cells, -1, dtype=numpy.int32)
+    parents = numpy.full(len(sources) * nb_cells, -1, dtype=numpy.int32)
+
+    # All sources start at level 0
+    frontier = numpy.arange(len(sources), dtype=numpy.int64) * nb_cells + sources
+    distances[frontier] = 0
+    level = 0
+
+    # Expand all frontiers together
+    while len(frontier) > 0:
+        level += 1
+        cells = frontier % nb_cells
+
+        # Move the frontier in each direction, a move never leaves the row of its source
+        candidates = []
+        candidate_parents = []
+        for offset, mask in zip(offsets, masks):
+            possible = mask[cells]
+            candidates.append(frontier[possible] + offset)
+            candidate_parents.append(cells[possible])
+        candidates = numpy.concatenate(candidates)
+        candidate_parents = numpy.concatenate(candidate_parents)
+
+        # Keep cells reached for the first time, once each
+        unseen = distances[candidates] == -1
+        frontier, first = numpy.unique(candidates[unseen], return_index=True)
+        distances[frontier] = level
+        parents[frontier] = candidate_parents[unseen][first]
+
+    # One row per source
+    if single_source:
+        return distances, parents
+    return distances.reshape(len(sources), nb_cells), parents.reshape(len(sources), nb_cells)
+
+#####################################################################################################################################################
+
+def bit_parallel_bfs ( graph:   Union[Maze, MazeGraph],
+                       sources: Iterable[Integral]
+                     ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        This function computes the number of moves between all pairs of sources, with a bit-parallel BFS.
+        Each cell holds a 64-bit integer, whose bit i tells if source i has reached it, so 64 searches advance together at each level.
+        Moving the frontier is a bitwise or of the bits of its cells into their neighbors, and bits already set in a cell are discarded.
+        New bits are stored per direction of the move that brought them, which is enough to rebuild routes with bit_parallel_route.
+        Bits are only unpacked when they reach a source, to fill the distance matrix.
+        Sources are processed by groups of 64.
+        In:
+            * graph:   The maze to traverse.
+            * sources: The list of source vertices.
+        Out:
+            * distances: Array of int32 of shape (nb_sources, nb_sources) with the number of moves between sources (-1 if not reachable).
+            * parents:   Array of uint64 of shape (nb_groups, 4, nb_cells), where bit i % 64 of parents[i // 64, d, cell] tells if source i reached the cell with move d of wall_masks.
+    """
+
+    # Initialization
+    maze_graph = as_maze_graph(graph)
+    nb_cells = maze_graph.nb_cells
+    offsets, masks = wall_masks(maze_graph)
+    sources = [int(source) for source in sources]
+    nb_groups = (len(sources) + 63) // 64
+    distances = numpy.full((len(sources), len(sources)), -1, dtype=numpy.int32)
+    parents = numpy.zeros((nb_groups, 4, nb_cells), dtype=numpy.uint64)
+
+    # Indices of the sources on each cell, to fill the distance matrix when bits reach them
+    is_source = numpy.zeros(nb_cells, dtype=bool)
+    is_source[sources] = True
+    source_indices = {}
+    for index, source in enumerate(sources):
+        source_indices.setdefault(source, []).append(index)
+
+    # Groups of 64 sources
+    for group in range(nb_groups):
+        group_sources = sources[64 * group:64 * (group + 1)]
+
+        # Bits of the sources, merged if several sources are on the same cell
+        visited = numpy.zeros(nb_cells, dtype=numpy.uint64)
+        for bit, source in enumerate(group_sources):
+            visited[source] |= numpy.uint64(1 << bit)
+            distances[64 * group + bit, source_indices[source]] = 0
+        frontier_cells = numpy.unique(group_sources)
+        frontier_bits = visited[frontier_cells]
+        reached = numpy.zeros(nb_cells, dtype=numpy.uint64)
+        level = 0
+
+        # Expand all frontiers together
+        while len(frontier_cells) > 0:
+            level += 1
+            for direction, (offset, mask) in enumerate(zip(offsets, masks)):
+
+                # Bits moved in this direction that are new for their cell, each cell is reached at most once per direction
+                possible = mask[frontier_cells]
+                targets = frontier_cells[possible] + offset
+                new_bits = frontier_bits[possible] & ~visited[targets]
+                nonzero = new_bits != 0
+                targets, new_bits = targets[nonzero], new_bits[nonzero]
+                visited[targets] |= new_bits
+                reached[targets] |= new_bits
+                parents[group, direction, targets] |= new_bits
+
+                # Unpack the bits that reach sources
+                hits = is_source[targets]
+                for cell, bits in zip(targets[hits].tolist(), new_bits[hits].tolist()):
+                    while bits != 0:
+                        bit = (bits & -bits).bit_length() - 1
+                        distances[64 * group + bit, source_indices[cell]] = level
+                        bits &= bits - 1
+
+            # Next frontier, cells reached from several directions appear once
+            frontier_cells = numpy.flatnonzero(reached)
+            frontier_bits = reached[frontier_cells]
+            reached[frontier_cells] = 0
+
+    # Return the result
+    return distances, parents
+
+#####################################################################################################################################################
+
+def bit_parallel_route ( graph:        Union[Maze, MazeGraph],
+                         parents:      numpy.ndarray,
+                         source_index: Integral,
+                         source:       Integral,
+                         target:       Integral
+                       ) ->            List[Integral]:
+
+    """
+        This function finds the route from a source to a target using the parents returned by bit_parallel_bfs.
+        From the target, we follow backwards the move that brought the bit of the source, which is unique.
+        In:
+            * graph:        The maze that was traversed.
+            * parents:      The parents returned by bit_parallel_bfs.
+            * source_index: The index of the source in the list given to bit_parallel_bfs.
+            * source:       The source vertex.
+            * target:       The target vertex, that must be reachable from the source.
+        Out:
+            * route: The route from the source to the target.
+    """
+
+    # Moves that brought the bit of the source to each cell
+    offsets, _ = wall_masks(graph)
+    group, bit = divmod(source_index, 64)
+    source_bit = numpy.uint64(1 << bit)
+    group_parents = parents[group]
+
+    # Backtrack from the target to the source
+    route = [target]
+    while route[-1] != source:
+        cell = route[-1]
+        for direction in range(4):
+            if group_parents[direction, cell] & source_bit:
+                route.append(cell - offsets[direction])
+                break
+    return route[::-1]
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,151 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful functions to generate seeded mazes quickly, for benchmarks.
+    PyRat random mazes take minutes to generate at 100x100, so we generate the adjacency dictionary directly.
+    Mazes have the same parameters as in PyRat (cell, wall and mud percentages, mud range) and are always connected.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import random
+
+# PyRat imports
+from MazeGraph import MazeGraph
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def random_maze_dict ( width:           Integral,
+                       height:          Integral,
+                       cell_percentage: Number = 80.0,
+                       wall_percentage: Number = 60.0,
+                       mud_percentage:  Number = 20.0,
+                       mud_range:       Tuple[Integral, Integral] = (4, 9),
+                       random_seed:     Optional[Integral] = None
+                     ) ->               Dict[Integral, Dict[Integral, Integral]]:
+
+    """
+        Generates a random connected maze as an adjacency dictionary.
+        Cells are grown as a connected region from a random cell, then a random spanning tree connects them.
+        Among the remaining pairs of adjacent cells, wall_percentage are walls and the others are open.
+        Then, mud_percentage of the edges get a random weight in mud_range.
+        In:
+            * width:           Width of the maze.
+            * height:          Height of the maze.
+            * cell_percentage: Percentage of cells of the grid that are in the maze.
+            * wall_percentage: Percentage of walls among the pairs of adjacent cells not needed for connectivity.
+            * mud_percentage:  Percentage of edges with mud.
+            * mud_range:       Bounds of the weights of edges with mud.
+            * random_seed:     Seed of the random generator.
+        Out:
+            * adjacency: Dictionary associating each cell with a dictionary of its neighbors and weights.
+    """
+
+    # Neighbors of a cell in the grid
+    generator = random.Random(random_seed)
+    def grid_neighbors (cell):
+        row, col = divmod(cell, width)
+        if row > 0: yield cell - width
+        if row < height - 1: yield cell + width
+        if col > 0: yield cell - 1
+        if col < width - 1: yield cell + 1
+
+    # Grow a connected region of cells
+    nb_cells = max(2, round(width * height * cell_percentage / 100.0))
+    start = generator.randrange(width * height)
+    cells = {start}
+    frontier = list(grid_neighbors(start))
+    while len(cells) < nb_cells and len(frontier) > 0:
+        index = generator.randrange(len(frontier))
+        frontier[index], frontier[-1] = frontier[-1], frontier[index]
+        cell = frontier.pop()
+        if cell not in cells:
+            cells.add(cell)
+            frontier.extend(neighbor for neighbor in grid_neighbors(cell) if neighbor not in cells)
+
+    # Random spanning tree with a randomized depth-first search
+    tree_edges = set()
+    visited = {start}
+    stack = [start]
+    while len(stack) > 0:
+        cell = stack[-1]
+        candidates = [neighbor for neighbor in grid_neighbors(cell) if neighbor in cells and neighbor not in visited]
+        if len(candidates) == 0:
+            stack.pop()
+            continue
+        neighbor = generator.choice(candidates)
+        visited.add(neighbor)
+        tree_edges.add((min(cell, neighbor), max(cell, neighbor)))
+        stack.append(neighbor)
+
+    # Open some of the other pairs of adjacent cells
+    other_pairs = sorted((cell, neighbor) for cell in cells for neighbor in grid_neighbors(cell) if neighbor in cells and cell < neighbor and (cell, neighbor) not in tree_edges)
+    generator.shuffle(other_pairs)
+    nb_open = round(len(other_pairs) * (100.0 - wall_percentage) / 100.0)
+    edges = sorted(tree_edges) + other_pairs[:nb_open]
+
+    # Add mud and build the dictionary
+    adjacency = {cell: {} for cell in sorted(cells)}
+    for cell, neighbor in edges:
+        weight = generator.randint(mud_range[0], mud_range[1]) if generator.random() * 100.0 < mud_percentage else 1
+        adjacency[cell][neighbor] = weight
+        adjacency[neighbor][cell] = weight
+    return adjacency
+
+#####################################################################################################################################################
+
+def random_maze_graph ( width:    Integral,
+                        height:   Integral,
+                        *args:    Any,
+                        **kwargs: Any
+                      ) ->        MazeGraph:
+
+    """
+        Generates a random connected maze, directly as a MazeGraph snapshot.
+        In:
+            * width:  Width of the maze.
+            * height: Height of the maze.
+            * args:   Arguments to pass to random_maze_dict.
+            * kwargs: Keyword arguments to pass to random_maze_dict.
+        Out:
+            * maze_graph: Snapshot of the generated maze.
+    """
+
+    # Generate and wrap
+    adjacency = random_maze_dict(width, height, *args, **kwargs)
+    return MazeGraph.from_dict(adjacency, width, height)
+
+#####################################################################################################################################################
+
+def maze_corpus ( sizes:    List[Tuple[Integral, Integral]],
+                  nb_mazes: Integral,
+                  **kwargs: Any
+                ) ->        Dict[Tuple[Integral, Integral], List[MazeGraph]]:
+
+    """
+        Generates a corpus of seeded mazes for several sizes.
+        Seeds are 0 to nb_mazes - 1 for each size, so that the corpus is the same at each run.
+        In:
+            * sizes:    List of (width, height) pairs.
+            * nb_mazes: Number of mazes for each size.
+            * kwargs:   Keyword arguments to pass to random_maze_dict.
+        Out:
+            * corpus: Dictionary associating each size with its list of mazes.
+    """
+
+    # One list per size
+    corpus = {size: [random_maze_graph(size[0], size[1], random_seed=seed, **kwargs) for seed in range(nb_mazes)] for size in sizes}
+    return corpus
+
+#####################################################################################################################################################
+#####################################################################################################################################################
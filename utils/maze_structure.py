@@ -0,0 +1,352 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful functions to analyze the structure of a maze, with a depth-first search and its low points (Tarjan's algorithm).
+    A vertex v separates the subtree of its child w in the search tree from the rest of the maze when low[w] >= discovery[v].
+    This gives articulation points and biconnected components, and also the parts of the maze that a route can only enter and leave through one cell.
+    Such parts without pieces of cheese can be pruned from all searches, as no shortest route between pieces of cheese crosses them.
+    Pieces of cheese in tree-like parts (pockets) are all collected by a single excursion, that can replace them in a meta-graph.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+
+# PyRat imports
+from pyrat import Graph, Maze
+from MazeGraph import MazeGraph, as_maze_graph
+from Excursion import Excursion
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def dfs_lowpoints ( graph: Graph,
+                    root:  Integral
+                  ) ->     Tuple[List[Integral], Dict[Integral, Optional[Integral]], Dict[Integral, Integral], Dict[Integral, Integral]]:
+
+    """
+        This function performs an iterative depth-first search from a root, and computes the low point of each vertex.
+        The low point of a vertex is the smallest discovery index reachable from its subtree with at most one non-tree edge.
+        In:
+            * graph: The graph to explore, only its get_neighbors method is used.
+            * root:  The root of the search.
+        Out:
+            * order:     The vertices reachable from the root, in discovery order.
+            * parents:   The parent of each vertex in the search tree (None for the root).
+            * discovery: The discovery index of each vertex.
+            * low:       The low point of each vertex.
+    """
+
+    # Initialization
+    order = [root]
+    parents = {root: None}
+    discovery = {root: 0}
+    low = {root: 0}
+    stack = [(root, iter(graph.get_neighbors(root)))]
+
+    # Explore the first undiscovered neighbor, or go back to the parent
+    while len(stack) > 0:
+        vertex, neighbors = stack[-1]
+        for neighbor in neighbors:
+            if neighbor not in discovery:
+                parents[neighbor] = vertex
+                discovery[neighbor] = low[neighbor] = len(order)
+                order.append(neighbor)
+                stack.append((neighbor, iter(graph.get_neighbors(neighbor))))
+                break
+            elif neighbor != parents[vertex]:
+                low[vertex] = min(low[vertex], discovery[neighbor])
+        else:
+            stack.pop()
+            if parents[vertex] is not None:
+                low[parents[vertex]] = min(low[parents[vertex]], low[vertex])
+    return order, parents, discovery, low
+
+#####################################################################################################################################################
+
+def biconnected_components ( graph: Graph
+                           ) ->     Tuple[Set[Integral], List[Set[Integral]]]:
+
+    """
+        This function computes the articulation points and biconnected components of a graph.
+        A tree edge (v, w) starts a new component when low[w] >= discovery[v], and belongs to the component of the tree edge above v otherwise.
+        In:
+            * graph: The graph to analyze.
+        Out:
+            * articulation_points: The vertices whose removal disconnects the graph.
+            * components:          The vertices of each biconnected component (a bridge is a component with two vertices).
+    """
+
+    # Search from each vertex not explored yet
+    articulation_points = set()
+    components = []
+    explored = set()
+    for root in graph.vertices:
+        if root in explored:
+            continue
+        order, parents, discovery, low = dfs_lowpoints(graph, root)
+        explored.update(order)
+
+        # Assign each tree edge, identified by its child, to a component
+        component_of = {}
+        nb_root_children = 0
+        for child in order[1:]:
+            parent = parents[child]
+            if low[child] >= discovery[parent]:
+                component_of[child] = len(components)
+                components.append({parent, child})
+                if parent == root:
+                    nb_root_children += 1
+                else:
+                    articulation_points.add(parent)
+            else:
+                component_of[child] = component_of[parent]
+                components[component_of[parent]].add(child)
+
+        # The root is an articulation point if it has several children
+        if nb_root_children > 1:
+            articulation_points.add(root)
+    return articulation_points, components
+
+#####################################################################################################################################################
+
+def prune_dead_ends ( graph: Union[Maze, MazeGraph],
+                      keep:  Iterable[Integral]
+                    ) ->     MazeGraph:
+
+    """
+        This function removes from a maze all the parts separated from the cells to keep by an articulation point.
+        They are dead ends (not only corridors, but any subgraph entered and left through a single cell), that no shortest route between kept cells crosses.
+        The result is a snapshot, on which all searches can run as on the full maze.
+        In:
+            * graph: The maze to prune.
+            * keep:  The cells to keep, typically the pieces of cheese and the player.
+        Out:
+            * pruned_graph: The snapshot of the maze without these dead ends.
+    """
+
+    # Search from a kept cell
+    maze_graph = as_maze_graph(graph)
+    keep = set(keep)
+    order, parents, discovery, low = dfs_lowpoints(maze_graph, next(iter(keep)))
+
+    # Count kept cells in each subtree
+    nb_kept = {vertex: int(vertex in keep) for vertex in order}
+    for vertex in reversed(order[1:]):
+        nb_kept[parents[vertex]] += nb_kept[vertex]
+
+    # Remove the separated subtrees without kept cells
+    removed = set()
+    for vertex in order[1:]:
+        parent = parents[vertex]
+        if parent in removed or (low[vertex] >= discovery[parent] and nb_kept[vertex] == 0):
+            removed.add(vertex)
+
+    # Build the pruned snapshot
+    adjacency = {vertex: {neighbor: weight for neighbor, weight in maze_graph.edges[vertex] if neighbor not in removed} for vertex in order if vertex not in removed}
+    return MazeGraph.from_dict(adjacency, maze_graph.width, maze_graph.height)
+
+#####################################################################################################################################################
+
+def find_excursions ( graph:            Union[Maze, MazeGraph],
+                      source:           Integral,
+                      pieces_of_cheese: List[Integral],
+                      min_size:         Integral = 2
+                    ) ->                List[Excursion]:
+
+    """
+        This function finds the tree-like pockets of the maze that contain pieces of cheese, and the excursion that collects them.
+        A pocket is a subtree of the search from the source that has no non-tree edge, so it is only connected to the rest of the maze by a bridge.
+        Pockets attached to the same cell are merged into a single excursion.
+        The excursion walks the smallest subtree that contains the pieces of cheese, and its cost is twice the weight of this subtree.
+        Branches are walked by increasing depth of their farthest piece of cheese, so that the last piece of cheese is the farthest one.
+        This makes the exit as long as possible, which is the part saved if the excursion is the last one.
+        In:
+            * graph:            The maze to analyze.
+            * source:           The location of the player, that is never in a pocket.
+            * pieces_of_cheese: The pieces of cheese to collect.
+            * min_size:         The minimum number of pieces of cheese for which an excursion is created.
+        Out:
+            * excursions: The excursions, each one replacing several pieces of cheese.
+    """
+
+    # Search from the source
+    maze_graph = as_maze_graph(graph)
+    order, parents, discovery, low = dfs_lowpoints(maze_graph, source)
+    cheese = set(pieces_of_cheese)
+
+    # Depth of each vertex in the search tree, which is its distance to any ancestor inside a pocket
+    children = {vertex: [] for vertex in order}
+    depths = {source: 0}
+    for vertex in order[1:]:
+        children[parents[vertex]].append(vertex)
+        depths[vertex] = depths[parents[vertex]] + maze_graph.get_weight(parents[vertex], vertex)
+
+    # Count non-tree edges and pieces of cheese in each subtree, and find the depth of the farthest piece of cheese
+    nb_cycles = {vertex: len(maze_graph.get_neighbors(vertex)) - len(children[vertex]) - int(vertex != source) for vertex in order}
+    nb_cheese = {vertex: int(vertex in cheese) for vertex in order}
+    farthest = {vertex: depths[vertex] if vertex in cheese else -1 for vertex in order}
+    for vertex in reversed(order[1:]):
+        parent = parents[vertex]
+        nb_cycles[parent] += nb_cycles[vertex]
+        nb_cheese[parent] += nb_cheese[vertex]
+        farthest[parent] = max(farthest[parent], farthest[vertex])
+
+    # Highest tree-like subtrees with cheese, grouped by the cell they are attached to
+    pockets = {}
+    for vertex in order[1:]:
+        parent = parents[vertex]
+        if nb_cycles[vertex] == 0 and nb_cheese[vertex] > 0 and (parent == source or nb_cycles[parent] > 0):
+            pockets.setdefault(parent, []).append(vertex)
+
+    # Walk each group of pockets, deepest branches last
+    excursions = []
+    for root, tops in pockets.items():
+        if sum(nb_cheese[top] for top in tops) < min_size:
+            continue
+        route = [root]
+        stack = [(root, iter(sorted(tops, key=farthest.get)))]
+        while len(stack) > 0:
+            vertex, next_children = stack[-1]
+            child = next(next_children, None)
+            if child is None:
+                stack.pop()
+                if len(stack) > 0:
+                    route.append(stack[-1][0])
+            else:
+                route.append(child)
+                stack.append((child, iter(sorted([grandchild for grandchild in children[child] if nb_cheese[grandchild] > 0], key=farthest.get))))
+
+        # Split the walk where the last piece of cheese (the farthest one) is first reached, cells being crossed again when going back up
+        first_visits = {}
+        for index, cell in enumerate(route):
+            if cell in cheese and cell != root:
+                first_visits.setdefault(cell, index)
+        collected = list(first_visits)
+        end_index = max(first_visits.values())
+        entry_route, exit_route = route[:end_index + 1], route[end_index:]
+        entry_cost = sum(maze_graph.get_weight(cell, next_cell) for cell, next_cell in zip(entry_route, entry_route[1:]))
+        exit_cost = sum(maze_graph.get_weight(cell, next_cell) for cell, next_cell in zip(exit_route, exit_route[1:]))
+        excursions.append(Excursion(collected, entry_route, exit_route, entry_cost, exit_cost))
+    return excursions
+
+#####################################################################################################################################################
+
+def reduce_maze ( graph:            Union[Maze, MazeGraph],
+                  source:           Integral,
+                  pieces_of_cheese: List[Integral]
+                ) ->                Tuple[MazeGraph, List[Excursion], List[Integral]]:
+
+    """
+        This function prepares the searches of a TSP solver with the structural analysis of the maze.
+        Dead ends without cheese are pruned, then excursions are found, and their pockets are pruned too, as no search needs to enter them anymore.
+        In:
+            * graph:            The maze to analyze.
+            * source:           The location of the player.
+            * pieces_of_cheese: The pieces of cheese to collect.
+        Out:
+            * search_graph: The snapshot on which to build the meta-graph.
+            * excursions:   The excursions found by find_excursions.
+            * targets:      The cells to give to the meta-graph, as returned by excursion_targets.
+    """
+
+    # Prune, find excursions, and prune again
+    pruned_graph = prune_dead_ends(graph, pieces_of_cheese + [source])
+    excursions = find_excursions(pruned_graph, source, pieces_of_cheese)
+    targets = excursion_targets(source, pieces_of_cheese, excursions)
+    search_graph = prune_dead_ends(pruned_graph, targets + [source]) if len(excursions) > 0 else pruned_graph
+    return search_graph, excursions, targets
+
+#####################################################################################################################################################
+
+def node_cell ( node: Union[Integral, Excursion]
+              ) ->    Integral:
+
+    """
+        This function returns the cell where the player is after visiting a node of a meta-graph, which is the last piece of cheese for an excursion.
+        In:
+            * node: A cell or an excursion.
+        Out:
+            * cell: The corresponding cell.
+    """
+
+    # Excursions end at their last piece of cheese
+    return node.end if isinstance(node, Excursion) else node
+
+#####################################################################################################################################################
+
+def excursion_targets ( source:           Integral,
+                        pieces_of_cheese: List[Integral],
+                        excursions:       List[Excursion]
+                      ) ->                List[Integral]:
+
+    """
+        This function lists the cells between which shortest routes are needed when excursions are used.
+        They are the pieces of cheese that are not in an excursion, and the roots of excursions, without duplicates and without the source.
+        In:
+            * source:           The location of the player.
+            * pieces_of_cheese: The pieces of cheese to collect.
+            * excursions:       The excursions found by find_excursions.
+        Out:
+            * targets: The cells to give to a meta-graph, in addition to the source.
+    """
+
+    # Cells that remain nodes of the meta-graph
+    in_excursion = {cell for excursion in excursions for cell in excursion.pieces_of_cheese}
+    cells = [cell for cell in pieces_of_cheese if cell not in in_excursion] + [excursion.root for excursion in excursions]
+    return [cell for cell in dict.fromkeys(cells) if cell != source]
+
+#####################################################################################################################################################
+
+def compress_excursions ( meta_graph:       Dict[Integral, Dict[Integral, Tuple[Integral, List[Integral]]]],
+                          source:           Integral,
+                          pieces_of_cheese: List[Integral],
+                          excursions:       List[Excursion]
+                        ) ->                Tuple[Dict[Any, Dict[Any, Tuple[Integral, List[Integral]]]], List[Any]]:
+
+    """
+        This function builds a meta-graph in which excursions replace the pieces of cheese they collect.
+        Going to an excursion costs the distance to its root plus its entry, and leaving it costs its exit plus the distance from its root.
+        This way, the length of any path in the meta-graph is the length of the corresponding route, even if it ends with an excursion.
+        The meta-graph is not symmetric anymore, but it has the same format as before, so TSP solvers can use it unchanged.
+        In:
+            * meta_graph:       A meta-graph over the source and the cells given by excursion_targets.
+            * source:           The location of the player.
+            * pieces_of_cheese: The pieces of cheese to collect.
+            * excursions:       The excursions found by find_excursions.
+        Out:
+            * compressed_graph: The meta-graph over the source, the remaining pieces of cheese, and the excursions.
+            * nodes:            The nodes to visit (remaining pieces of cheese and excursions).
+    """
+
+    # Nodes to visit
+    in_excursion = {cell for excursion in excursions for cell in excursion.pieces_of_cheese}
+    nodes = [cell for cell in dict.fromkeys(pieces_of_cheese) if cell not in in_excursion] + excursions
+
+    # Routes between nodes, through the roots of excursions
+    compressed_graph = {}
+    for node in [source] + nodes:
+        compressed_graph[node] = {}
+        for other_node in nodes:
+            if other_node is node:
+                continue
+            cell = node.root if isinstance(node, Excursion) else node
+            other_cell = other_node.root if isinstance(other_node, Excursion) else other_node
+            distance, route = meta_graph[cell][other_cell] if cell != other_cell else (0, [cell])
+            if isinstance(node, Excursion):
+                distance, route = node.exit_cost + distance, node.exit_route + route[1:]
+            if isinstance(other_node, Excursion):
+                distance, route = distance + other_node.entry_cost, route + other_node.entry_route[1:]
+            compressed_graph[node][other_node] = (distance, route)
+    return compressed_graph, nodes
+
+#####################################################################################################################################################
+#####################################################################################################################################################
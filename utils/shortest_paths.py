@@ -0,0 +1,769 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains useful functions to compute shortest paths in a maze.
+    All traversals share the signature traversal(graph, source, targets) of the players, where graph is a maze or a MazeGraph snapshot.
+    They return the distances to explored vertices and the routing table, and stop as soon as all targets are reached.
+    The engine to use can be chosen with the ShortestPathEngine enumeration.
+    For a single target, point_to_point searches from both ends and explores much less of the maze.
+    Meta-graphs use multi_target_dijkstra, which only returns the distances to the targets and a compact array of predecessors.
+    When only the closest targets matter, nearest_target stops the same search as soon as they are settled.
+    A single search from many sources at once, voronoi_regions, labels each cell with its closest source, as needed by approximate meta-graphs.
+    In mazes without mud, unit_weight_searches replaces all these searches with a single bit-parallel BFS.
+    With the SCIPY engine, scipy_searches runs all these searches in a single call to scipy.sparse.csgraph, and batched_searches chooses between both.
+    A* searches (astar and astar_nearest) are guided by the Manhattan distance on the grid, which never overestimates as every move costs at least 1.
+    They also accept any other consistent lower bound, such as the one of a LandmarkOracle.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+from typing import *
+from typing_extensions import *
+from numbers import *
+import enum
+import heapq
+import math
+import array
+import numpy
+
+# Scipy is an optional dependency
+try:
+    import scipy.sparse
+    import scipy.sparse.csgraph
+except ImportError:
+    pass
+
+# PyRat imports
+from pyrat import Maze
+from MazeGraph import MazeGraph, as_maze_graph
+from grid_bfs import wall_masks, bit_parallel_bfs
+
+#####################################################################################################################################################
+##################################################################### CONSTANTS #####################################################################
+#####################################################################################################################################################
+
+# Minimum number of sources times number of vertices for which unit_weight_searches uses the bit-parallel BFS
+# Below, one multi_target_dijkstra per source is faster (measured on 15x13 to 100x100 mazes)
+BIT_PARALLEL_MIN_WORK = 50000
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class ShortestPathEngine (enum.Enum):
+
+    """
+        This enumeration defines all the shortest-path engines that players can use.
+        Values:
+            * HEAP: Dijkstra's algorithm with a binary heap (heapq).
+            * DIAL: Dijkstra's algorithm with a circular bucket queue (Dial's algorithm), for small integer weights.
+            * SCIPY: Dijkstra's algorithm compiled in scipy.sparse.csgraph, on a sparse matrix of the maze (falls back to DIAL if scipy is not installed).
+    """
+
+    HEAP = "heap"
+    DIAL = "dial"
+    SCIPY = "scipy"
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def heap_traversal ( graph:   Union[Maze, MazeGraph],
+                     source:  Integral,
+                     targets: Optional[Iterable[Integral]] = None
+                   ) ->       Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
+
+    """
+        This function performs a Dijkstra traversal of a graph, using a binary heap.
+        It stops when all the targets are visited, or when all vertices are visited if no targets are given.
+        In:
+            * graph:   The graph to traverse.
+            * source:  The source vertex of the traversal.
+            * targets: The vertices to reach (all vertices if None).
+        Out:
+            * distances:     The distances from the source to each explored vertex.
+            * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
+    """
+
+    # Initialization
+    edges = as_maze_graph(graph).edges
+    remaining = set(targets) if targets is not None else None
+    min_heap = [(0, source)]
+    visited = set()
+    distances = {source: 0}
+    routing_table = {source: None}
+
+    # Explore vertices by increasing distance
+    while len(min_heap) > 0 and (remaining is None or len(remaining) > 0):
+
+        # Entries of already visited vertices are outdated
+        distance, vertex = heapq.heappop(min_heap)
+        if vertex in visited:
+            continue
+        visited.add(vertex)
+        if remaining is not None:
+            remaining.discard(vertex)
+
+        # Relax edges
+        for neighbor, weight in edges[vertex]:
+            new_distance = distance + weight
+            if neighbor not in distances or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                routing_table[neighbor] = vertex
+                heapq.heappush(min_heap, (new_distance, neighbor))
+
+    # Return the result
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def dial_traversal ( graph:   Union[Maze, MazeGraph],
+                     source:  Integral,
+                     targets: Optional[Iterable[Integral]] = None
+                   ) ->       Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
+
+    """
+        This function performs a Dijkstra traversal of a graph, using a circular bucket queue (Dial's algorithm).
+        In PyRat, weights are 1 or a mud value bounded by the mud range, so max_weight + 1 buckets are enough.
+        Bucket i % (max_weight + 1) holds the vertices at distance i, so pushing and popping are O(1).
+        It stops when all the targets are visited, or when all vertices are visited if no targets are given.
+        In:
+            * graph:   The graph to traverse.
+            * source:  The source vertex of the traversal.
+            * targets: The vertices to reach (all vertices if None).
+        Out:
+            * distances:     The distances from the source to each explored vertex.
+            * routing_table: The routing table, that is, the parent of each vertex in the traversal (None for the source).
+    """
+
+    # Initialization
+    maze_graph = as_maze_graph(graph)
+    edges = maze_graph.edges
+    nb_buckets = maze_graph.max_weight + 1
+    buckets = [[] for _ in range(nb_buckets)]
+    buckets[0].append(source)
+    nb_pending = 1
+    settled = bytearray(maze_graph.nb_cells)
+    distances = {source: 0}
+    routing_table = {source: None}
+
+    # Targets not yet settled
+    remaining = set(targets) if targets is not None else None
+    if remaining is not None:
+        remaining.discard(source)
+        if len(remaining) == 0:
+            return distances, routing_table
+
+    # Explore buckets in increasing order of distance
+    distance = 0
+    while nb_pending > 0:
+        bucket = buckets[distance % nb_buckets]
+        while len(bucket) > 0:
+
+            # Entries of already settled vertices are outdated
+            vertex = bucket.pop()
+            nb_pending -= 1
+            if settled[vertex]:
+                continue
+            settled[vertex] = 1
+
+            # Stop when the last target is settled
+            if remaining is not None and vertex in remaining:
+                remaining.remove(vertex)
+                if len(remaining) == 0:
+                    return distances, routing_table
+
+            # Relax edges, weights are at least 1 so the current bucket is never filled again
+            for neighbor, weight in edges[vertex]:
+                new_distance = distance + weight
+                if neighbor not in distances or new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    routing_table[neighbor] = vertex
+                    buckets[new_distance % nb_buckets].append(neighbor)
+                    nb_pending += 1
+        distance += 1
+
+    # Return the result
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def multi_target_dijkstra ( graph:       Union[Maze, MazeGraph],
+                            source:      Integral,
+                            targets:     Iterable[Integral],
+                            engine:      ShortestPathEngine = ShortestPathEngine.HEAP,
+                            nb_required: Optional[Integral] = None
+                          ) ->           Tuple[Dict[Integral, Integral], array.array]:
+
+    """
+        This function performs a Dijkstra search from a source until all targets are settled, as needed to build a meta-graph.
+        Targets are marked in an array and counted down when settled, so checking for termination is O(1).
+        Outdated queue entries (vertices already settled) are skipped instead of being expanded again.
+        In:
+            * graph:       The graph to search.
+            * source:      The source vertex of the search.
+            * targets:     The vertices to reach.
+            * engine:      Priority queue to use, a binary heap or Dial's buckets (used for all other engines).
+            * nb_required: Number of settled targets after which the search stops (all targets if None).
+        Out:
+            * target_distances: The distances from the source to each reachable target, in the order in which they are settled (i.e., by increasing distance).
+            * predecessors:     Array giving the parent of each explored cell (-1 for the source and unexplored cells), see predecessors_to_route.
+    """
+
+    # Initialization
+    maze_graph = as_maze_graph(graph)
+    edges = maze_graph.edges
+    distances = [math.inf] * maze_graph.nb_cells
+    distances[source] = 0
+    predecessors = array.array("i", [-1]) * maze_graph.nb_cells
+    settled = bytearray(maze_graph.nb_cells)
+    target_distances = {}
+
+    # Mark the targets that remain to settle
+    is_target = bytearray(maze_graph.nb_cells)
+    for target in targets:
+        is_target[target] = 1
+    nb_remaining = sum(is_target) if nb_required is None else min(nb_required, sum(is_target))
+
+    # Binary heap of (distance, vertex) pairs
+    if engine == ShortestPathEngine.HEAP:
+        min_heap = [(0, source)]
+        while len(min_heap) > 0 and nb_remaining > 0:
+            distance, vertex = heapq.heappop(min_heap)
+            if settled[vertex]:
+                continue
+            settled[vertex] = 1
+            if is_target[vertex]:
+                target_distances[vertex] = distance
+                nb_remaining -= 1
+                if nb_remaining == 0:
+                    break
+            for neighbor, weight in edges[vertex]:
+                new_distance = distance + weight
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    predecessors[neighbor] = vertex
+                    heapq.heappush(min_heap, (new_distance, neighbor))
+
+    # Circular buckets indexed by distance, as in dial_traversal
+    else:
+        nb_buckets = maze_graph.max_weight + 1
+        buckets = [[] for _ in range(nb_buckets)]
+        buckets[0].append(source)
+        nb_pending = 1
+        distance = 0
+        while nb_pending > 0 and nb_remaining > 0:
+            bucket = buckets[distance % nb_buckets]
+            while len(bucket) > 0:
+                vertex = bucket.pop()
+                nb_pending -= 1
+                if settled[vertex]:
+                    continue
+                settled[vertex] = 1
+                if is_target[vertex]:
+                    target_distances[vertex] = distance
+                    nb_remaining -= 1
+                    if nb_remaining == 0:
+                        break
+                for neighbor, weight in edges[vertex]:
+                    new_distance = distance + weight
+                    if new_distance < distances[neighbor]:
+                        distances[neighbor] = new_distance
+                        predecessors[neighbor] = vertex
+                        buckets[new_distance % nb_buckets].append(neighbor)
+                        nb_pending += 1
+            distance += 1
+
+    # Return the result
+    return target_distances, predecessors
+
+#####################################################################################################################################################
+
+def nearest_target ( graph:   Union[Maze, MazeGraph],
+                     source:  Integral,
+                     targets: Iterable[Integral],
+                     k:       Integral = 1,
+                     engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+                   ) ->       List[Tuple[Integral, Integral, List[Integral]]]:
+
+    """
+        This function finds the k targets closest to a source, with a multi_target_dijkstra that stops as soon as they are settled.
+        Ties between targets at the same distance are broken by the order in which the search settles them.
+        In:
+            * graph:   The graph to search.
+            * source:  The source vertex of the search.
+            * targets: The vertices among which to choose.
+            * k:       Number of targets to find.
+            * engine:  Priority queue to use, as in multi_target_dijkstra.
+        Out:
+            * nearest: List of (target, distance, route) triplets for the k closest reachable targets, by increasing distance.
+    """
+
+    # Search until k targets are settled, and rebuild their routes
+    target_distances, predecessors = multi_target_dijkstra(graph, source, targets, engine, k)
+    return [(target, distance, predecessors_to_route(predecessors, source, target)) for target, distance in target_distances.items()]
+
+#####################################################################################################################################################
+
+def voronoi_regions ( graph:   Union[Maze, MazeGraph],
+                      sources: List[Integral],
+                      engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+                    ) ->       Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+
+    """
+        This function performs a single Dijkstra search seeded from all sources at once, which labels each cell with its closest source.
+        Cells with the same label form the Voronoi region of a source, and the predecessors form a shortest-path tree rooted at the sources.
+        With the SCIPY engine, the search is done by scipy.sparse.csgraph if it is installed, otherwise a binary heap is used.
+        In:
+            * graph:   The graph to search.
+            * sources: The vertices from which to search (without duplicates).
+            * engine:  Engine chosen by the player.
+        Out:
+            * regions:      Array of type int32 giving for each cell the index in sources of its closest source (-1 if no source reaches it).
+            * distances:    Array of type int64 giving for each cell the distance to its closest source (-1 if no source reaches it).
+            * predecessors: Array of type int32 giving the parent of each cell in the tree (-1 for the sources and unreached cells), see predecessors_to_route.
+    """
+
+    # Compiled search if requested and available
+    maze_graph = as_maze_graph(graph)
+    if engine == ShortestPathEngine.SCIPY and "scipy" in globals() and len(sources) > 0:
+        distances, predecessors, closest = scipy.sparse.csgraph.dijkstra(sparse_matrix(maze_graph), indices=sources, return_predecessors=True, min_only=True)
+        reached = numpy.isfinite(distances)
+        source_index = numpy.full(maze_graph.nb_cells, -1, dtype=numpy.int32)
+        source_index[sources] = numpy.arange(len(sources), dtype=numpy.int32)
+        regions = numpy.where(reached, source_index[numpy.maximum(closest, 0)], -1).astype(numpy.int32)
+        distances = numpy.where(reached, distances, -1).astype(numpy.int64)
+        predecessors = numpy.where(predecessors >= 0, predecessors, -1).astype(numpy.int32)
+        return regions, distances, predecessors
+
+    # Binary heap of (distance, vertex) pairs, initially containing all sources
+    edges = maze_graph.edges
+    distances = [math.inf] * maze_graph.nb_cells
+    regions = [-1] * maze_graph.nb_cells
+    predecessors = [-1] * maze_graph.nb_cells
+    settled = bytearray(maze_graph.nb_cells)
+    for index, source in enumerate(sources):
+        distances[source] = 0
+        regions[source] = index
+    min_heap = [(0, source) for source in sources]
+    heapq.heapify(min_heap)
+    while len(min_heap) > 0:
+        distance, vertex = heapq.heappop(min_heap)
+        if settled[vertex]:
+            continue
+        settled[vertex] = 1
+        for neighbor, weight in edges[vertex]:
+            new_distance = distance + weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                regions[neighbor] = regions[vertex]
+                predecessors[neighbor] = vertex
+                heapq.heappush(min_heap, (new_distance, neighbor))
+
+    # Convert to arrays
+    distances = [distance if distance != math.inf else -1 for distance in distances]
+    return numpy.array(regions, dtype=numpy.int32), numpy.array(distances, dtype=numpy.int64), numpy.array(predecessors, dtype=numpy.int32)
+
+#####################################################################################################################################################
+
+def predecessors_to_route ( predecessors: array.array,
+                            source:       Integral,
+                            target:       Integral
+                          ) ->            List[Integral]:
+
+    """
+        This function finds the route from the source to a target using the predecessors returned by multi_target_dijkstra.
+        In:
+            * predecessors: The parent of each explored cell.
+            * source:       The source vertex of the search.
+            * target:       The target vertex.
+        Out:
+            * route: The route from the source to the target.
+    """
+
+    # Backtrack from the target to the source
+    route = [target]
+    while route[-1] != source:
+        route.append(predecessors[route[-1]])
+    return route[::-1]
+
+#####################################################################################################################################################
+
+def unit_weight_searches ( graph:   Union[Maze, MazeGraph],
+                           sources: List[Integral]
+                         ) ->       Optional[Dict[Integral, Tuple[Dict[Integral, Integral], Dict[Integral, Integral]]]]:
+
+    """
+        This function performs the searches from all vertices of a meta-graph at once, with bit_parallel_bfs, in mazes without mud.
+        It returns None if the maze has mud, or if it is too small for the bit-parallel BFS to pay off, so that the caller runs multi_target_dijkstra instead.
+        Predecessors are decoded from the bits only along the routes between sources, and routes from the same source share their common part.
+        In:
+            * graph:   The graph to search.
+            * sources: The vertices of the meta-graph.
+        Out:
+            * searches: None, or a dictionary associating each source with the result of its search, in the format of multi_target_dijkstra (with predecessors as a dictionary).
+    """
+
+    # Only for mazes without mud, and large enough problems
+    maze_graph = as_maze_graph(graph)
+    if not maze_graph.is_unit_weight or len(sources) * maze_graph.nb_vertices < BIT_PARALLEL_MIN_WORK:
+        return None
+
+    # All searches at once
+    distances, parents = bit_parallel_bfs(maze_graph, sources)
+    up_offset, down_offset, left_offset, right_offset = wall_masks(maze_graph)[0]
+    searches = {}
+    for group in range(len(parents)):
+        up, down, left, right = parents[group].tolist()
+        for index in range(64 * group, min(64 * (group + 1), len(sources))):
+            source, bit = sources[index], index % 64
+
+            # Distances to reachable sources
+            target_distances = {target: distance for target, distance in zip(sources, distances[index].tolist()) if distance >= 0}
+
+            # Decode the predecessors along the routes, until a cell already decoded is met
+            predecessors = {source: -1}
+            for target in target_distances:
+                cell = target
+                while cell not in predecessors:
+                    if up[cell] >> bit & 1:
+                        parent = cell - up_offset
+                    elif down[cell] >> bit & 1:
+                        parent = cell - down_offset
+                    elif left[cell] >> bit & 1:
+                        parent = cell - left_offset
+                    else:
+                        parent = cell - right_offset
+                    predecessors[cell] = parent
+                    cell = parent
+            searches[source] = (target_distances, predecessors)
+    return searches
+
+#####################################################################################################################################################
+
+def sparse_matrix ( graph: Union[Maze, MazeGraph]
+                  ) ->     Any:
+
+    """
+        This function builds the adjacency matrix of the maze as a scipy sparse matrix.
+        It shares the CSR arrays of the snapshot, so no dense matrix of size nb_cells x nb_cells is built.
+        In:
+            * graph: The maze to convert.
+        Out:
+            * matrix: The sparse matrix of weights, of shape (nb_cells, nb_cells).
+    """
+
+    # Debug
+    assert "scipy" in globals() # Scipy must be installed
+
+    # Wrap the CSR arrays
+    maze_graph = as_maze_graph(graph)
+    return scipy.sparse.csr_matrix((maze_graph.weights, maze_graph.indices, maze_graph.indptr), shape=(maze_graph.nb_cells, maze_graph.nb_cells))
+
+#####################################################################################################################################################
+
+def scipy_traversal ( graph:   Union[Maze, MazeGraph],
+                      source:  Integral,
+                      targets: Optional[Iterable[Integral]] = None
+                    ) ->       Tuple[Dict[Integral, Integral], Dict[Integral, Optional[Integral]]]:
+
+    """
+        This function performs a traversal with the Dijkstra algorithm of scipy.sparse.csgraph.
+        The whole maze is explored, as stopping early is not possible there, but the search runs in compiled code.
+        If scipy is not installed, it falls back to dial_traversal.
+        In:
+            * graph:   The graph to traverse.
+            * source:  The source vertex of the traversal.
+            * targets: The vertices to reach (unused, all vertices are explored).
+        Out:
+            * distances:     The distances from the source to each explored vertex.
+            * routing_table: The routing table, that is, the parent of each vertex in the traversal.
+    """
+
+    # Fallback to the pure-Python engine
+    if "scipy" not in globals():
+        return dial_traversal(graph, source, targets)
+
+    # Search in compiled code
+    distances, predecessors = scipy.sparse.csgraph.dijkstra(sparse_matrix(graph), indices=source, return_predecessors=True)
+
+    # Convert to dictionaries for reachable vertices
+    reached = numpy.flatnonzero(numpy.isfinite(distances)).tolist()
+    distances = dict(zip(reached, distances[reached].astype(int).tolist()))
+    routing_table = dict(zip(reached, predecessors[reached].tolist()))
+    routing_table[source] = None
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def scipy_searches ( graph:   Union[Maze, MazeGraph],
+                     sources: List[Integral]
+                   ) ->       Optional[Dict[Integral, Tuple[Dict[Integral, Integral], array.array]]]:
+
+    """
+        This function performs the searches from all vertices of a meta-graph in a single call to the Dijkstra algorithm of scipy.sparse.csgraph.
+        It returns None if scipy is not installed, so that the caller runs multi_target_dijkstra instead.
+        In:
+            * graph:   The graph to search.
+            * sources: The vertices of the meta-graph.
+        Out:
+            * searches: None, or a dictionary associating each source with the result of its search, in the format of multi_target_dijkstra.
+    """
+
+    # Only if scipy is installed
+    if "scipy" not in globals():
+        return None
+
+    # All searches at once, one row per source
+    distances, predecessors = scipy.sparse.csgraph.dijkstra(sparse_matrix(graph), indices=sources, return_predecessors=True)
+    source_distances = distances[:, sources]
+    reachable = numpy.isfinite(source_distances)
+
+    # Keep the distances to sources, and predecessors as compact arrays (unreachable cells are negative, as in multi_target_dijkstra)
+    searches = {}
+    for index, source in enumerate(sources):
+        row_distances = source_distances[index].astype(numpy.int64).tolist()
+        target_distances = {target: distance for target, distance, is_reachable in zip(sources, row_distances, reachable[index].tolist()) if is_reachable}
+        searches[source] = (target_distances, array.array("i", predecessors[index].astype(numpy.int32).tobytes()))
+    return searches
+
+#####################################################################################################################################################
+
+def batched_searches ( graph:   Union[Maze, MazeGraph],
+                       sources: List[Integral],
+                       engine:  ShortestPathEngine = ShortestPathEngine.HEAP
+                     ) ->       Optional[Dict[Integral, Tuple[Dict[Integral, Integral], Any]]]:
+
+    """
+        This function performs the searches from all vertices of a meta-graph at once, when a batched method is available.
+        With the SCIPY engine, scipy_searches is used, otherwise unit_weight_searches is tried.
+        It returns None if no batched method applies, so that the caller runs multi_target_dijkstra from each vertex.
+        In:
+            * graph:   The graph to search.
+            * sources: The vertices of the meta-graph.
+            * engine:  Engine chosen by the player.
+        Out:
+            * searches: None, or a dictionary associating each source with the result of its search, in the format of multi_target_dijkstra.
+    """
+
+    # Compiled searches if requested and available
+    searches = None
+    if engine == ShortestPathEngine.SCIPY:
+        searches = scipy_searches(graph, sources)
+
+    # Bit-parallel BFS otherwise
+    if searches is None:
+        searches = unit_weight_searches(graph, sources)
+    return searches
+
+#####################################################################################################################################################
+
+def point_to_point ( graph:        Union[Maze, MazeGraph],
+                     source:       Integral,
+                     target:       Integral,
+                     unit_weights: bool = False
+                   ) ->            Tuple[Number, List[Integral], Integral]:
+
+    """
+        This function finds a shortest path between two vertices with a bidirectional Dijkstra search.
+        A forward search from the source and a backward search from the target are expanded alternately (the one with the smaller heap first).
+        Each time an edge reaches a vertex labeled by the other search, the best path through it is recorded.
+        The search stops when the sum of the smallest keys of both heaps is at least the length of the best path, which is correct with mud.
+        In:
+            * graph:        The graph to search.
+            * source:       The source vertex.
+            * target:       The target vertex.
+            * unit_weights: Set to True to ignore mud and count moves, as a BFS would.
+        Out:
+            * distance:    The length of the shortest path (infinity if there is none).
+            * route:       The route from the source to the target (empty if there is none).
+            * nb_expanded: The number of vertices expanded by both searches.
+    """
+
+    # Nothing to search
+    if source == target:
+        return 0, [source], 0
+
+    # Forward search at index 0, backward search at index 1
+    edges = as_maze_graph(graph).edges
+    distances = ({source: 0}, {target: 0})
+    routing_tables = ({source: None}, {target: None})
+    heaps = ([(0, source)], [(0, target)])
+    settled = (set(), set())
+    best_distance = math.inf
+    meeting_vertex = None
+    nb_expanded = 0
+
+    # No path through unexpanded vertices can be shorter than the sum of the smallest keys
+    while len(heaps[0]) > 0 and len(heaps[1]) > 0 and heaps[0][0][0] + heaps[1][0][0] < best_distance:
+
+        # Expand the smaller search, entries of already settled vertices are outdated
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        distance, vertex = heapq.heappop(heaps[side])
+        if vertex in settled[side]:
+            continue
+        settled[side].add(vertex)
+        nb_expanded += 1
+
+        # Relax edges and look for a better meeting vertex
+        own_distances, other_distances = distances[side], distances[1 - side]
+        for neighbor, weight in edges[vertex]:
+            new_distance = distance + (1 if unit_weights else weight)
+            if neighbor not in own_distances or new_distance < own_distances[neighbor]:
+                own_distances[neighbor] = new_distance
+                routing_tables[side][neighbor] = vertex
+                heapq.heappush(heaps[side], (new_distance, neighbor))
+                if neighbor in other_distances and new_distance + other_distances[neighbor] < best_distance:
+                    best_distance = new_distance + other_distances[neighbor]
+                    meeting_vertex = neighbor
+
+    # Source and target are not connected
+    if meeting_vertex is None:
+        return math.inf, [], nb_expanded
+
+    # Join the two halves of the route at the meeting vertex
+    route = []
+    vertex = meeting_vertex
+    while vertex is not None:
+        route.append(vertex)
+        vertex = routing_tables[0][vertex]
+    route.reverse()
+    vertex = routing_tables[1][meeting_vertex]
+    while vertex is not None:
+        route.append(vertex)
+        vertex = routing_tables[1][vertex]
+    return best_distance, route, nb_expanded
+
+#####################################################################################################################################################
+
+def manhattan_distance ( graph:    Union[Maze, MazeGraph],
+                         vertex_1: Integral,
+                         vertex_2: Integral
+                       ) ->        Integral:
+
+    """
+        This function computes the Manhattan distance between two cells of the maze, from their coordinates given by i_to_rc.
+        Since each move changes it by 1 and costs at least 1, it is a lower bound of the length of the shortest path.
+        In:
+            * graph:    The graph the cells belong to.
+            * vertex_1: The first cell.
+            * vertex_2: The second cell.
+        Out:
+            * distance: The Manhattan distance between the cells.
+    """
+
+    # Use the precomputed coordinates of the snapshot
+    cell_rc = as_maze_graph(graph).cell_rc
+    (row_1, col_1), (row_2, col_2) = cell_rc[vertex_1], cell_rc[vertex_2]
+    return abs(row_1 - row_2) + abs(col_1 - col_2)
+
+#####################################################################################################################################################
+
+def astar ( graph:     Union[Maze, MazeGraph],
+            source:    Integral,
+            target:    Integral,
+            heuristic: Union[bool, Callable[[Integral], Number]] = True
+          ) ->         Tuple[Number, List[Integral], Integral]:
+
+    """
+        This function finds a shortest path between two vertices with the A* algorithm.
+        Vertices are expanded by increasing distance from the source plus Manhattan distance to the target.
+        In:
+            * graph:     The graph to search.
+            * source:    The source vertex.
+            * target:    The target vertex.
+            * heuristic: Set to False to expand vertices by distance only, as Dijkstra's algorithm does, or give a function estimating the distance to the target.
+        Out:
+            * distance:    The length of the shortest path (infinity if there is none).
+            * route:       The route from the source to the target (empty if there is none).
+            * nb_expanded: The number of vertices expanded by the search.
+    """
+
+    # A single target is a particular case of the nearest target
+    return astar_nearest(graph, source, [target], heuristic)
+
+#####################################################################################################################################################
+
+def astar_nearest ( graph:     Union[Maze, MazeGraph],
+                    source:    Integral,
+                    targets:   Iterable[Integral],
+                    heuristic: Union[bool, Callable[[Integral], Number]] = True
+                  ) ->         Tuple[Number, List[Integral], Integral]:
+
+    """
+        This function finds a shortest path from a vertex to the nearest of several targets with the A* algorithm.
+        The heuristic is the Manhattan distance to the closest target, which is still a lower bound and is consistent.
+        Thus, the first target expanded is the nearest one, and no vertex needs to be expanded twice.
+        On ties, vertices farther from the source are expanded first, as they are closer to a target.
+        Another heuristic can be given as a function, which must be a consistent lower bound of the distance to the closest target.
+        In:
+            * graph:     The graph to search.
+            * source:    The source vertex.
+            * targets:   The candidate target vertices.
+            * heuristic: Set to False to expand vertices by distance only, as Dijkstra's algorithm does, or give a function estimating the distance to the closest target.
+        Out:
+            * distance:    The length of the shortest path to the nearest target (infinity if there is none).
+            * route:       The route from the source to the nearest target, which is its last vertex (empty if there is none).
+            * nb_expanded: The number of vertices expanded by the search.
+    """
+
+    # Lower bound of the distance from a vertex to the closest target
+    maze_graph = as_maze_graph(graph)
+    edges, cell_rc = maze_graph.edges, maze_graph.cell_rc
+    targets = set(targets)
+    targets_rc = [cell_rc[target] for target in targets]
+    def estimate (vertex):
+        if not heuristic:
+            return 0
+        row, col = cell_rc[vertex]
+        return min(abs(row - target_row) + abs(col - target_col) for target_row, target_col in targets_rc)
+    if callable(heuristic):
+        estimate = heuristic
+
+    # Initialization
+    min_heap = [(estimate(source), 0, source)]
+    distances = {source: 0}
+    routing_table = {source: None}
+    settled = set()
+    nb_expanded = 0
+
+    # Explore vertices by increasing estimated length of the path through them
+    while len(min_heap) > 0:
+        _, negative_distance, vertex = heapq.heappop(min_heap)
+        if vertex in settled:
+            continue
+        settled.add(vertex)
+        nb_expanded += 1
+
+        # The first target expanded is the nearest one
+        if vertex in targets:
+            route = []
+            while vertex is not None:
+                route.append(vertex)
+                vertex = routing_table[vertex]
+            return -negative_distance, route[::-1], nb_expanded
+
+        # Relax edges
+        for neighbor, weight in edges[vertex]:
+            new_distance = weight - negative_distance
+            if neighbor not in distances or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                routing_table[neighbor] = vertex
+                heapq.heappush(min_heap, (new_distance + estimate(neighbor), -new_distance, neighbor))
+
+    # No target is reachable
+    return math.inf, [], nb_expanded
+
+#####################################################################################################################################################
+
+TRAVERSALS = {ShortestPathEngine.HEAP: heap_traversal,
+              ShortestPathEngine.DIAL: dial_traversal,
+              ShortestPathEngine.SCIPY: scipy_traversal}
+
+#####################################################################################################################################################
+#####################################################################################################################################################